@@ -12,6 +12,7 @@ from typing import Optional, List, Dict, Any, Tuple
 from .dsl import parse_glue_file, execute_glue_app, load_env
 from .providers.openrouter import OpenRouterProvider
 from .tools import web_search, file_handler, code_interpreter, magnetic
+from .core.memory_backend import SQLiteBackend, migrate_directory
 
 def print_version(ctx, param, value):
     if not value or ctx.resilient_parsing:
@@ -429,6 +430,26 @@ def run(file, env):
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
+@cli.command()
+@click.argument('source', type=click.Path(exists=True, file_okay=False))
+@click.argument('database', type=click.Path(dir_okay=False))
+def migrate_memory(source, database):
+    """Migrate persisted long-term memory to SQLite.
+
+    SOURCE is a directory of per-key JSON memory files; DATABASE is the
+    SQLite file to copy them into.
+    """
+    try:
+        backend = SQLiteBackend(database)
+        try:
+            count = migrate_directory(source, backend)
+        finally:
+            backend.close()
+        click.echo(f"Migrated {count} memory segments to {database}")
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
 @cli.command()
 @click.argument('name')
 @click.option('--template', type=click.Choice(['basic', 'research', 'chat']), default='basic',
@@ -3,10 +3,18 @@
 """GLUE Context Analysis System"""
 
 import re
-from typing import Dict, List, Optional, Set, Any
-from dataclasses import dataclass
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Any, Tuple, Pattern, Deque
+from dataclasses import dataclass, replace
 from enum import Enum, auto
 
+try:
+    import numpy as np
+except ImportError:  # Optional, only used by analyze_batch
+    np = None
+
 class InteractionType(Enum):
     """Types of user interactions"""
     CHAT = auto()          # Simple conversation
@@ -54,6 +62,126 @@ class ContextState:
     target_model: Optional[str] = None  # Model this interaction is directed at
     chat_mode: bool = False  # Whether this is a model-to-model chat
 
+class ScanResult:
+    """Pattern hits from a single scan, as match counts per category and label"""
+    
+    def __init__(self, counts: Dict[str, Dict[str, int]], weights: Dict[Tuple[str, str], float]):
+        self._counts = counts
+        self._weights = weights
+    
+    def has(self, category: str) -> bool:
+        """Check whether any pattern in a category matched"""
+        return category in self._counts
+    
+    def count(self, category: str) -> int:
+        """Count non-overlapping matches in a category"""
+        return sum(self._counts.get(category, {}).values())
+    
+    def confidence(self, category: str) -> float:
+        """Get the highest weight among matched patterns in a category"""
+        return max(
+            (self._weights[(category, label)] for label in self._counts.get(category, {})),
+            default=0.0
+        )
+    
+    def categories(self) -> Dict[str, float]:
+        """Get every matched category with its confidence"""
+        return {category: self.confidence(category) for category in self._counts}
+
+class PatternScanner:
+    """
+    Matches many categorized patterns against text in a single pass.
+    
+    All distinct patterns are joined into one alternation, and searching
+    it finds each position where some pattern starts. At those positions
+    an alternation of named groups tells which pattern matched, and other
+    patterns matching there are found by resuming after the winner. Work
+    per input therefore follows the number of hits rather than the size
+    of the pattern tables. Case-insensitive patterns are matched against
+    the text lowercased once, which keeps the regex engine's literal
+    prefix scan available. Counts match re.findall per pattern.
+    """
+    
+    def __init__(self, entries: Tuple[Tuple[str, str, str, float], ...]):
+        """Compile (category, label, pattern, weight) entries"""
+        self._weights: Dict[Tuple[str, str], float] = {}
+        # Each distinct pattern is matched once and credited to every entry using it
+        patterns: Dict[str, List[Tuple[str, str]]] = {}
+        for category, label, pattern, weight in entries:
+            self._weights[(category, label)] = weight
+            patterns.setdefault(pattern, []).append((category, label))
+        self._owners = list(patterns.values())
+        
+        folded, exact = [], []
+        for index, pattern in enumerate(patterns):
+            if pattern.startswith("(?i)"):
+                source = pattern[len("(?i)"):]
+                # Lowercase-only sources match the lowercased text case-sensitively
+                if source != source.lower():
+                    source = f"(?i:{source})"
+                folded.append((index, source))
+            else:
+                exact.append((index, pattern))
+        self._folded = self._compile_chain(folded)
+        self._exact = self._compile_chain(exact)
+    
+    @staticmethod
+    def _compile_chain(
+        patterns: List[Tuple[int, str]]
+    ) -> Tuple[Optional[Pattern], List[Pattern], Dict[int, int]]:
+        """Compile a position finder plus alternations trying patterns from each rank on
+        
+        The finder has no named groups, so the regex engine can skip ahead
+        by the possible first characters of the patterns.
+        """
+        if not patterns:
+            return None, [], {}
+        finder = re.compile("|".join(f"(?:{source})" for _, source in patterns))
+        branches = [f"(?P<p{index}>{source})" for index, source in patterns]
+        chain = [re.compile("|".join(branches[start:])) for start in range(len(branches))]
+        return finder, chain, {index: rank for rank, (index, _) in enumerate(patterns)}
+    
+    def scan(self, text: str) -> ScanResult:
+        """Scan text once, returning every category hit"""
+        counts: Dict[str, Dict[str, int]] = {}
+        last_end = [0] * len(self._owners)
+        self._scan_chain(self._folded, text.lower(), counts, last_end)
+        self._scan_chain(self._exact, text, counts, last_end)
+        return ScanResult(counts, self._weights)
+    
+    def _scan_chain(
+        self,
+        compiled: Tuple[Optional[Pattern], List[Pattern], Dict[int, int]],
+        text: str,
+        counts: Dict[str, Dict[str, int]],
+        last_end: List[int]
+    ) -> None:
+        """Record every match of the chain's patterns in text"""
+        finder, chain, ranks = compiled
+        if finder is None:
+            return
+        found = finder.search(text)
+        while found is not None:
+            position = found.start()
+            match = chain[0].match(text, position)
+            while match is not None:
+                index = int(match.lastgroup[1:])
+                # Skip matches overlapping the previous one, as re.findall does
+                if position >= last_end[index]:
+                    last_end[index] = max(match.end(), position + 1)
+                    for category, label in self._owners[index]:
+                        labels = counts.setdefault(category, {})
+                        labels[label] = labels.get(label, 0) + 1
+                # Resume with the patterns after the one that matched
+                rank = ranks[index] + 1
+                match = chain[rank].match(text, position) if rank < len(chain) else None
+            found = finder.search(text, position + 1)
+
+@lru_cache(maxsize=None)
+def _compile_scanner(entries: Tuple[Tuple[str, str, str, float], ...]) -> PatternScanner:
+    """Compile a scanner once per distinct pattern table"""
+    return PatternScanner(entries)
+
 class ContextAnalyzer:
     """Analyzes user input to determine context and requirements"""
     
@@ -183,9 +311,107 @@ class ContextAnalyzer:
         ]
     }
     
-    def __init__(self):
-        """Initialize the context analyzer"""
-        self.interaction_history: List[ContextState] = []
+    # Implicit research needs
+    IMPLICIT_RESEARCH_PATTERNS = [
+        r"(?i)about",
+        r"(?i)explain",
+        r"(?i)tell me",
+        r"(?i)what is",
+        r"(?i)how does",
+        r"(?i)history of",
+        r"(?i)background on"
+    ]
+    
+    # File operations that pull file_handler into research
+    RESEARCH_FILE_PATTERNS = [
+        r"(?i)save",
+        r"(?i)write",
+        r"(?i)create",
+        r"(?i)store",
+        r"(?i)document"
+    ]
+    
+    # References to past interactions
+    MEMORY_PATTERNS = [
+        r"(?i)(?:like|as) (?:before|previously|last time)",
+        r"(?i)(?:again|repeat)",
+        r"(?i)(?:remember|recall)",
+        r"(?i)(?:you|we) (?:mentioned|discussed|talked about)"
+    ]
+    
+    # Requests for persistent storage
+    PERSISTENCE_PATTERNS = [
+        r"(?i)save",
+        r"(?i)store",
+        r"(?i)keep",
+        r"(?i)remember this",
+        r"(?i)create a (?:file|document)",
+        r"(?i)write (?:to|a) (?:file|document)"
+    ]
+    
+    # Words that turn a chat greeting into a research request
+    CHAT_RESEARCH_WORDS = [
+        "about", "what", "how", "why", "when", "where", "who",
+        "explain", "tell me", "find", "look up", "search"
+    ]
+    
+    # Question words that default unclear input to research
+    QUESTION_WORDS = ["what", "how", "why", "when", "where", "who"]
+    
+    # Complexity signals, counted like re.findall
+    COMPLEXITY_PATTERNS = {
+        "steps": r"(?i)(?:and|then|after|next|finally)",
+        "questions": r"(?i)(?:what|why|how|where|when|who)",
+        "sentences": r"[.!?]+"
+    }
+    
+    def __init__(self, cache_size: int = 256, history_size: int = 1000):
+        """Initialize the context analyzer
+        
+        Args:
+            cache_size: Number of analysis results to memoize
+            history_size: Number of recent context states to keep
+        """
+        self.cache_size = cache_size
+        self.interaction_history: Deque[ContextState] = deque(maxlen=history_size)
+        self._scanner = _compile_scanner(self._scanner_entries())
+        
+        # Analyses keyed by (normalized text, available tools)
+        self._cache: "OrderedDict[Tuple[str, Optional[Tuple[str, ...]]], ContextState]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Lifetime interaction counts by type
+        self.type_counts: Counter = Counter()
+    
+    def _scanner_entries(self) -> Tuple[Tuple[str, str, str, float], ...]:
+        """Flatten the pattern tables into (category, label, pattern, weight) entries"""
+        entries = []
+        
+        def add(category: str, patterns, weight: float = 1.0) -> None:
+            if isinstance(patterns, dict):
+                entries.extend((category, p, p, w) for p, w in patterns.items())
+            else:
+                entries.extend((category, p, p, weight) for p in patterns)
+        
+        add("research", self.RESEARCH_PATTERNS)
+        add("research_implicit", self.IMPLICIT_RESEARCH_PATTERNS)
+        add("task", self.TASK_PATTERNS)
+        add("chat", self.CHAT_PATTERNS)
+        add("chat_interaction", self.CHAT_INTERACTION_PATTERNS)
+        for model_name, patterns in self.MODEL_PATTERNS.items():
+            add(f"model:{model_name}", patterns)
+        for tool_name, patterns in self.TOOL_PATTERNS.items():
+            add(f"tool:{tool_name}", patterns)
+        add("research_file", self.RESEARCH_FILE_PATTERNS)
+        add("memory", self.MEMORY_PATTERNS)
+        add("persistence", self.PERSISTENCE_PATTERNS)
+        # Plain substring checks
+        add("chat_research_words", [f"(?i){re.escape(w)}" for w in self.CHAT_RESEARCH_WORDS])
+        add("question_words", [f"(?i){re.escape(w)}" for w in self.QUESTION_WORDS])
+        for category, pattern in self.COMPLEXITY_PATTERNS.items():
+            add(category, [pattern])
+        return tuple(entries)
     
     def analyze(self, input_text: str, available_tools: Optional[List[str]] = None) -> ContextState:
         """
@@ -198,25 +424,53 @@ class ContextAnalyzer:
         Returns:
             ContextState object representing the analysis results
         """
+        # Inputs differing only in whitespace share a cache entry; analysis
+        # itself always sees the original text
+        key = (" ".join(input_text.split()), tuple(available_tools) if available_tools is not None else None)
+        
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            state = replace(cached, tools_required=set(cached.tools_required))
+        else:
+            self.cache_misses += 1
+            state = self._analyze(input_text, available_tools)
+            if self.cache_size > 0:
+                self._cache[key] = replace(state, tools_required=set(state.tools_required))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        
+        # Update history
+        self.interaction_history.append(state)
+        self.type_counts[state.interaction_type] += 1
+        
+        return state
+    
+    def _analyze(self, input_text: str, available_tools: Optional[List[str]] = None) -> ContextState:
+        """Analyze normalized input text"""
+        # Match every pattern table in one pass
+        scan = self.scan(input_text)
+        
         # First check for research requirements
-        requires_research = self._requires_research(input_text)
+        requires_research = self._requires_research(scan)
         
         # Determine interaction type and confidence
-        interaction_type, confidence = self._determine_type(input_text, requires_research)
+        interaction_type, confidence = self._determine_type(scan, requires_research)
         
         # Determine complexity
-        complexity = self._assess_complexity(input_text)
+        complexity = self._assess_complexity(input_text, scan)
         
         # Identify required tools based on both patterns and context
-        tools_required = self._identify_tools(input_text, available_tools, requires_research)
+        tools_required = self._identify_tools(scan, available_tools, requires_research)
         
         # Analyze additional requirements
-        requires_memory = self._requires_memory(input_text)
-        requires_persistence = self._requires_persistence(input_text)
+        requires_memory = scan.has("memory")
+        requires_persistence = scan.has("persistence")
         
         # Check for model-specific targeting and chat mode
-        target_model = self._identify_target_model(input_text)
-        chat_mode = self._is_chat_mode(input_text)
+        target_model = self._identify_target_model(scan)
+        chat_mode = scan.has("chat_interaction")
         
         # Adjust for research context
         if requires_research:
@@ -228,7 +482,7 @@ class ContextAnalyzer:
                 complexity = ComplexityLevel.MODERATE
         
         # Create context state
-        state = ContextState(
+        return ContextState(
             interaction_type=interaction_type,
             complexity=complexity,
             tools_required=tools_required,
@@ -239,53 +493,197 @@ class ContextAnalyzer:
             target_model=target_model,
             chat_mode=chat_mode
         )
+    
+    def analyze_batch(
+        self,
+        texts: List[str],
+        available_tools: Optional[List[str]] = None
+    ) -> List[ContextState]:
+        """
+        Analyze many inputs at once
         
-        # Update history
-        self.interaction_history.append(state)
+        Each distinct text is scanned once into a row of a feature matrix
+        (pattern hits, confidences, step/question/sentence counts and word
+        counts), and interaction type, complexity and tool requirements are
+        decided for all rows with vectorized operations. Results match
+        analyze(). Falls back to calling analyze() per text when NumPy is
+        not installed.
         
-        return state
+        Args:
+            texts: Input texts to classify
+            available_tools: List of available tool names
+            
+        Returns:
+            ContextState for each text, in order
+        """
+        if np is None:
+            return [self.analyze(text, available_tools) for text in texts]
+        if not texts:
+            return []
+        
+        tool_names = sorted(set(available_tools) if available_tools else self.TOOL_PATTERNS)
+        model_names = list(self.MODEL_PATTERNS)
+        columns, features = self._batch_features(texts, tool_names, model_names)
+        
+        def column(name: str):
+            return features[:, columns[name]]
+        
+        # Interaction type and confidence (mirrors _determine_type)
+        requires_research = (column("has:research") > 0) | (column("has:research_implicit") > 0)
+        research_confidence = np.where(
+            requires_research, np.maximum(column("conf:research"), 0.8), column("conf:research")
+        )
+        task_confidence = column("conf:task")
+        chat_confidence = column("conf:chat")
+        
+        is_research = (research_confidence >= 0.6) | requires_research
+        is_task = ~is_research & (task_confidence >= 0.6)
+        is_chat_like = ~is_research & ~is_task & (chat_confidence >= 0.6)
+        chat_research = is_chat_like & (column("has:chat_research_words") > 0)
+        is_chat = is_chat_like & ~chat_research
+        question_research = (
+            ~is_research & ~is_task & ~is_chat_like & (column("has:question_words") > 0)
+        )
+        
+        conditions = [is_research, is_task, chat_research, is_chat, question_research]
+        type_codes = np.select(conditions, [0, 1, 0, 2, 0], default=3)
+        confidences = np.select(
+            conditions,
+            [np.maximum(research_confidence, 0.7), task_confidence, 0.7, chat_confidence, 0.7],
+            default=0.3
+        )
+        types = [InteractionType.RESEARCH, InteractionType.TASK, InteractionType.CHAT, InteractionType.UNKNOWN]
+        
+        # Complexity (mirrors _assess_complexity), raised for research
+        steps, questions = column("count:steps"), column("count:questions")
+        average_length = column("words") / (column("count:sentences") + 1)
+        complexity_values = np.select(
+            [(steps > 2) | (questions > 2) | (average_length > 20),
+             (steps > 0) | (questions > 0) | (average_length > 15)],
+            [ComplexityLevel.COMPLEX.value, ComplexityLevel.MODERATE.value],
+            default=ComplexityLevel.SIMPLE.value
+        )
+        complexity_values = np.where(
+            requires_research & (complexity_values == ComplexityLevel.SIMPLE.value),
+            ComplexityLevel.MODERATE.value,
+            complexity_values
+        )
+        
+        # Tool requirements (mirrors _identify_tools)
+        tool_hits = np.zeros((len(texts), len(tool_names)), dtype=bool)
+        for index, tool in enumerate(tool_names):
+            if tool in self.TOOL_PATTERNS:
+                tool_hits[:, index] = column(f"has:tool:{tool}") > 0
+            if tool == "web_search":
+                tool_hits[:, index] |= requires_research
+            elif tool == "file_handler":
+                tool_hits[:, index] |= requires_research & (column("has:research_file") > 0)
+        
+        # First targeted model in table order
+        if model_names:
+            model_hits = np.stack([column(f"has:model:{m}") > 0 for m in model_names], axis=1)
+            targeted = model_hits.any(axis=1)
+            first_model = model_hits.argmax(axis=1)
+        
+        # Convert once, so building the states is plain Python
+        type_codes = type_codes.tolist()
+        complexity_values = complexity_values.tolist()
+        confidences = confidences.tolist()
+        requires_research = requires_research.tolist()
+        requires_memory = (column("has:memory") > 0).tolist()
+        requires_persistence = (column("has:persistence") > 0).tolist()
+        chat_mode = (column("has:chat_interaction") > 0).tolist()
+        target_models = (
+            [model_names[i] if hit else None for i, hit in zip(first_model.tolist(), targeted.tolist())]
+            if model_names else [None] * len(texts)
+        )
+        
+        states = []
+        for row, tools in enumerate(tool_hits.tolist()):
+            state = ContextState(
+                interaction_type=types[type_codes[row]],
+                complexity=ComplexityLevel(complexity_values[row]),
+                tools_required={tool for tool, hit in zip(tool_names, tools) if hit},
+                requires_research=requires_research[row],
+                requires_memory=requires_memory[row],
+                requires_persistence=requires_persistence[row],
+                confidence=confidences[row],
+                target_model=target_models[row],
+                chat_mode=chat_mode[row]
+            )
+            self.interaction_history.append(state)
+            self.type_counts[state.interaction_type] += 1
+            states.append(state)
+        return states
     
-    def _identify_target_model(self, text: str) -> Optional[str]:
+    def _batch_features(
+        self,
+        texts: List[str],
+        tool_names: List[str],
+        model_names: List[str]
+    ) -> Tuple[Dict[str, int], Any]:
+        """Build the feature matrix for analyze_batch"""
+        names = (
+            ["conf:research", "conf:task", "conf:chat", "words"] +
+            [f"count:{c}" for c in ("steps", "questions", "sentences")] +
+            [f"has:{c}" for c in (
+                "research", "research_implicit", "research_file", "chat_research_words",
+                "question_words", "memory", "persistence", "chat_interaction"
+            )] +
+            [f"has:tool:{t}" for t in tool_names if t in self.TOOL_PATTERNS] +
+            [f"has:model:{m}" for m in model_names]
+        )
+        columns = {name: index for index, name in enumerate(names)}
+        lookups = [
+            (kind, category, columns[name])
+            for name in names if name != "words"
+            for kind, _, category in [name.partition(":")]
+        ]
+        
+        # Repeated texts are scanned once
+        unique_rows: Dict[str, int] = {}
+        rows = []
+        for text in texts:
+            if text in unique_rows:
+                continue
+            unique_rows[text] = len(rows)
+            scan = self.scan(text)
+            row = [0.0] * len(names)
+            row[columns["words"]] = len(text.split())
+            for kind, category, index in lookups:
+                if not scan.has(category):
+                    continue
+                if kind == "conf":
+                    row[index] = scan.confidence(category)
+                elif kind == "count":
+                    row[index] = scan.count(category)
+                else:
+                    row[index] = 1.0
+            rows.append(row)
+        features = np.array(rows, dtype=float)[[unique_rows[text] for text in texts]]
+        return columns, features
+    
+    def scan(self, text: str) -> ScanResult:
+        """Get every pattern category hit in the text"""
+        return self._scanner.scan(text)
+    
+    def _identify_target_model(self, scan: ScanResult) -> Optional[str]:
         """Identify if the interaction is targeted at a specific model"""
-        for model_name, patterns in self.MODEL_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    return model_name
+        for model_name in self.MODEL_PATTERNS:
+            if scan.has(f"model:{model_name}"):
+                return model_name
         return None
     
-    def _is_chat_mode(self, text: str) -> bool:
-        """Determine if this is a model-to-model chat interaction"""
-        return any(
-            re.search(pattern, text)
-            for pattern, _ in self.CHAT_INTERACTION_PATTERNS.items()
-        )
-    
-    def _determine_type(self, text: str, requires_research: bool) -> tuple[InteractionType, float]:
+    def _determine_type(self, scan: ScanResult, requires_research: bool) -> tuple[InteractionType, float]:
         """Determine the type of interaction and confidence level"""
-        # Initialize confidences
-        chat_confidence = 0.0
-        research_confidence = 0.0
-        task_confidence = 0.0
-        
-        # Check research patterns first
-        for pattern, conf in self.RESEARCH_PATTERNS.items():
-            if re.search(pattern, text):
-                research_confidence = max(research_confidence, conf)
+        research_confidence = scan.confidence("research")
+        task_confidence = scan.confidence("task")
+        chat_confidence = scan.confidence("chat")
         
         # Force research mode if research is required
         if requires_research:
             research_confidence = max(research_confidence, 0.8)
         
-        # Check task patterns
-        for pattern, conf in self.TASK_PATTERNS.items():
-            if re.search(pattern, text):
-                task_confidence = max(task_confidence, conf)
-        
-        # Check chat patterns
-        for pattern, conf in self.CHAT_PATTERNS.items():
-            if re.search(pattern, text):
-                chat_confidence = max(chat_confidence, conf)
-        
         # Determine type based on highest confidence and context
         # Research takes priority if there's any indication of research need
         if research_confidence >= 0.6 or requires_research:
@@ -294,30 +692,27 @@ class ContextAnalyzer:
             return InteractionType.TASK, task_confidence
         elif chat_confidence >= 0.6:
             # Even in chat mode, check if we need research
-            if any(word in text.lower() for word in [
-                "about", "what", "how", "why", "when", "where", "who",
-                "explain", "tell me", "find", "look up", "search"
-            ]):
+            if scan.has("chat_research_words"):
                 return InteractionType.RESEARCH, 0.7
             return InteractionType.CHAT, chat_confidence
             
         # Default to RESEARCH if unclear but has question words
-        if any(word in text.lower() for word in ["what", "how", "why", "when", "where", "who"]):
+        if scan.has("question_words"):
             return InteractionType.RESEARCH, 0.7
             
         # Default to UNKNOWN if no clear pattern
         return InteractionType.UNKNOWN, 0.3
     
-    def _assess_complexity(self, text: str) -> ComplexityLevel:
+    def _assess_complexity(self, text: str, scan: ScanResult) -> ComplexityLevel:
         """Assess the complexity of the interaction"""
         # Count potential steps/requirements
-        steps = len(re.findall(r"(?i)(?:and|then|after|next|finally)", text))
+        steps = scan.count("steps")
         
         # Count question words (indicating information needs)
-        questions = len(re.findall(r"(?i)(?:what|why|how|where|when|who)", text))
+        questions = scan.count("questions")
         
         # Analyze sentence structure
-        sentences = len(re.findall(r"[.!?]+", text)) + 1
+        sentences = scan.count("sentences") + 1
         words = len(text.split())
         avg_sentence_length = words / sentences
         
@@ -329,7 +724,7 @@ class ContextAnalyzer:
     
     def _identify_tools(
         self, 
-        text: str, 
+        scan: ScanResult, 
         available_tools: Optional[List[str]] = None,
         requires_research: bool = False
     ) -> Set[str]:
@@ -342,76 +737,48 @@ class ContextAnalyzer:
         
         # Check explicit tool patterns
         for tool in tools_to_check:
-            if tool in self.TOOL_PATTERNS:
-                for pattern in self.TOOL_PATTERNS[tool]:
-                    if re.search(pattern, text):
-                        required_tools.add(tool)
-                        break
+            if scan.has(f"tool:{tool}"):
+                required_tools.add(tool)
         
         # Add implicit tool requirements based on context
         if requires_research and "web_search" in tools_to_check:
             required_tools.add("web_search")
         
         # Check for file operations in research context
-        if requires_research and "file_handler" in tools_to_check:
-            # Look for save/write indicators
-            if any(re.search(pattern, text) for pattern in [
-                r"(?i)save",
-                r"(?i)write",
-                r"(?i)create",
-                r"(?i)store",
-                r"(?i)document"
-            ]):
-                required_tools.add("file_handler")
+        if requires_research and "file_handler" in tools_to_check and scan.has("research_file"):
+            required_tools.add("file_handler")
         
         return required_tools
     
-    def _requires_research(self, text: str) -> bool:
+    def _requires_research(self, scan: ScanResult) -> bool:
         """Determine if the interaction requires research"""
-        # Check explicit research patterns
-        if any(re.search(pattern, text) 
-              for pattern in self.RESEARCH_PATTERNS.keys()):
-            return True
-        
-        # Check for implicit research needs
-        implicit_patterns = [
-            r"(?i)about",
-            r"(?i)explain",
-            r"(?i)tell me",
-            r"(?i)what is",
-            r"(?i)how does",
-            r"(?i)history of",
-            r"(?i)background on"
-        ]
-        
-        return any(re.search(pattern, text) for pattern in implicit_patterns)
-    
-    def _requires_memory(self, text: str) -> bool:
-        """Determine if the interaction requires memory of past interactions"""
-        memory_patterns = [
-            r"(?i)(?:like|as) (?:before|previously|last time)",
-            r"(?i)(?:again|repeat)",
-            r"(?i)(?:remember|recall)",
-            r"(?i)(?:you|we) (?:mentioned|discussed|talked about)"
-        ]
-        return any(re.search(pattern, text) for pattern in memory_patterns)
-    
-    def _requires_persistence(self, text: str) -> bool:
-        """Determine if the interaction requires persistent storage"""
-        persistence_patterns = [
-            r"(?i)save",
-            r"(?i)store",
-            r"(?i)keep",
-            r"(?i)remember this",
-            r"(?i)create a (?:file|document)",
-            r"(?i)write (?:to|a) (?:file|document)"
-        ]
-        return any(re.search(pattern, text) for pattern in persistence_patterns)
+        return scan.has("research") or scan.has("research_implicit")
     
     def get_recent_context(self, n: int = 5) -> List[ContextState]:
         """Get the n most recent context states"""
-        return self.interaction_history[-n:]
+        recent = list(islice(reversed(self.interaction_history), max(n, 0)))
+        recent.reverse()
+        return recent
+    
+    def get_type_counts(self) -> Dict[InteractionType, int]:
+        """Get the number of interactions analyzed by type"""
+        return dict(self.type_counts)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get analysis cache statistics"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "entries": len(self._cache),
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0
+        }
     
     def clear_history(self) -> None:
         """Clear the interaction history"""
         self.interaction_history.clear()
+        self.type_counts.clear()
+    
+    def clear_cache(self) -> None:
+        """Forget memoized analyses"""
+        self._cache.clear()
@@ -3,18 +3,45 @@
 """GLUE Conversation Manager"""
 
 import os
+import re
 import json
 import asyncio
-from typing import Dict, List, Any, Optional, Union
-from datetime import datetime
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    Dict, List, Set, Any, Optional, Union, AsyncIterator, Callable, Awaitable, Tuple, Pattern
+)
+from datetime import datetime, timedelta
 from pathlib import Path
 from .model import Model
 from .memory import MemoryManager
+from .journal import HistoryJournal
+from .prompt import PromptAssembler, estimate_tokens
 from .logger import get_logger
+from .tracing import get_tracer
+from .deadline import DeadlineExceeded, deadline_scope, get_deadline
 from .context import ContextAnalyzer, ContextState, InteractionType
 from .role import DynamicRole, RoleState
 from ..tools.chain import ToolChainOptimizer
 
+@lru_cache(maxsize=None)
+def _compile_substitutions(patterns: Tuple[Tuple[str, str], ...]) -> List[Tuple[Pattern, str]]:
+    """Compile (pattern, replacement) pairs once, keeping their order"""
+    return [(re.compile(pattern), replacement) for pattern, replacement in patterns]
+
+@dataclass
+class BatchResult:
+    """Outcome of one input in a process_many batch"""
+    index: int
+    input: str
+    response: Optional[str] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 class ConversationManager:
     """Manages conversations between models in a CBM"""
     
@@ -56,26 +83,99 @@ class ConversationManager:
         r"(?i)do you want me to": "I will"
     }
     
-    def __init__(self, sticky: bool = False, workspace_dir: Optional[str] = None):
-        """Initialize conversation manager"""
+    # Read-only tools that are safe to run speculatively
+    SPECULATIVE_TOOLS = ("web_search",)
+    
+    def __init__(
+        self,
+        sticky: bool = False,
+        workspace_dir: Optional[str] = None,
+        parallel: bool = False,
+        max_concurrency: int = 4,
+        history_fsync: str = "interval",
+        history_tail: Optional[int] = None,
+        history_limit: Optional[int] = None,
+        context_analyzer: Optional[ContextAnalyzer] = None,
+        tool_optimizer: Optional[ToolChainOptimizer] = None,
+        role_cache: Optional[Dict[Tuple[str, Tuple[str, ...]], str]] = None,
+        turn_timeout: Optional[float] = None,
+        speculative_tools: Optional[List[str]] = None,
+        memory_limits: Optional[Dict[str, Any]] = None,
+        pattern_recall: bool = True,
+        memory_ttl: Optional[float] = None
+    ):
+        """Initialize conversation manager
+        
+        Args:
+            sticky: Persist conversation history to the workspace
+            workspace_dir: Directory for persisted history
+            parallel: Run independent flow components concurrently
+            max_concurrency: Maximum components running at once in parallel mode
+            history_fsync: Journal fsync policy ("always", "interval" or "never")
+            history_tail: Only load this many of the most recent history records
+            history_limit: Compact the history journal down to this many records
+            context_analyzer: Analyzer to share with other conversations
+            tool_optimizer: Tool chain optimizer to share with other conversations
+            role_cache: Enhanced role prompt cache to share with other conversations
+            turn_timeout: Seconds a turn may run before remaining steps are cancelled
+            speculative_tools: Tools to start on the raw input as soon as context
+                analysis predicts the flow will need them
+            memory_limits: Capacity limits for conversation memory stores
+                (see MemoryManager)
+            pattern_recall: Index learned patterns so paraphrased requests
+                recall the flow of earlier successful turns
+            memory_ttl: Seconds messages stay in short-term memory; expired
+                messages are removed by a background sweeper
+        """
         self.sticky = sticky
+        self.history_tail = history_tail
+        self.parallel = parallel
+        self.max_concurrency = max(1, max_concurrency)
+        self.turn_timeout = turn_timeout
+        self.speculative_tools = list(speculative_tools or [])
+        self.memory_limits = memory_limits
+        self.pattern_recall = pattern_recall
+        self.memory_ttl = memory_ttl
+        self._memory_duration = timedelta(seconds=memory_ttl) if memory_ttl else None
         self.workspace_dir = os.path.abspath(workspace_dir or "workspace")
         self.history: List[Dict[str, Any]] = []
         self.active_conversation: Optional[str] = None
         self.model_states: Dict[str, Dict[str, Any]] = {}
         
         # Core components
-        self.memory_manager = MemoryManager()
+        # Only pattern triggers are indexed; conversation never searches content
+        self.memory_manager = MemoryManager(
+            limits=memory_limits, similarity_index=pattern_recall, content_index=False
+        )
         self.logger = get_logger()
-        self.context_analyzer = ContextAnalyzer()
+        self.context_analyzer = context_analyzer or ContextAnalyzer()
         
         # New components
-        self.tool_optimizer = ToolChainOptimizer()
+        self.tool_optimizer = tool_optimizer or ToolChainOptimizer()
         self.model_roles: Dict[str, DynamicRole] = {}
         
+        self.prompt_assembler = PromptAssembler()
+        
+        # Enhanced role prompts keyed by (base role, tools)
+        self._enhanced_roles: Dict[Tuple[str, Tuple[str, ...]], str] = (
+            role_cache if role_cache is not None else {}
+        )
+        
         # Performance tracking
         self.interaction_success: Dict[str, bool] = {}
         self.tool_usage: Dict[str, int] = {}
+        self.speculation_stats = {"started": 0, "hits": 0, "wasted": 0, "failed": 0}
+        
+        # Append-only history journal (sticky only)
+        self._journal: Optional[HistoryJournal] = None
+        self._journaled_count = 0
+        if self.sticky:
+            os.makedirs(self.workspace_dir, exist_ok=True)
+            self._journal = HistoryJournal(
+                self._get_history_path(),
+                fsync=history_fsync,
+                max_records=history_limit
+            )
         
         # Load history if sticky
         if self.sticky:
@@ -87,9 +187,187 @@ class ConversationManager:
         models: Dict[str, Model], 
         binding_patterns: Dict[str, List],
         user_input: str,
-        tools: Optional[Dict[str, Any]] = None
+        tools: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Process user input through the bound models and tools
+        
+        The turn is bounded by timeout (or turn_timeout) seconds. When the
+        deadline passes, remaining steps are cancelled and the responses
+        completed so far are returned.
+        """
+        with deadline_scope(self._get_turn_timeout(timeout)), \
+                get_tracer().span("conversation.turn"):
+            return await self._process(models, binding_patterns, user_input, tools)
+
+    async def process_stream(
+        self,
+        models: Dict[str, Model],
+        binding_patterns: Dict[str, List],
+        user_input: str,
+        tools: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """Process user input, yielding partial response chunks as they arrive
+        
+        Model output is streamed chunk by chunk. When models run in
+        parallel, one model is streamed live while the others are buffered,
+        so each model's text is yielded contiguously. Tool results and
+        errors are not streamed, so if the final response differs from the
+        streamed text it is yielded once the turn completes.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def on_chunk(component_name: str, chunk: Optional[str]) -> None:
+            await queue.put((component_name, chunk))
+        
+        async def run() -> str:
+            try:
+                with deadline_scope(self._get_turn_timeout(timeout)), \
+                        get_tracer().span("conversation.turn", stream=True):
+                    return await self._process(
+                        models, binding_patterns, user_input, tools, on_chunk=on_chunk
+                    )
+            finally:
+                await queue.put(None)
+        
+        task = asyncio.create_task(run())
+        active: Optional[str] = None  # Component streamed live
+        buffered: Dict[str, List[str]] = {}  # Other components, in order of first chunk
+        finished: Set[str] = set()
+        emitted = False
+        streamed: List[str] = []  # Text of the last component yielded
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                component_name, chunk = item
+                output: List[str] = []
+                if chunk is None:
+                    # Component done; promote buffered components in turn
+                    finished.add(component_name)
+                    if component_name == active:
+                        active = None
+                    while active is None and buffered:
+                        active = next(iter(buffered))
+                        output.append(None)
+                        output.extend(buffered.pop(active))
+                        if active in finished:
+                            active = None
+                elif active is None or component_name == active:
+                    if active is None:
+                        output.append(None)
+                    active = component_name
+                    output.append(chunk)
+                else:
+                    buffered.setdefault(component_name, []).append(chunk)
+                    continue
+                
+                for text in output:
+                    # None starts a new component's output
+                    if text is None:
+                        if emitted:
+                            yield "\n\n"
+                        streamed = []
+                        continue
+                    emitted = True
+                    streamed.append(text)
+                    yield text
+            final_response = await task
+        finally:
+            if not task.done():
+                task.cancel()
+        
+        # Components that stopped streaming early
+        for chunks in buffered.values():
+            if emitted:
+                yield "\n\n"
+            emitted = True
+            streamed = list(chunks)
+            for chunk in chunks:
+                yield chunk
+        
+        if final_response != "".join(streamed):
+            if emitted:
+                yield "\n\n"
+            yield final_response
+
+    async def process_many(
+        self,
+        models: Dict[str, Model],
+        binding_patterns: Dict[str, List],
+        inputs: List[str],
+        tools: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[int] = None
+    ) -> List[BatchResult]:
+        """Process independent inputs concurrently
+        
+        Each input runs as its own stateless conversation with forked models,
+        so no history leaks between items. At most `concurrency` inputs run
+        at once (max_concurrency by default). Results are returned in input
+        order, and a failing item is reported in its result instead of
+        aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.max_concurrency))
+        
+        async def run(index: int, user_input: str) -> BatchResult:
+            result = BatchResult(index=index, input=user_input)
+            async with semaphore:
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                try:
+                    conversation = self._spawn_isolated()
+                    forked = {name: model.fork() for name, model in models.items()}
+                    with deadline_scope(self.turn_timeout), \
+                            get_tracer().span("conversation.turn", batch_index=index):
+                        result.response = await conversation._process(
+                            forked, binding_patterns, user_input, tools
+                        )
+                    # _process reports failures as an error turn in history
+                    if conversation.history and conversation.history[-1]["role"] == "error":
+                        result.error = conversation.history[-1]["content"]
+                except Exception as e:
+                    result.error = str(e)
+                    self.logger.error(f"Batch item {index} failed: {result.error}")
+                result.duration = loop.time() - start
+            return result
+        
+        return await asyncio.gather(
+            *(run(index, user_input) for index, user_input in enumerate(inputs))
+        )
+
+    def _spawn_isolated(self) -> "ConversationManager":
+        """Create a non-persistent conversation sharing this manager's analyzers"""
+        return ConversationManager(
+            sticky=False,
+            workspace_dir=self.workspace_dir,
+            parallel=self.parallel,
+            max_concurrency=self.max_concurrency,
+            context_analyzer=self.context_analyzer,
+            tool_optimizer=self.tool_optimizer,
+            role_cache=self._enhanced_roles,
+            turn_timeout=self.turn_timeout,
+            speculative_tools=self.speculative_tools,
+            memory_limits=self.memory_limits,
+            pattern_recall=self.pattern_recall
+        )
+
+    def _get_turn_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        """Get the time budget for a turn"""
+        return timeout if timeout is not None else self.turn_timeout
+
+    async def _process(
+        self,
+        models: Dict[str, Model],
+        binding_patterns: Dict[str, List],
+        user_input: str,
+        tools: Optional[Dict[str, Any]] = None,
+        on_chunk: Optional[Callable[[str, Optional[str]], Awaitable[None]]] = None
     ) -> str:
-        """Process user input through the bound models and tools"""
+        """Run a turn through the flow, forwarding model chunks to on_chunk if given"""
+        responses: List[Dict[str, Any]] = []
+        prefetched: Dict[str, asyncio.Future] = {}
         try:
             self.logger.debug("Processing conversation...")
             self.logger.debug(f"Available models: {list(models.keys())}")
@@ -97,10 +375,11 @@ class ConversationManager:
                 self.logger.debug(f"Available tools: {list(tools.keys())}")
             
             # Analyze context first
-            context = self.context_analyzer.analyze(
-                user_input,
-                available_tools=list(tools.keys()) if tools else None
-            )
+            with get_tracer().span("context.analyze"):
+                context = self.context_analyzer.analyze(
+                    user_input,
+                    available_tools=list(tools.keys()) if tools else None
+                )
             self.logger.debug(f"Context analysis: {context}")
 
             # Update magnetic field context if present
@@ -131,8 +410,11 @@ class ConversationManager:
                 key=f"user_input_{message['timestamp']}",
                 content=message,
                 memory_type="short_term",
+                duration=self._memory_duration,
                 context=context
             )
+            if self._memory_duration:
+                self.memory_manager.start_expiry_sweeper(interval=min(self.memory_ttl, 60.0))
 
             # Initialize roles for new models
             for model_name, model in models.items():
@@ -143,171 +425,42 @@ class ConversationManager:
                             self.model_roles[model_name].allow_tool(tool_name)
 
             # Determine conversation flow based on binding patterns and context
-            flow = self._determine_flow(binding_patterns, context)
+            with get_tracer().span("flow.determine"):
+                flow = self._determine_flow(binding_patterns, context)
             self.logger.debug(f"Determined conversation flow: {flow}")
             
-            # If no flow, use the first available model
+            # If no flow, reuse the sequence of a similar successful turn,
+            # or fall back to the first available model
             if not flow and models:
-                flow = [next(iter(models.keys()))]
-                self.logger.debug(f"No flow defined, using first model: {flow}")
+                flow = self._recall_flow(user_input, context, models, tools)
+                if flow:
+                    self.logger.debug(f"No flow defined, using recalled flow: {flow}")
+                else:
+                    flow = [next(iter(models.keys()))]
+                    self.logger.debug(f"No flow defined, using first model: {flow}")
             
             # Optimize tool chain if tools present
+            optimized_tools: List[str] = []
             if tools:
                 tool_names = list(tools.keys())
                 optimized_tools = self.tool_optimizer.optimize_chain(tool_names, context)
                 self.logger.debug(f"Optimized tool chain: {optimized_tools}")
             
+            # Start predicted tools on the raw input while models generate
+            prefetched = self._start_prefetch(flow, tools, context, optimized_tools, user_input)
+            
             # Process through model/tool chain
-            current_input = user_input
-            responses = []
             start_time = datetime.now()
             
-            for component_name in flow:
-                self.logger.debug(f"Processing component: {component_name}")
-                
-                # Check if it's a model
-                if component_name in models:
-                    model = models[component_name]
-                    role = self.model_roles[component_name]
-                    
-                    # Adjust role for context
-                    role_context = role.adjust_for_context(context)
-                    self.logger.debug(f"Role state: {role_context}")
-                    
-                    # Skip if role is passive in this context
-                    if role_context.state == RoleState.PASSIVE:
-                        self.logger.debug(f"Skipping {component_name} - passive in this context")
-                        continue
-                    
-                    # Get model's tools
-                    model_tools = list(model._tools.keys()) if hasattr(model, "_tools") else []
-                    
-                    # Enhance model's role with tool capabilities
-                    if model_tools and hasattr(model, "role"):
-                        model.role = self._enhance_role_with_tools(model.role, model_tools)
-                    
-                    # Retrieve relevant memory for model
-                    model_context = self._get_model_context(component_name)
-                    self.logger.debug(f"Retrieved context for {component_name}")
-                    
-                    # Update current input with context
-                    enhanced_input = self._enhance_input_with_context(current_input, model_context)
-                    self.logger.debug("Enhanced input with context")
-                    
-                    try:
-                        self.logger.info("thinking...")
-                        response = await model.generate(enhanced_input)
-                        self.logger.debug(f"Got response: {response}")
-                        
-                        responses.append({
-                            "component": component_name,
-                            "type": "model",
-                            "content": response,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        
-                        # Store model response in memory with context
-                        self.memory_manager.store(
-                            key=f"response_{component_name}_{datetime.now().isoformat()}",
-                            content=response,
-                            memory_type="short_term",
-                            context=context
-                        )
-                        
-                        # Update for next in chain
-                        current_input = response
-                        
-                        # Store in history
-                        self.history.append({
-                            "role": "assistant",
-                            "model": component_name,
-                            "content": response,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        
-                        # Record success
-                        self.interaction_success[component_name] = True
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error generating response from {component_name}: {str(e)}")
-                        self.interaction_success[component_name] = False
-                        raise
-                
-                # Check if it's a tool
-                elif tools and component_name in tools:
-                    tool = tools[component_name]
-                    
-                    # Skip tool if not required in chat mode
-                    if (context.interaction_type == InteractionType.CHAT and
-                        component_name not in context.tools_required):
-                        self.logger.debug(f"Skipping tool {component_name} - not required for chat")
-                        continue
-                    
-                    # Skip if tool was removed in optimization
-                    if component_name not in optimized_tools:
-                        self.logger.debug(f"Skipping tool {component_name} - removed in optimization")
-                        continue
-                    
-                    try:
-                        self.logger.debug(f"Executing tool: {component_name}")
-                        tool_start = datetime.now()
-                        result = await tool.execute(current_input)
-                        tool_duration = (datetime.now() - tool_start).total_seconds()
-                        self.logger.debug(f"Tool result: {result}")
-                        
-                        # Record tool usage
-                        self.tool_usage[component_name] = self.tool_usage.get(component_name, 0) + 1
-                        
-                        # Record tool success
-                        self.tool_optimizer.record_usage(
-                            tool_name=component_name,
-                            input_type=type(current_input).__name__,
-                            output_type=type(result).__name__,
-                            success=True,
-                            execution_time=tool_duration,
-                            context=context
-                        )
-                        
-                        responses.append({
-                            "component": component_name,
-                            "type": "tool",
-                            "content": result,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        
-                        # Store tool result in memory with context
-                        self.memory_manager.store(
-                            key=f"result_{component_name}_{datetime.now().isoformat()}",
-                            content=result,
-                            memory_type="short_term",
-                            context=context
-                        )
-                        
-                        # Update for next in chain
-                        current_input = result
-                        
-                        # Store in history
-                        self.history.append({
-                            "role": "tool",
-                            "tool": component_name,
-                            "content": result,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error executing tool {component_name}: {str(e)}")
-                        # Record tool failure
-                        self.tool_optimizer.record_usage(
-                            tool_name=component_name,
-                            input_type=type(current_input).__name__,
-                            output_type="error",
-                            success=False,
-                            execution_time=(datetime.now() - tool_start).total_seconds(),
-                            context=context
-                        )
-                        raise
-                else:
-                    self.logger.warning(f"Component {component_name} not found in available models or tools")
+            run_flow = self._run_flow(
+                flow, binding_patterns, user_input,
+                models, tools, context, optimized_tools, on_chunk, responses, prefetched
+            )
+            deadline = get_deadline()
+            if deadline:
+                await deadline.run(run_flow)
+            else:
+                await run_flow
 
             # Record interaction pattern
             total_duration = (datetime.now() - start_time).total_seconds()
@@ -335,6 +488,20 @@ class ConversationManager:
             self.logger.info(final_response)
             return final_response
 
+        except DeadlineExceeded as e:
+            # Remaining steps were cancelled; return what completed in time
+            self.logger.warning(f"{e}, returning partial result")
+            self.history.append({
+                "role": "error",
+                "content": str(e),
+                "timestamp": datetime.now().isoformat()
+            })
+            if self.sticky:
+                self._save_history()
+            if responses:
+                return f"{self._synthesize_responses(responses)}\n\n[{e}; remaining steps were cancelled]"
+            return f"Error: {e}"
+
         except Exception as e:
             # Log error and return error message
             error_msg = f"Error processing conversation: {str(e)}"
@@ -347,6 +514,375 @@ class ConversationManager:
             if self.sticky:
                 self._save_history()
             return f"Error: {error_msg}"
+        
+        finally:
+            self._discard_prefetch(prefetched)
+
+    async def _run_flow(
+        self,
+        flow: List[str],
+        binding_patterns: Dict[str, List],
+        user_input: str,
+        models: Dict[str, Model],
+        tools: Optional[Dict[str, Any]],
+        context: ContextState,
+        optimized_tools: List[str],
+        on_chunk: Optional[Callable[[str, Optional[str]], Awaitable[None]]],
+        responses: List[Dict[str, Any]],
+        prefetched: Optional[Dict[str, asyncio.Future]] = None
+    ) -> None:
+        """Run the flow, appending each recorded response to responses as it completes"""
+        if self.parallel:
+            await self._run_flow_parallel(
+                flow, binding_patterns, user_input,
+                models, tools, context, optimized_tools, on_chunk, responses, prefetched
+            )
+            return
+        
+        current_input = user_input
+        for component_name in flow:
+            response = await self._run_component(
+                component_name, current_input,
+                models, tools, context, optimized_tools, on_chunk, prefetched
+            )
+            if response is None:
+                continue
+            self._record_response(response, context)
+            responses.append(response)
+            
+            # Update for next in chain
+            current_input = response["content"]
+
+    async def _run_component(
+        self,
+        component_name: str,
+        current_input: Any,
+        models: Dict[str, Model],
+        tools: Optional[Dict[str, Any]],
+        context: ContextState,
+        optimized_tools: List[str],
+        on_chunk: Optional[Callable[[str, Optional[str]], Awaitable[None]]] = None,
+        prefetched: Optional[Dict[str, asyncio.Future]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Run a single flow component, returning its response or None if skipped"""
+        self.logger.debug(f"Processing component: {component_name}")
+        
+        # Check if it's a model
+        if component_name in models:
+            model = models[component_name]
+            role = self.model_roles[component_name]
+            
+            # Adjust role for context
+            role_context = role.adjust_for_context(context)
+            self.logger.debug(f"Role state: {role_context}")
+            
+            # Skip if role is passive in this context
+            if role_context.state == RoleState.PASSIVE:
+                self.logger.debug(f"Skipping {component_name} - passive in this context")
+                return None
+            
+            # Get model's tools
+            model_tools = list(model._tools.keys()) if hasattr(model, "_tools") else []
+            
+            # Enhance model's base role with tool capabilities
+            if model_tools and hasattr(model, "role"):
+                model.role = self._get_enhanced_role(role.base_role, model_tools)
+            
+            # Retrieve relevant memory for model
+            model_context = self._get_model_context(component_name)
+            self.logger.debug(f"Retrieved context for {component_name}")
+            
+            # Update current input with context, within the model's token budget
+            enhanced_input = self._enhance_input_with_context(
+                current_input, model_context, self._get_prompt_budget(model)
+            )
+            self.logger.debug("Enhanced input with context")
+            
+            try:
+                self.logger.info("thinking...")
+                with get_tracer().span("model.generate", component=component_name):
+                    response = await self._generate(
+                        model, enhanced_input, component_name, on_chunk
+                    )
+                self.logger.debug(f"Got response: {response}")
+                
+                # Record success
+                self.interaction_success[component_name] = True
+                
+                return {
+                    "component": component_name,
+                    "type": "model",
+                    "content": response,
+                    "timestamp": datetime.now().isoformat()
+                }
+                
+            except Exception as e:
+                self.logger.error(f"Error generating response from {component_name}: {str(e)}")
+                self.interaction_success[component_name] = False
+                raise
+        
+        # Check if it's a tool
+        elif tools and component_name in tools:
+            tool = tools[component_name]
+            
+            # Skip tool if not required in chat mode
+            if (context.interaction_type == InteractionType.CHAT and
+                component_name not in context.tools_required):
+                self.logger.debug(f"Skipping tool {component_name} - not required for chat")
+                return None
+            
+            # Skip if tool was removed in optimization
+            if component_name not in optimized_tools:
+                self.logger.debug(f"Skipping tool {component_name} - removed in optimization")
+                return None
+            
+            try:
+                self.logger.debug(f"Executing tool: {component_name}")
+                tool_start = datetime.now()
+                with get_tracer().span("tool.execute", component=component_name):
+                    result = await self._execute_tool(
+                        tool, component_name, current_input, prefetched
+                    )
+                tool_duration = (datetime.now() - tool_start).total_seconds()
+                self.logger.debug(f"Tool result: {result}")
+                
+                # Record tool usage
+                self.tool_usage[component_name] = self.tool_usage.get(component_name, 0) + 1
+                
+                # Record tool success
+                self.tool_optimizer.record_usage(
+                    tool_name=component_name,
+                    input_type=type(current_input).__name__,
+                    output_type=type(result).__name__,
+                    success=True,
+                    execution_time=tool_duration,
+                    context=context
+                )
+                
+                return {
+                    "component": component_name,
+                    "type": "tool",
+                    "content": result,
+                    "timestamp": datetime.now().isoformat()
+                }
+                
+            except Exception as e:
+                self.logger.error(f"Error executing tool {component_name}: {str(e)}")
+                # Record tool failure
+                self.tool_optimizer.record_usage(
+                    tool_name=component_name,
+                    input_type=type(current_input).__name__,
+                    output_type="error",
+                    success=False,
+                    execution_time=(datetime.now() - tool_start).total_seconds(),
+                    context=context
+                )
+                raise
+        else:
+            self.logger.warning(f"Component {component_name} not found in available models or tools")
+            return None
+
+    def _start_prefetch(
+        self,
+        flow: List[str],
+        tools: Optional[Dict[str, Any]],
+        context: ContextState,
+        optimized_tools: List[str],
+        user_input: str
+    ) -> Dict[str, asyncio.Future]:
+        """Speculatively start tools that context analysis predicts the flow will reach"""
+        prefetched: Dict[str, asyncio.Future] = {}
+        if not self.speculative_tools or not tools:
+            return prefetched
+        
+        for tool_name in self.speculative_tools:
+            if (tool_name in tools and tool_name in optimized_tools and
+                    tool_name in context.tools_required and
+                    # A tool first in the flow gets the raw input anyway
+                    tool_name in flow[1:]):
+                self.logger.debug(f"Prefetching tool {tool_name}")
+                prefetched[tool_name] = asyncio.ensure_future(tools[tool_name].execute(user_input))
+                self.speculation_stats["started"] += 1
+        return prefetched
+
+    async def _execute_tool(
+        self,
+        tool: Any,
+        component_name: str,
+        current_input: Any,
+        prefetched: Optional[Dict[str, asyncio.Future]] = None
+    ) -> Any:
+        """Execute a tool, using its speculative result if one was started"""
+        task = prefetched.pop(component_name, None) if prefetched else None
+        if task is not None:
+            try:
+                result = await task
+                self.speculation_stats["hits"] += 1
+                return result
+            except Exception as e:
+                self.speculation_stats["failed"] += 1
+                self.logger.debug(f"Prefetch of {component_name} failed, executing normally: {str(e)}")
+        return await tool.execute(current_input)
+
+    def _discard_prefetch(self, prefetched: Dict[str, asyncio.Future]) -> None:
+        """Cancel speculative tool runs the flow never reached"""
+        for tool_name, task in prefetched.items():
+            self.speculation_stats["wasted"] += 1
+            self.logger.debug(f"Discarding unused prefetch of {tool_name}")
+            if task.done():
+                if not task.cancelled():
+                    task.exception()  # Mark any failure as retrieved
+            else:
+                task.cancel()
+        prefetched.clear()
+
+    def get_speculation_stats(self) -> Dict[str, Any]:
+        """Get speculative tool prefetch statistics"""
+        started = self.speculation_stats["started"]
+        return {
+            **self.speculation_stats,
+            "hit_rate": self.speculation_stats["hits"] / started if started else 0.0
+        }
+
+    def _record_response(self, response: Dict[str, Any], context: ContextState) -> None:
+        """Store a component response in memory and history"""
+        component_name = response["component"]
+        if response["type"] == "model":
+            key = f"response_{component_name}_{datetime.now().isoformat()}"
+            entry = {"role": "assistant", "model": component_name}
+        else:
+            key = f"result_{component_name}_{datetime.now().isoformat()}"
+            entry = {"role": "tool", "tool": component_name}
+        
+        # Store in memory with context
+        self.memory_manager.store(
+            key=key,
+            content=response["content"],
+            memory_type="short_term",
+            duration=self._memory_duration,
+            context=context
+        )
+        
+        # Store in history
+        self.history.append({
+            **entry,
+            "content": response["content"],
+            "timestamp": datetime.now().isoformat()
+        })
+
+    def _build_flow_graph(
+        self,
+        flow: List[str],
+        binding_patterns: Dict[str, List]
+    ) -> Dict[str, List[str]]:
+        """Compile binding patterns into the upstream dependencies of each flow component"""
+        position = {component: index for index, component in enumerate(flow)}
+        dependencies: Dict[str, List[str]] = {component: [] for component in flow}
+        
+        for binding_type in ('glue', 'velcro', 'magnet', 'tape'):
+            for item in binding_patterns.get(binding_type, []):
+                source, target = item[0], item[1]
+                if source not in position or target not in position or source == target:
+                    continue
+                # Edges always point forward in flow order, so the graph stays acyclic
+                upstream, downstream = sorted((source, target), key=position.get)
+                if upstream not in dependencies[downstream]:
+                    dependencies[downstream].append(upstream)
+        
+        for upstream in dependencies.values():
+            upstream.sort(key=position.get)
+        return dependencies
+
+    async def _run_flow_parallel(
+        self,
+        flow: List[str],
+        binding_patterns: Dict[str, List],
+        user_input: str,
+        models: Dict[str, Model],
+        tools: Optional[Dict[str, Any]],
+        context: ContextState,
+        optimized_tools: List[str],
+        on_chunk: Optional[Callable[[str, Optional[str]], Awaitable[None]]] = None,
+        responses: Optional[List[Dict[str, Any]]] = None,
+        prefetched: Optional[Dict[str, asyncio.Future]] = None
+    ) -> List[Dict[str, Any]]:
+        """Run independent branches of the flow concurrently
+        
+        Each component waits only for its upstream dependencies. Components
+        without dependencies receive the user input, and skipped components
+        pass their input through unchanged. Responses are recorded, appended
+        to responses and returned in flow order regardless of completion
+        order. If the flow is cancelled, responses of the components that
+        already finished are still recorded.
+        """
+        responses = [] if responses is None else responses
+        dependencies = self._build_flow_graph(flow, binding_patterns)
+        self.logger.debug(f"Flow dependencies: {dependencies}")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: Dict[str, asyncio.Future] = {}
+        
+        async def run(component_name: str):
+            outputs = [(await tasks[upstream])[1] for upstream in dependencies[component_name]]
+            if not outputs:
+                component_input = user_input
+            elif len(outputs) == 1:
+                component_input = outputs[0]
+            else:
+                component_input = "\n\n".join(str(output) for output in outputs)
+            
+            async with semaphore:
+                response = await self._run_component(
+                    component_name, component_input,
+                    models, tools, context, optimized_tools, on_chunk, prefetched
+                )
+            return response, (response["content"] if response else component_input)
+        
+        # Upstream components always precede their dependents in the flow
+        for component_name in flow:
+            tasks[component_name] = asyncio.ensure_future(run(component_name))
+        
+        def record(results) -> None:
+            for response, _ in results:
+                if response is not None:
+                    self._record_response(response, context)
+                    responses.append(response)
+        
+        try:
+            results = await asyncio.gather(*tasks.values())
+        except BaseException:
+            finished = [
+                task for task in tasks.values()
+                if task.done() and not task.cancelled() and task.exception() is None
+            ]
+            for task in tasks.values():
+                task.cancel()
+            # Keep the work that completed before the failure
+            record(task.result() for task in finished)
+            raise
+        
+        record(results)
+        return responses
+
+    async def _generate(
+        self,
+        model: Model,
+        prompt: str,
+        component_name: str,
+        on_chunk: Optional[Callable[[str, Optional[str]], Awaitable[None]]] = None
+    ) -> str:
+        """Generate a model response, streaming chunks to on_chunk when given
+        
+        A final None chunk marks the end of the component's output.
+        """
+        if on_chunk is None:
+            return await model.generate(prompt)
+        
+        chunks = []
+        async for chunk in model.generate_stream(prompt):
+            chunks.append(chunk)
+            await on_chunk(component_name, chunk)
+        await on_chunk(component_name, None)
+        return "".join(chunks)
 
     def _determine_flow(self, binding_patterns: Dict[str, List], context: Optional[ContextState] = None) -> List[str]:
         """Determine the order of model/tool execution based on binding patterns"""
@@ -419,6 +955,24 @@ class ConversationManager:
         
         return flow
 
+    def _recall_flow(
+        self,
+        user_input: str,
+        context: ContextState,
+        models: Dict[str, Model],
+        tools: Optional[Dict[str, Any]]
+    ) -> List[str]:
+        """Get the available components of a learned pattern similar to the input"""
+        if not self.pattern_recall:
+            return []
+        pattern = self.memory_manager.find_similar_pattern(user_input, context)
+        if pattern is None:
+            return []
+        return [
+            component for component in dict.fromkeys(pattern.sequence)
+            if component in models or (tools and component in tools)
+        ]
+
     def _synthesize_responses(self, responses: List[Dict[str, Any]]) -> str:
         """Combine multiple responses into a final response"""
         if not responses:
@@ -446,10 +1000,17 @@ class ConversationManager:
         # For other responses, return the content directly
         return str(last_response["content"])
 
+    def _get_enhanced_role(self, base_role: str, tools: List[str]) -> str:
+        """Get the tool-enhanced prompt for a base role, enhancing it only once"""
+        key = (base_role, tuple(tools))
+        enhanced = self._enhanced_roles.get(key)
+        if enhanced is None:
+            enhanced = self._enhance_role_with_tools(base_role, tools)
+            self._enhanced_roles[key] = enhanced
+        return enhanced
+
     def _enhance_role_with_tools(self, role: str, tools: List[str]) -> str:
         """Enhance model role with integrated tool capabilities"""
-        import re
-        
         # Start with original role
         enhanced = role
         
@@ -485,10 +1046,10 @@ class ConversationManager:
                 enhanced += f"\nWhen asked to run or analyze code, you MUST use code_interpreter. "
                 enhanced += f"NEVER say you can't execute code - you have code_interpreter and MUST use it."
         
-        # Apply pattern replacements while preserving role identity
-        for pattern, replacement in self.TOOL_PATTERNS.items():
-            enhanced = re.sub(pattern, replacement, enhanced)
-        
+        # Apply pattern replacements in order while preserving role identity;
+        # later patterns see the output of earlier ones
+        for regex, replacement in _compile_substitutions(tuple(self.TOOL_PATTERNS.items())):
+            enhanced = regex.sub(replacement, enhanced)
         return enhanced
 
     def _get_model_context(self, model_name: str) -> Dict[str, Any]:
@@ -499,58 +1060,70 @@ class ConversationManager:
             "model_state": self.model_states.get(model_name, {})
         }
         
-        # Get recent conversation history
-        recent_messages = [
-            msg for msg in self.memory_manager.short_term.values()
-            if isinstance(msg.content, dict) and msg.content.get("role") in ["user", "assistant", "tool"]
-        ][-5:]  # Last 5 messages
-        context["recent_history"] = [msg.content for msg in recent_messages]
+        # Get recent conversation history (last 5 messages)
+        context["recent_history"] = self.memory_manager.get_recent_messages(
+            limit=5,
+            roles=["user", "assistant", "tool"]
+        )
         
         # Get shared memories for this model
         if model_name in self.memory_manager.shared:
-            context["shared_memory"] = {
-                key: segment.content
-                for key, segment in self.memory_manager.shared[model_name].items()
-            }
+            context["shared_memory"] = self.memory_manager.shared[model_name].contents()
         
         return context
 
-    def _enhance_input_with_context(self, current_input: str, context: Dict[str, Any]) -> str:
-        """Enhance the input with context from memory"""
-        history_str = "\n".join(
-            f"{msg['role']}: {msg['content']}" 
-            for msg in context["recent_history"]
+    def _enhance_input_with_context(
+        self,
+        current_input: str,
+        context: Dict[str, Any],
+        budget: Optional[int] = None
+    ) -> str:
+        """Enhance the input with context from memory, fitting an optional token budget"""
+        return self.prompt_assembler.build(
+            current_input,
+            context["recent_history"],
+            context.get("shared_memory"),
+            budget
         )
-        
-        return f"""Context:
-{history_str}
 
-Current Input:
-{current_input}"""
+    def _get_prompt_budget(self, model: Model) -> Optional[int]:
+        """Get the tokens available for a model's input, if it has a context window"""
+        config = getattr(model, "config", None)
+        if not config or not config.context_window:
+            return None
+        system_tokens = estimate_tokens(config.system_prompt or "")
+        return max(0, config.context_window - config.max_tokens - system_tokens)
 
     def _get_history_path(self) -> str:
-        """Get path to history file"""
+        """Get path to history journal"""
         os.makedirs(self.workspace_dir, exist_ok=True)
+        return os.path.join(self.workspace_dir, "chat_history.jsonl")
+
+    def _get_legacy_history_path(self) -> str:
+        """Get path to the pre-journal history file"""
         return os.path.join(self.workspace_dir, "chat_history.json")
 
     def _save_history(self) -> None:
-        """Save conversation history to file"""
+        """Append history records not yet journaled"""
         if not self.sticky:
             return
         
-        history_path = self._get_history_path()
-        with open(history_path, 'w') as f:
-            json.dump(self.history, f, indent=2)
+        self._journal.append(self.history[self._journaled_count:])
+        self._journaled_count = len(self.history)
 
     def _load_history(self) -> None:
-        """Load conversation history from file"""
+        """Load conversation history (or its most recent tail) from the journal"""
         if not self.sticky:
             return
-            
-        history_path = self._get_history_path()
-        if os.path.exists(history_path):
-            with open(history_path, 'r') as f:
-                self.history = json.load(f)
+        
+        # Migrate a legacy chat_history.json into the journal once
+        legacy_path = self._get_legacy_history_path()
+        if not os.path.exists(self._journal.path) and os.path.exists(legacy_path):
+            with open(legacy_path, 'r') as f:
+                self._journal.compact(json.load(f))
+        
+        self.history = self._journal.load(tail=self.history_tail)
+        self._journaled_count = len(self.history)
 
     def get_history(self) -> List[Dict[str, Any]]:
         """Get conversation history"""
@@ -560,10 +1133,19 @@ Current Input:
         """Clear conversation history"""
         self.history = []
         self.memory_manager.clear("short_term")
+        self._journaled_count = 0
         if self.sticky:
-            history_path = self._get_history_path()
-            if os.path.exists(history_path):
-                os.remove(history_path)
+            self._journal.clear()
+            legacy_path = self._get_legacy_history_path()
+            if os.path.exists(legacy_path):
+                os.remove(legacy_path)
+
+    def close(self) -> None:
+        """Flush and close persisted history and memory"""
+        self.memory_manager.close()
+        if self._journal:
+            self._save_history()
+            self._journal.close()
 
     def save_state(self) -> Dict[str, Any]:
         """Save conversation state"""
@@ -0,0 +1,85 @@
+# src/glue/core/deadline.py
+
+"""GLUE Turn Deadlines"""
+
+import time
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional
+import aiohttp
+
+# Timeout used for HTTP requests made outside any deadline (aiohttp's default)
+DEFAULT_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=300)
+
+# Deadline of the turn running in the current task
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("glue_deadline", default=None)
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when a turn runs past its deadline"""
+
+    def __init__(self, deadline: "Deadline"):
+        super().__init__(f"Turn exceeded its {deadline.timeout:.1f}s deadline")
+        self.deadline = deadline
+
+class Deadline:
+    """
+    Absolute time budget for a unit of work.
+
+    Deadlines propagate to nested calls through a context variable, so
+    model calls, tool executions and HTTP requests started within a
+    deadline_scope() can bound themselves by the time remaining.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded if the deadline has passed"""
+        if self.expired:
+            raise DeadlineExceeded(self)
+
+    async def run(self, awaitable: Awaitable[Any]) -> Any:
+        """Await within the remaining time, cancelling the work on expiry"""
+        try:
+            return await asyncio.wait_for(awaitable, timeout=self.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(self) from None
+
+def get_deadline() -> Optional[Deadline]:
+    """Get the deadline of the current task, if any"""
+    return _current_deadline.get()
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Run a block under a deadline
+
+    An enclosing deadline that expires sooner stays in effect. Without a
+    timeout the enclosing deadline (if any) is used unchanged.
+    """
+    current = _current_deadline.get()
+    if timeout is None or (current is not None and current.remaining() <= timeout):
+        yield current
+        return
+
+    token = _current_deadline.set(Deadline(timeout))
+    try:
+        yield _current_deadline.get()
+    finally:
+        _current_deadline.reset(token)
+
+def request_timeout() -> aiohttp.ClientTimeout:
+    """Get an HTTP timeout bounded by the current deadline"""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return DEFAULT_REQUEST_TIMEOUT
+    return aiohttp.ClientTimeout(total=deadline.remaining())
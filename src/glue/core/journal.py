@@ -0,0 +1,245 @@
+# src/glue/core/journal.py
+
+"""GLUE Append-Only History Journal"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Any, Optional, Iterator
+
+class HistoryJournal:
+    """
+    Append-only JSON-lines journal for conversation history.
+
+    Each record is written as a single line, so persisting a turn costs
+    O(new records) instead of rewriting the whole history. Durability is
+    controlled by the fsync policy:
+
+    - "always": fsync after every append
+    - "interval": fsync at most once every fsync_interval seconds
+    - "never": leave flushing to the operating system
+
+    When max_records is set, the journal is compacted down to the most
+    recent max_records lines in a background thread once it grows past
+    twice that size.
+    """
+
+    FSYNC_POLICIES = ("always", "interval", "never")
+
+    def __init__(
+        self,
+        path: str,
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+        max_records: Optional[int] = None
+    ):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_records = max_records
+
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()  # One rewrite at a time
+        self._file = None
+        self._last_fsync = 0.0
+        self._line_count: Optional[int] = None
+        self._compaction: Optional[threading.Thread] = None
+
+    # ==================== Writing ====================
+    def append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the journal"""
+        if not records:
+            return
+        data = "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(data)
+            self._file.flush()
+            self._sync()
+            if self._line_count is not None:
+                self._line_count += len(records)
+
+        self._maybe_compact()
+
+    def _sync(self) -> None:
+        """Fsync the journal according to the configured policy"""
+        if self.fsync == "never":
+            return
+        now = time.monotonic()
+        if self.fsync == "always" or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self) -> None:
+        """Wait for background compaction and close the journal"""
+        self.wait()
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                if self.fsync != "never":
+                    os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def clear(self) -> None:
+        """Delete the journal"""
+        self.wait()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._line_count = 0
+
+    # ==================== Reading ====================
+    def iter_records(self, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Lazily iterate over all records, oldest first
+
+        Args:
+            end: Byte offset to stop reading at (defaults to the end of the file)
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            position = 0
+            for line in f:
+                position += len(line)
+                if end is not None and position > end:
+                    return
+                record = self._decode(line.decode("utf-8", errors="replace"))
+                if record is not None:
+                    yield record
+
+    def load(self, tail: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Load all records, or only the last `tail` records
+
+        Args:
+            tail: Number of most recent records to load
+            end: Byte offset to stop reading at (defaults to the end of the file)
+        """
+        if tail is None:
+            return list(self.iter_records(end))
+        if tail <= 0 or not os.path.exists(self.path):
+            return []
+
+        records = []
+        for line in reversed(self._read_tail_lines(tail, end)):
+            record = self._decode(line)
+            if record is not None:
+                records.append(record)
+                if len(records) == tail:
+                    break
+        records.reverse()
+        return records
+
+    def _read_tail_lines(
+        self, count: int, end: Optional[int] = None, block_size: int = 65536
+    ) -> List[str]:
+        """Read at least the last `count` lines by seeking backwards from end"""
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell() if end is None else min(end, f.tell())
+            data = b""
+            while position > 0 and data.count(b"\n") <= count:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+        lines = data.decode("utf-8", errors="replace").splitlines()
+        # The first line may be partial unless we reached the start of the file
+        if position > 0 and lines:
+            lines = lines[1:]
+        return lines
+
+    @staticmethod
+    def _decode(line: str) -> Optional[Dict[str, Any]]:
+        """Decode a journal line, skipping blank or torn lines"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            return None
+
+    # ==================== Compaction ====================
+    def compact(self, records: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Atomically rewrite the journal
+
+        Without records, keeps the most recent max_records records (or all
+        of them) and drops torn lines. Only the journal up to a snapshot
+        offset is read; records appended after it are carried over as is.
+        """
+        with self._compact_lock:
+            self._compact(records)
+
+    def _compact(self, records: Optional[List[Dict[str, Any]]]) -> None:
+        temp_path = f"{self.path}.compact"
+        with self._lock:
+            offset = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+        if records is None:
+            records = self.load(tail=self.max_records, end=offset)
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+
+        with self._lock:
+            # Carry over anything appended after the snapshot was taken
+            if os.path.exists(self.path) and os.path.getsize(self.path) > offset:
+                with open(self.path, "rb") as src, open(temp_path, "ab") as dst:
+                    src.seek(offset)
+                    appended = src.read()
+                    dst.write(appended)
+                    appended_lines = appended.count(b"\n")
+            else:
+                appended_lines = 0
+
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(temp_path, "rb+") as f:
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self._line_count = len(records) + appended_lines
+
+    def compact_in_background(self) -> threading.Thread:
+        """Start compaction in a background thread"""
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return self._compaction
+            self._compaction = threading.Thread(
+                target=self.compact,
+                name=f"journal-compact-{os.path.basename(self.path)}",
+                daemon=True
+            )
+            self._compaction.start()
+            return self._compaction
+
+    def wait(self) -> None:
+        """Wait for any running background compaction"""
+        compaction = self._compaction
+        if compaction is not None and compaction is not threading.current_thread():
+            compaction.join()
+
+    def _maybe_compact(self) -> None:
+        """Compact in the background once the journal exceeds twice max_records"""
+        if not self.max_records:
+            return
+        if self._line_count is None:
+            self._line_count = self._count_lines()
+        if self._line_count > 2 * self.max_records:
+            self.compact_in_background()
+
+    def _count_lines(self) -> int:
+        """Count lines currently in the journal"""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(65536), b""))
@@ -1,25 +1,115 @@
 # src/glue/core/memory.py
-from typing import Dict, Any, Optional, List, Set, TypeVar, Generic
+from typing import (
+    Dict, Any, Optional, List, Set, TypeVar, Generic, Deque, Tuple, Iterable, Iterator,
+    Callable, Union, Mapping, FrozenSet
+)
+from collections.abc import Mapping as MappingABC
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
+from bisect import bisect_left, insort
+from array import array
+from types import MappingProxyType
+import asyncio
+import heapq
+import itertools
 import json
 import os
+import sys
+import threading
+from functools import wraps
 from pathlib import Path
 from .context import ContextState, InteractionType, ComplexityLevel
+from .memory_backend import MemoryBackend, JsonDirectoryBackend, WriteBehindBackend
+from .similarity import MinHashIndex
+
+# Content of persisted segments not yet read from the backend
+_UNLOADED = object()
+
+# (memory_type, key) reference to a segment in short-term, long-term or working memory
+MemoryRef = Tuple[str, str]
+
+# (from_model, key, to_model) identity of a shared segment
+ShareId = Tuple[str, str, str]
+
+# Shared placeholders for segments without metadata or tags
+_NO_METADATA: Mapping[str, Any] = MappingProxyType({})
+_NO_TAGS: FrozenSet[str] = frozenset()
 
-@dataclass
 class MemorySegment:
-    """Represents a single memory segment"""
-    content: Any
-    created_at: datetime = field(default_factory=datetime.now)
-    expires_at: Optional[datetime] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    access_count: int = 0
-    last_accessed: Optional[datetime] = None
-    # Added for context awareness
-    context: Optional[ContextState] = None
-    tags: Set[str] = field(default_factory=set)
+    """
+    Represents a single memory segment.
+
+    Segments are slotted, and metadata and tags point at shared empty
+    placeholders until first accessed, so untagged segments without
+    metadata carry no per-segment dict or set.
+    """
+
+    __slots__ = (
+        "content", "created_at", "expires_at", "_metadata",
+        "access_count", "last_accessed", "context", "_tags"
+    )
+    
+    def __init__(
+        self,
+        content: Any,
+        created_at: Optional[datetime] = None,
+        expires_at: Optional[datetime] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        access_count: int = 0,
+        last_accessed: Optional[datetime] = None,
+        context: Optional[ContextState] = None,  # Added for context awareness
+        tags: Optional[Set[str]] = None
+    ):
+        self.content = content
+        self.created_at = created_at or datetime.now()
+        self.expires_at = expires_at
+        self._metadata = metadata if metadata else _NO_METADATA
+        self.access_count = access_count
+        self.last_accessed = last_accessed
+        self.context = context
+        self._tags = tags if tags else _NO_TAGS
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is _NO_METADATA:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]) -> None:
+        self._metadata = value
+    
+    @property
+    def tags(self) -> Set[str]:
+        if self._tags is _NO_TAGS:
+            self._tags = set()
+        return self._tags
+    
+    @tags.setter
+    def tags(self, value: Set[str]) -> None:
+        self._tags = value
+    
+    def _fields(self) -> Tuple[Any, ...]:
+        return (
+            self.content, self.created_at, self.expires_at, dict(self._metadata),
+            self.access_count, self.last_accessed, self.context, set(self._tags)
+        )
+    
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"MemorySegment(content={self.content!r}, created_at={self.created_at!r}, "
+            f"expires_at={self.expires_at!r}, metadata={dict(self._metadata)!r}, "
+            f"access_count={self.access_count!r}, last_accessed={self.last_accessed!r}, "
+            f"context={self.context!r}, tags={set(self._tags)!r})"
+        )
 
 @dataclass
 class InteractionPattern:
@@ -32,38 +122,446 @@ class InteractionPattern:
     last_used: datetime
 
 @dataclass
+class MemoryLimit:
+    """Capacity limit for a memory store (per model space for shared memory)"""
+    max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None  # Approximate size of stored content
+    policy: Union[str, Callable[[MemorySegment], Any]] = "lru"  # Lowest rank is evicted first
+
+def _lru_rank(segment: MemorySegment) -> datetime:
+    return segment.last_accessed or segment.created_at
+
+def _lfu_rank(segment: MemorySegment) -> Tuple[int, datetime]:
+    return (segment.access_count, segment.last_accessed or segment.created_at)
+
+EVICTION_POLICIES: Dict[str, Callable[[MemorySegment], Any]] = {
+    "lru": _lru_rank,
+    "lfu": _lfu_rank
+}
+
+def _approximate_size(value: Any) -> int:
+    """Approximate the memory footprint of content in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_approximate_size(k) + _approximate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_approximate_size(item) for item in value)
+    return size
+
 class LearningOutcome:
     """Records what was learned from an interaction"""
-    pattern: str
-    success: bool
-    feedback: Optional[str]
-    context: ContextState
-    timestamp: datetime
+    
+    __slots__ = ("pattern", "success", "feedback", "context", "timestamp")
+    
+    def __init__(
+        self,
+        pattern: str,
+        success: bool,
+        feedback: Optional[str],
+        context: ContextState,
+        timestamp: datetime
+    ):
+        self.pattern = pattern
+        self.success = success
+        self.feedback = feedback
+        self.context = context
+        self.timestamp = timestamp
+    
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"LearningOutcome({fields})"
+
+class OutcomeLog:
+    """
+    Columnar ring buffer of learning outcomes.
+
+    Timestamps, success flags and interned pattern ids are kept in compact
+    arrays; contexts and (mostly empty) feedback are reference columns.
+    Outcomes are materialized as LearningOutcome objects only when
+    iterated. Once maxlen outcomes are stored, each append overwrites the
+    oldest.
+
+    Running totals and a ring of per-minute buckets (bucket_count minutes
+    long) are updated on append, so summaries cover every outcome ever
+    recorded and cost does not grow with history.
+    """
+    
+    def __init__(self, maxlen: Optional[int] = None, bucket_count: int = 1440):
+        self.maxlen = maxlen
+        self.bucket_count = bucket_count
+        self.clear()
+    
+    def clear(self) -> None:
+        # Lifetime totals
+        self.total = 0
+        self.successes = 0
+        self.feedback_count = 0
+        # Per-minute buckets, slot = minute % bucket_count (allocated on first append)
+        self._bucket_minute = self._bucket_total = array("q")
+        self._bucket_successes = self._bucket_feedback = array("q")
+        self._last_minute: Optional[int] = None
+        
+        self._pattern_ids: Dict[str, int] = {}
+        self._pattern_names: List[str] = []
+        self._timestamps = array("d")
+        self._success = bytearray()
+        self._patterns = array("I")
+        self._feedback: List[Optional[str]] = []
+        self._contexts: List[ContextState] = []
+        self._start = 0  # Physical index of the oldest outcome once the ring is full
+    
+    def __len__(self) -> int:
+        return len(self._timestamps)
+    
+    def append(self, outcome: LearningOutcome) -> None:
+        pattern_id = self._pattern_ids.get(outcome.pattern)
+        if pattern_id is None:
+            pattern_id = self._pattern_ids[outcome.pattern] = len(self._pattern_names)
+            self._pattern_names.append(outcome.pattern)
+        row = (
+            outcome.timestamp.timestamp(), int(outcome.success), pattern_id,
+            outcome.feedback, outcome.context
+        )
+        self._count(row[0], row[1], outcome.feedback is not None)
+        
+        if self.maxlen is None or len(self) < self.maxlen:
+            self._timestamps.append(row[0])
+            self._success.append(row[1])
+            self._patterns.append(row[2])
+            self._feedback.append(row[3])
+            self._contexts.append(row[4])
+        elif self.maxlen > 0:
+            i = self._start
+            (self._timestamps[i], self._success[i], self._patterns[i],
+             self._feedback[i], self._contexts[i]) = row
+            self._start = (i + 1) % self.maxlen
+    
+    def _count(self, timestamp: float, success: int, has_feedback: bool) -> None:
+        """Add an outcome to the running totals and its minute bucket"""
+        self.total += 1
+        self.successes += success
+        self.feedback_count += has_feedback
+        
+        minute = int(timestamp // 60)
+        if self._last_minute is None:
+            self._bucket_minute = array("q", [-1]) * self.bucket_count
+            self._bucket_total = array("q", [0]) * self.bucket_count
+            self._bucket_successes = array("q", [0]) * self.bucket_count
+            self._bucket_feedback = array("q", [0]) * self.bucket_count
+        if self._last_minute is None or minute > self._last_minute:
+            self._last_minute = minute
+        if self._last_minute - minute >= self.bucket_count:
+            return  # Older than the bucket horizon
+        slot = minute % self.bucket_count
+        if self._bucket_minute[slot] != minute:
+            self._bucket_minute[slot] = minute
+            self._bucket_total[slot] = 0
+            self._bucket_successes[slot] = 0
+            self._bucket_feedback[slot] = 0
+        self._bucket_total[slot] += 1
+        self._bucket_successes[slot] += success
+        self._bucket_feedback[slot] += has_feedback
+    
+    def _physical(self, index: int) -> int:
+        """Map a position (oldest first) to its slot in the columns"""
+        return (self._start + index) % len(self) if self._start else index
+    
+    def _outcome(self, i: int) -> LearningOutcome:
+        return LearningOutcome(
+            pattern=self._pattern_names[self._patterns[i]],
+            success=bool(self._success[i]),
+            feedback=self._feedback[i],
+            context=self._contexts[i],
+            timestamp=datetime.fromtimestamp(self._timestamps[i])
+        )
+    
+    def __iter__(self) -> Iterator[LearningOutcome]:
+        for index in range(len(self)):
+            yield self._outcome(self._physical(index))
+    
+    def __getitem__(self, index: int) -> LearningOutcome:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("outcome index out of range")
+        return self._outcome(self._physical(index))
+    
+    def summarize(self, since: Optional[datetime] = None) -> Tuple[int, int, int]:
+        """Count outcomes, successes and feedback after since (all if None)
+        
+        Whole minutes are read from the buckets; only the outcomes stored in
+        the cutoff's own minute are scanned. Windows reaching past the bucket
+        horizon fall back to scanning the stored outcomes.
+        """
+        if since is None:
+            return self.total, self.successes, self.feedback_count
+        if self._last_minute is None:
+            return 0, 0, 0
+        
+        cutoff = since.timestamp()
+        cutoff_minute = int(cutoff // 60)
+        if self._last_minute - cutoff_minute >= self.bucket_count:
+            return self._scan(cutoff)
+        
+        total, successes, feedback = self._scan(cutoff, until=(cutoff_minute + 1) * 60)
+        for minute in range(cutoff_minute + 1, self._last_minute + 1):
+            slot = minute % self.bucket_count
+            if self._bucket_minute[slot] == minute:
+                total += self._bucket_total[slot]
+                successes += self._bucket_successes[slot]
+                feedback += self._bucket_feedback[slot]
+        return total, successes, feedback
+    
+    def _scan(self, cutoff: float, until: Optional[float] = None) -> Tuple[int, int, int]:
+        """Count stored outcomes with cutoff < timestamp < until"""
+        # Outcomes are appended in time order; binary search the oldest match
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamps[self._physical(middle)] > cutoff:
+                high = middle
+            else:
+                low = middle + 1
+        
+        total = successes = feedback = 0
+        for index in range(low, len(self)):
+            i = self._physical(index)
+            if until is not None and self._timestamps[i] >= until:
+                break
+            total += 1
+            successes += self._success[i]
+            feedback += self._feedback[i] is not None
+        return total, successes, feedback
+
+class SharedSpace(MappingABC):
+    """Read-only view of the shared segments visible to one model"""
+    
+    __slots__ = ("_segments", "_refs")
+    
+    def __init__(self, segments: Dict[ShareId, MemorySegment], refs: Dict[str, ShareId]):
+        self._segments = segments
+        self._refs = refs  # View key -> canonical segment
+    
+    def __getitem__(self, key: str) -> MemorySegment:
+        return self._segments[self._refs[key]]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._refs))  # Snapshot, safe while other threads share
+    
+    def __len__(self) -> int:
+        return len(self._refs)
+    
+    def __repr__(self) -> str:
+        return f"SharedSpace({dict(self.items())!r})"
+    
+    def contents(self) -> "SharedContents":
+        """Read-only view of key -> segment content"""
+        return SharedContents(self)
+
+class SharedContents(MappingABC):
+    """Read-only view of the content of a model's shared segments"""
+    
+    __slots__ = ("_space",)
+    
+    def __init__(self, space: SharedSpace):
+        self._space = space
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._space[key].content
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._space)
+    
+    def __len__(self) -> int:
+        return len(self._space)
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        """Snapshot of (key, content) pairs, skipping segments removed meanwhile"""
+        segments = self._space._segments
+        pairs = []
+        for key, share_id in list(self._space._refs.items()):
+            segment = segments.get(share_id)
+            if segment is not None:
+                pairs.append((key, segment.content))
+        return pairs
+
+class SharedMemory(dict):
+    """
+    Shared memory: model name -> SharedSpace view.
+
+    Each shared segment is stored once in a canonical store and referenced
+    from the spaces of the models it was shared with, so expiry and size
+    accounting happen once per segment and removing a segment drops it
+    from every view.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.segments: Dict[ShareId, MemorySegment] = {}
+        self.subscribers: Dict[ShareId, List[Tuple[str, str]]] = {}  # (model, view key)
+        self._refs: Dict[str, Dict[str, ShareId]] = {}
+    
+    def space(self, model: str, refs_factory: Callable[[], Dict[str, ShareId]] = dict) -> SharedSpace:
+        """Get a model's space, creating it if needed"""
+        space = self.get(model)
+        if space is None:
+            refs = self._refs[model] = refs_factory()
+            space = self[model] = SharedSpace(self.segments, refs)
+        return space
+    
+    def refs(self, model: str) -> Dict[str, ShareId]:
+        """Get the mutable view key -> segment mapping behind a model's space"""
+        return self._refs[model]
+    
+    def clear(self) -> None:
+        super().clear()
+        self.segments.clear()
+        self.subscribers.clear()
+        self._refs.clear()
+
+def _synchronized(method: Callable) -> Callable:
+    """Run a MemoryManager method under the manager's structure lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class MemoryManager:
-    """Manages different types of memory for models"""
-    def __init__(self, persistence_dir: Optional[str] = None):
+    """
+    Manages different types of memory for models.
+
+    Safe to use from concurrent coroutines and worker threads. Stores,
+    indexes and learning state are guarded by one re-entrant structure
+    lock, held only for in-memory work. Operations on a single key also
+    hold one of lock_shards key locks, which covers backend and spill I/O,
+    so slow persistence for one key does not block others. Locks are
+    always taken key lock first, then the structure lock.
+    """
+    def __init__(
+        self,
+        persistence_dir: Optional[str] = None,
+        recent_window: int = 50,
+        limits: Optional[Dict[str, Union[MemoryLimit, Dict[str, Any]]]] = None,
+        max_outcomes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        persistence_backend: Optional[MemoryBackend] = None,
+        similarity_index: bool = False,
+        lock_shards: int = 16,
+        write_behind: bool = False,
+        content_index: Optional[bool] = None
+    ):
+        """Initialize memory manager
+        
+        Args:
+            persistence_dir: Directory long-term memory is persisted to
+            recent_window: Number of recent short-term messages indexed
+            limits: Capacity limits keyed by store (short_term, long_term,
+                working or shared)
+            max_outcomes: Number of learning outcomes kept
+            spill_dir: Directory evicted long-term segments are written to,
+                to be reloaded when recalled
+            persistence_backend: Backend long-term memory is persisted to
+                (defaults to a JSON directory backend for persistence_dir)
+            similarity_index: Index pattern triggers and text content for
+                lexical similarity search
+            lock_shards: Number of key locks serializing per-key operations
+            write_behind: Queue persistence writes and apply them on a
+                background thread; call flush() or close() for durability
+            content_index: Whether similarity_index also covers text content
+                (for find_similar); defaults to similarity_index. Indexing
+                content costs a MinHash signature per stored message.
+        """
+        self._lock = threading.RLock()
+        self._key_locks = [threading.Lock() for _ in range(max(1, lock_shards))]
+        
+        # Capacity limits
+        self.limits: Dict[str, MemoryLimit] = {
+            store: limit if isinstance(limit, MemoryLimit) else MemoryLimit(**limit)
+            for store, limit in (limits or {}).items()
+        }
+        for store, limit in self.limits.items():
+            if store not in ("short_term", "long_term", "working", "shared"):
+                raise ValueError(f"Unknown memory type: {store}")
+            if not callable(limit.policy) and limit.policy not in EVICTION_POLICIES:
+                raise ValueError(f"Unknown eviction policy: {limit.policy}")
+        self._sizes: Dict[Tuple[str, str], int] = {}  # Tracked for stores with a byte budget
+        self._store_bytes: Counter = Counter()
+        self.evictions: Counter = Counter()
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._spill = JsonDirectoryBackend(spill_dir) if spill_dir else None
+        self._pending_spills: Dict[str, MemorySegment] = {}  # Evicted, not yet written
+        
         # Existing memory stores
-        self.short_term: Dict[str, MemorySegment] = {}
-        self.long_term: Dict[str, MemorySegment] = {}
-        self.working: Dict[str, MemorySegment] = {}
-        self.shared: Dict[str, Dict[str, MemorySegment]] = {}
+        self.short_term: Dict[str, MemorySegment] = self._new_store("short_term")
+        self.long_term: Dict[str, MemorySegment] = self._new_store("long_term")
+        self.working: Dict[str, MemorySegment] = self._new_store("working")
+        self.shared = SharedMemory()
         
         # New learning components
         self.patterns: Dict[str, InteractionPattern] = {}
-        self.outcomes: List[LearningOutcome] = []
+        self._trigger_usage: Counter = Counter()  # Times each trigger was learned
+        self.outcomes = OutcomeLog(maxlen=max_outcomes)
         self.context_triggers: Dict[InteractionType, Set[str]] = defaultdict(set)
         
         # Performance tracking
         self.recall_success: Dict[str, bool] = {}
         self.pattern_matches: Dict[str, int] = defaultdict(int)
         
+        # Bounded index of recent short-term messages (content with a "role"), newest last
+        self.recent_window = recent_window
+        self._recent_messages: Deque[Tuple[str, MemorySegment]] = deque(maxlen=recent_window)
+        self._recent_by_role: Dict[str, Deque[Tuple[str, MemorySegment]]] = defaultdict(
+            lambda: deque(maxlen=recent_window)
+        )
+        
+        # Secondary indexes over short-term, long-term and working memory
+        self._tag_index: Dict[str, Set[MemoryRef]] = defaultdict(set)
+        self._type_index: Dict[InteractionType, Set[MemoryRef]] = defaultdict(set)
+        self._time_index: List[Tuple[datetime, int, MemoryRef]] = []  # Sorted by created_at
+        self._time_entries: Dict[MemoryRef, Tuple[datetime, int, MemoryRef]] = {}
+        self._sequence = itertools.count()
+        
+        # Optional lexical similarity indexes over pattern triggers and text content
+        self._pattern_index = MinHashIndex() if similarity_index else None
+        if content_index is None:
+            content_index = similarity_index
+        self._content_index = MinHashIndex() if content_index else None
+        
+        # Expiring segments as (expires_at, seq, store, key, segment), soonest first;
+        # shared segments are keyed by ShareId. Entries for replaced or removed
+        # segments are dropped when they come due.
+        self._expiry_heap: List[Tuple[datetime, int, str, Any, MemorySegment]] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        
         # Persistence
         self.persistence_dir = Path(persistence_dir) if persistence_dir else None
-        if self.persistence_dir:
-            self.persistence_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = persistence_backend or (
+            JsonDirectoryBackend(persistence_dir) if persistence_dir else None
+        )
+        if self.backend:
             self._load_persistent_memory()
+            if write_behind:
+                self.backend = WriteBehindBackend(self.backend)
         
+    def _key_lock(self, memory_type: str, key: str) -> threading.Lock:
+        """Get the lock shard for a key"""
+        return self._key_locks[hash((memory_type, key)) % len(self._key_locks)]
+
+    def _new_store(self, memory_type: str) -> Dict[str, MemorySegment]:
+        """Create a store; LRU-limited stores keep recency order in an OrderedDict"""
+        limit = self.limits.get(memory_type)
+        if limit is not None and limit.policy == "lru":
+            return OrderedDict()
+        return {}
+
     def store(
         self,
         key: str,
@@ -79,21 +577,290 @@ class MemoryManager:
         segment = MemorySegment(
             content=content,
             expires_at=expires_at,
-            metadata=metadata or {},
+            metadata=metadata,
             context=context,  # Store context
-            tags=tags or set()  # Store tags
+            tags=tags  # Store tags
         )
         
+        with self._key_lock(memory_type, key):
+            with self._lock:
+                self._insert(memory_type, key, segment)
+            if memory_type == "long_term" and self.backend:
+                # Save to disk if persistence enabled
+                self._save_segment(key, segment)
+        self._write_spills()
+
+    def _insert(
+        self,
+        memory_type: str,
+        key: str,
+        segment: MemorySegment,
+        size: Optional[int] = None
+    ) -> None:
+        """Add a segment to a memory store and its indexes
+        
+        size is the content's size when it cannot be measured (not yet loaded).
+        """
+        memory_store = self._get_memory_store(memory_type)
+        if key in memory_store:
+            self._remove(memory_type, key)
+        memory_store[key] = segment
         if memory_type == "short_term":
-            self.short_term[key] = segment
+            self._index_recent(key, segment)
         elif memory_type == "long_term":
-            self.long_term[key] = segment
-            if self.persistence_dir:  # Save to disk if persistence enabled
-                self._save_segment(key, segment)
-        elif memory_type == "working":
-            self.working[key] = segment
-        else:
-            raise ValueError(f"Unknown memory type: {memory_type}")
+            self._pending_spills.pop(key, None)
+        self._index((memory_type, key), segment)
+        self._schedule_expiry(memory_type, key, segment)
+        
+        limit = self.limits.get(memory_type)
+        if limit is not None:
+            self._track_size(memory_type, key, segment, limit, size)
+            self._enforce_limit(memory_type, memory_store, limit, key)
+
+    def _schedule_expiry(self, store: str, key: Any, segment: MemorySegment) -> None:
+        """Queue a segment for removal at its expiry time"""
+        if segment.expires_at:
+            heapq.heappush(
+                self._expiry_heap,
+                (segment.expires_at, next(self._sequence), store, key, segment)
+            )
+
+    def _remove(self, memory_type: str, key: str) -> Optional[MemorySegment]:
+        """Remove a segment from a memory store and its indexes"""
+        segment = self._get_memory_store(memory_type).pop(key, None)
+        if segment is not None:
+            self._unindex((memory_type, key), segment)
+            self._untrack_size(memory_type, key)
+        return segment
+
+    def _insert_shared(
+        self,
+        share_id: ShareId,
+        segment: MemorySegment,
+        views: List[Tuple[str, str]]
+    ) -> None:
+        """Add a shared segment, visible to each (model, view key) in views"""
+        if share_id in self.shared.segments:
+            self._remove_shared(share_id)
+        self.shared.segments[share_id] = segment
+        self.shared.subscribers[share_id] = []
+        self._schedule_expiry("shared", share_id, segment)
+        
+        limit = self.limits.get("shared")
+        size = None
+        if limit is not None and limit.max_bytes is not None:
+            size = _approximate_size(segment.content)
+        
+        for model, view_key in views:
+            self.shared.space(model, lambda: self._new_store("shared"))
+            refs = self.shared.refs(model)
+            if view_key in refs:
+                self._unsubscribe(model, view_key)
+            refs[view_key] = share_id
+            self.shared.subscribers[share_id].append((model, view_key))
+            if size is not None:
+                self._sizes[(f"shared:{model}", view_key)] = size
+                self._store_bytes[f"shared:{model}"] += size
+        
+        if limit is not None:
+            for model, view_key in views:
+                self._enforce_limit(f"shared:{model}", self.shared[model], limit, view_key)
+
+    def _remove_shared(self, share_id: ShareId) -> Optional[MemorySegment]:
+        """Remove a shared segment from every space it is visible in"""
+        segment = self.shared.segments.pop(share_id, None)
+        for model, view_key in self.shared.subscribers.pop(share_id, ()):
+            self.shared.refs(model).pop(view_key, None)
+            self._untrack_size(f"shared:{model}", view_key)
+        return segment
+
+    def _unsubscribe(self, model: str, view_key: str) -> None:
+        """Remove a shared segment from one model's space"""
+        share_id = self.shared.refs(model).pop(view_key, None)
+        if share_id is None:
+            return
+        self._untrack_size(f"shared:{model}", view_key)
+        subscribers = self.shared.subscribers.get(share_id)
+        if subscribers is not None:
+            subscribers.remove((model, view_key))
+            if not subscribers:  # No longer visible anywhere
+                del self.shared.subscribers[share_id]
+                del self.shared.segments[share_id]
+
+    def _track_size(
+        self,
+        store: str,
+        key: str,
+        segment: MemorySegment,
+        limit: MemoryLimit,
+        size: Optional[int] = None
+    ) -> None:
+        """Record a segment's size for stores with a byte budget"""
+        if limit.max_bytes is None:
+            return
+        if size is None:
+            size = _approximate_size(segment.content)
+        self._sizes[(store, key)] = size
+        self._store_bytes[store] += size
+
+    def _untrack_size(self, store: str, key: str) -> None:
+        size = self._sizes.pop((store, key), None)
+        if size is not None:
+            self._store_bytes[store] -= size
+
+    def _enforce_limit(
+        self,
+        store: str,
+        memory_store: Mapping[str, MemorySegment],
+        limit: MemoryLimit,
+        protected_key: str
+    ) -> None:
+        """Evict segments until the store is within its limit
+        
+        The segment just stored is never evicted. LRU stores are ordered by
+        recency (stores and recalls move keys to the end), so victims come
+        off the front; other policies rank every segment once per round.
+        """
+        def over_limit() -> bool:
+            if limit.max_entries is not None and len(memory_store) > limit.max_entries:
+                return True
+            return limit.max_bytes is not None and self._store_bytes[store] > limit.max_bytes
+        
+        if not over_limit():
+            return
+        
+        if limit.policy == "lru":
+            # The protected key was stored last
+            while len(memory_store) > 1 and over_limit():
+                self._evict(store, next(iter(memory_store)))
+            return
+        
+        rank = limit.policy if callable(limit.policy) else EVICTION_POLICIES[limit.policy]
+        for key in sorted(memory_store, key=lambda k: rank(memory_store[k])):
+            if not over_limit():
+                break
+            if key == protected_key:
+                continue
+            self._evict(store, key)
+
+    def _evict(self, store: str, key: str) -> None:
+        """Evict a segment, queueing long-term segments for the spill directory if enabled"""
+        if store.startswith("shared:"):
+            self._unsubscribe(store[len("shared:"):], key)
+            self.evictions["shared"] += 1
+            return
+        segment = self._remove(store, key)
+        self.evictions[store] += 1
+        if store == "long_term" and self._spill and segment is not None:
+            # Written by _write_spills once the structure lock is released
+            self._pending_spills[key] = segment
+            self.evictions["spilled"] += 1
+
+    def _write_spills(self) -> None:
+        """Write evicted long-term segments to the spill directory
+        
+        Called without holding any lock. Each segment is written under its
+        key lock, so a concurrent recall either finds it still pending or
+        waits for the file.
+        """
+        if not self._pending_spills:
+            return
+        with self._lock:
+            keys = list(self._pending_spills)
+        for key in keys:
+            with self._key_lock("long_term", key):
+                with self._lock:
+                    segment = self._pending_spills.pop(key, None)
+                if segment is None:  # Recalled, replaced or forgotten meanwhile
+                    continue
+                self._load_content(key, segment)
+                self._spill.save([(key, self._to_record(segment))])
+
+    def _unspill(self, key: str) -> Optional[MemorySegment]:
+        """Reload a spilled long-term segment into memory"""
+        if not self._spill:
+            return None
+        with self._lock:
+            segment = self._pending_spills.pop(key, None)
+            if segment is not None:
+                self._insert("long_term", key, segment)
+                return segment
+        record = self._spill.get(key)
+        if record is None:
+            return None
+        segment = self._from_record(record)
+        self._spill.delete([key])
+        with self._lock:
+            self._insert("long_term", key, segment)
+        return segment
+
+    def _load_content(self, key: str, segment: MemorySegment) -> Any:
+        """Read a persisted segment's content from the backend on first use"""
+        if segment.content is _UNLOADED:
+            content = self.backend.load_content(key)
+            with self._lock:
+                if segment.content is _UNLOADED:
+                    segment.content = content
+                    if self.long_term.get(key) is segment:
+                        self._index_content(("long_term", key), segment)
+                        # Replace the stored size with the loaded content's
+                        limit = self.limits.get("long_term")
+                        if limit is not None and ("long_term", key) in self._sizes:
+                            self._untrack_size("long_term", key)
+                            self._track_size("long_term", key, segment, limit)
+        return segment.content
+
+    def _index(self, ref: MemoryRef, segment: MemorySegment) -> None:
+        """Add a segment to the secondary indexes"""
+        for tag in segment._tags:
+            self._tag_index[tag].add(ref)
+        if segment.context is not None:
+            self._type_index[segment.context.interaction_type].add(ref)
+        entry = (segment.created_at, next(self._sequence), ref)
+        insort(self._time_index, entry)
+        self._time_entries[ref] = entry
+        self._index_content(ref, segment)
+
+    def _index_content(self, ref: MemoryRef, segment: MemorySegment) -> None:
+        """Add text content to the similarity index (content not yet loaded is skipped)"""
+        if self._content_index is None:
+            return
+        content = segment.content
+        if isinstance(content, dict):
+            content = content.get("content")  # Messages
+        if isinstance(content, str):
+            self._content_index.add(ref, content)
+
+    def _unindex(self, ref: MemoryRef, segment: MemorySegment) -> None:
+        """Remove a segment from the secondary indexes"""
+        for tag in segment._tags:
+            refs = self._tag_index.get(tag)
+            if refs is not None:
+                refs.discard(ref)
+                if not refs:
+                    del self._tag_index[tag]
+        if segment.context is not None:
+            refs = self._type_index.get(segment.context.interaction_type)
+            if refs is not None:
+                refs.discard(ref)
+                if not refs:
+                    del self._type_index[segment.context.interaction_type]
+        entry = self._time_entries.pop(ref, None)
+        if entry is not None:
+            index = bisect_left(self._time_index, entry)
+            if index < len(self._time_index) and self._time_index[index] == entry:
+                del self._time_index[index]
+        if self._content_index is not None:
+            self._content_index.remove(ref)
+
+    def _clear_indexes(self) -> None:
+        """Clear the secondary indexes"""
+        self._tag_index.clear()
+        self._type_index.clear()
+        self._time_index.clear()
+        self._time_entries.clear()
+        if self._content_index is not None:
+            self._content_index.clear()
 
     def recall(
         self,
@@ -103,25 +870,169 @@ class MemoryManager:
         """Retrieve content from specified memory type"""
         memory_store = self._get_memory_store(memory_type)
         
-        if key not in memory_store:
-            self.recall_success[key] = False
-            return None
+        try:
+            return self._recall(memory_store, key, memory_type)
+        finally:
+            # Reloading a spilled segment may have evicted others
+            self._write_spills()
+
+    def _recall(
+        self,
+        memory_store: Dict[str, MemorySegment],
+        key: str,
+        memory_type: str
+    ) -> Optional[Any]:
+        with self._key_lock(memory_type, key):
+            segment = memory_store.get(key)
+            if segment is None and memory_type == "long_term":
+                segment = self._unspill(key)
+            if segment is None:
+                self.recall_success[key] = False
+                return None
             
-        segment = memory_store[key]
-        
-        # Check expiration
-        if segment.expires_at and datetime.now() > segment.expires_at:
-            del memory_store[key]
-            self.recall_success[key] = False
-            return None
+            with self._lock:
+                # Check expiration
+                if segment.expires_at and datetime.now() > segment.expires_at:
+                    self._remove(memory_type, key)
+                    self.recall_success[key] = False
+                    return None
+                
+                # Update access metadata
+                segment.access_count += 1
+                segment.last_accessed = datetime.now()
+                self.recall_success[key] = True
+                
+                limit = self.limits.get(memory_type)
+                if limit is not None and limit.policy == "lru" and key in memory_store:
+                    memory_store.move_to_end(key)
             
-        # Update access metadata
-        segment.access_count += 1
-        segment.last_accessed = datetime.now()
-        self.recall_success[key] = True
+            if memory_type == "long_term":
+                return self._load_content(key, segment)
+            return segment.content
+
+    def _index_recent(self, key: str, segment: MemorySegment) -> None:
+        """Add a short-term message to the recent message index"""
+        if not isinstance(segment.content, dict) or "role" not in segment.content:
+            return
+        entry = (key, segment)
+        self._recent_messages.append(entry)
+        self._recent_by_role[segment.content["role"]].append(entry)
+
+    @_synchronized
+    def get_recent_messages(
+        self,
+        limit: int = 5,
+        roles: Optional[Iterable[str]] = None
+    ) -> List[Any]:
+        """Get the most recent short-term messages, oldest first
         
-        return segment.content
+        Walks the recent message index from the newest entry, so the cost
+        depends on the limit rather than the size of short-term memory.
+        Entries that were forgotten, replaced or have expired are skipped.
+        """
+        roles = set(roles) if roles is not None else None
+        if roles is not None and len(roles) == 1:
+            entries = self._recent_by_role.get(next(iter(roles)), ())
+        else:
+            entries = self._recent_messages
+        
+        now = datetime.now()
+        messages = []
+        for key, segment in reversed(entries):
+            if len(messages) >= limit:
+                break
+            if self.short_term.get(key) is not segment:
+                continue
+            if segment.expires_at and now > segment.expires_at:
+                continue
+            if roles is not None and segment.content["role"] not in roles:
+                continue
+            messages.append(segment.content)
+        
+        messages.reverse()
+        return messages
+
+    def query(
+        self,
+        tags: Optional[Iterable[str]] = None,
+        context_type: Optional[InteractionType] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        memory_types: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, MemorySegment]]:
+        """Find memories matching all given filters, newest first
+        
+        Args:
+            tags: Memories must carry every one of these tags
+            context_type: Interaction type of the context the memory was stored with
+            since: Earliest creation time (inclusive)
+            until: Latest creation time (exclusive)
+            memory_types: Memory types to search (short_term, long_term, working)
+            limit: Maximum number of results
+        
+        Tag and context filters are answered from their indexes, smallest
+        first, and time-only queries walk the creation-time index, so the
+        cost depends on the number of candidates rather than store sizes.
+        Expired memories are skipped.
+        
+        Returns:
+            List of (key, segment) pairs
+        """
+        if memory_types is not None:
+            memory_types = set(memory_types)
+            for memory_type in memory_types:
+                self._get_memory_store(memory_type)  # Validate
+        
+        with self._lock:
+            results = self._query(tags, context_type, since, until, memory_types, limit)
+        for key, segment in results:
+            if segment.content is _UNLOADED:
+                self._load_content(key, segment)
+        return results
+
+    def _query(
+        self,
+        tags: Optional[Iterable[str]],
+        context_type: Optional[InteractionType],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        memory_types: Optional[Set[str]],
+        limit: Optional[int]
+    ) -> List[Tuple[str, MemorySegment]]:
+        """Collect query results from the indexes (structure lock held)"""
+        candidate_sets = [self._tag_index.get(tag, set()) for tag in (tags or ())]
+        if context_type is not None:
+            candidate_sets.append(self._type_index.get(context_type, set()))
+        
+        if candidate_sets:
+            candidate_sets.sort(key=len)
+            refs = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+            entries = sorted((self._time_entries[ref] for ref in refs), reverse=True)
+        else:
+            # Walk the time range, newest first
+            low = bisect_left(self._time_index, (since,)) if since else 0
+            high = bisect_left(self._time_index, (until,)) if until else len(self._time_index)
+            entries = (self._time_index[i] for i in range(high - 1, low - 1, -1))
+        
+        now = datetime.now()
+        results = []
+        for created_at, _, (memory_type, key) in entries:
+            if limit is not None and len(results) >= limit:
+                break
+            if since is not None and created_at < since:
+                continue
+            if until is not None and created_at >= until:
+                continue
+            if memory_types is not None and memory_type not in memory_types:
+                continue
+            segment = self._get_memory_store(memory_type)[key]
+            if segment.expires_at and now > segment.expires_at:
+                continue
+            results.append((key, segment))
+        return results
 
+    @_synchronized
     def share(
         self,
         from_model: str,
@@ -134,48 +1045,71 @@ class MemoryManager:
         tags: Optional[Set[str]] = None  # Added tags
     ) -> None:
         """Share memory between models"""
-        if from_model not in self.shared:
-            self.shared[from_model] = {}
-            
         expires_at = datetime.now() + duration if duration else None
         segment = MemorySegment(
             content=content,
             expires_at=expires_at,
-            metadata=metadata or {},
+            metadata=metadata,
             context=context,
-            tags=tags or set()
+            tags=tags
         )
         
-        self.shared[from_model][key] = segment
-        
-        # Create reverse lookup
-        if to_model not in self.shared:
-            self.shared[to_model] = {}
-        self.shared[to_model][f"from_{from_model}_{key}"] = segment
+        # Visible to the sharing model under key, and to the recipient as a reverse
+        # lookup. Sharing the key with another recipient rebinds the sharing
+        # model's view only; earlier recipients keep what they were given.
+        self._insert_shared(
+            (from_model, key, to_model),
+            segment,
+            [(from_model, key), (to_model, f"from_{from_model}_{key}")]
+        )
 
     def forget(self, key: str, memory_type: str = "short_term") -> None:
         """Remove content from specified memory type"""
-        memory_store = self._get_memory_store(memory_type)
-        if key in memory_store:
-            del memory_store[key]
+        with self._key_lock(memory_type, key):
+            with self._lock:
+                self._remove(memory_type, key)
+                if memory_type == "long_term":
+                    self._pending_spills.pop(key, None)
+            if memory_type == "long_term":
+                if self._spill:
+                    self._spill.delete([key])
+                if self.backend:
+                    self.backend.delete([key])
 
+    @_synchronized
     def clear(self, memory_type: Optional[str] = None) -> None:
         """Clear specified or all memory types"""
         if memory_type:
             memory_store = self._get_memory_store(memory_type)
-            memory_store.clear()
+            for key in list(memory_store):
+                self._remove(memory_type, key)
+            if memory_type == "short_term":
+                self._clear_recent()
         else:
             self.short_term.clear()
+            self._clear_recent()
+            self._clear_indexes()
             self.long_term.clear()
             self.working.clear()
             self.shared.clear()
+            self._expiry_heap.clear()
+            self._sizes.clear()
+            self._store_bytes.clear()
             # Clear learning components too
             self.patterns.clear()
+            self._trigger_usage.clear()
+            if self._pattern_index is not None:
+                self._pattern_index.clear()
             self.outcomes.clear()
             self.context_triggers.clear()
             self.recall_success.clear()
             self.pattern_matches.clear()
 
+    def _clear_recent(self) -> None:
+        """Clear the recent message index"""
+        self._recent_messages.clear()
+        self._recent_by_role.clear()
+
     def _get_memory_store(self, memory_type: str) -> Dict[str, MemorySegment]:
         """Get the appropriate memory store"""
         if memory_type == "short_term":
@@ -187,28 +1121,70 @@ class MemoryManager:
         else:
             raise ValueError(f"Unknown memory type: {memory_type}")
 
-    def cleanup_expired(self) -> None:
-        """Remove all expired memory segments"""
+    @_synchronized
+    def cleanup_expired(self) -> int:
+        """Remove all expired memory segments
+        
+        Only segments that are due are popped from the expiry queue, so the
+        cost follows the number of expired segments, not the store sizes.
+        
+        Returns:
+            Number of segments removed
+        """
         now = datetime.now()
+        removed = 0
         
-        for memory_store in [self.short_term, self.long_term, self.working]:
-            expired_keys = [
-                key for key, segment in memory_store.items()
-                if segment.expires_at and now > segment.expires_at
-            ]
-            for key in expired_keys:
-                del memory_store[key]
-                
-        # Clean shared memories
-        for model in list(self.shared.keys()):
-            expired_keys = [
-                key for key, segment in self.shared[model].items()
-                if segment.expires_at and now > segment.expires_at
-            ]
-            for key in expired_keys:
-                del self.shared[model][key]
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            _, _, store, key, segment = heapq.heappop(self._expiry_heap)
+            if store == "shared":
+                if self.shared.segments.get(key) is segment:
+                    self._remove_shared(key)
+                    removed += 1
+            elif self._get_memory_store(store).get(key) is segment:
+                self._remove(store, key)
+                removed += 1
+        return removed
+
+    @_synchronized
+    def next_expiry(self) -> Optional[datetime]:
+        """Get the earliest expiry time still queued, if any"""
+        return self._expiry_heap[0][0] if self._expiry_heap else None
+
+    def start_expiry_sweeper(self, interval: float = 60.0) -> asyncio.Task:
+        """Start a background task removing segments as they expire
+        
+        Args:
+            interval: Longest time (seconds) between sweeps; the sweeper
+                also wakes up when the next segment is due
+        """
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep(interval))
+        return self._sweeper
+
+    async def stop_expiry_sweeper(self) -> None:
+        """Stop the background expiry sweeper"""
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
+
+    async def _sweep(self, interval: float) -> None:
+        """Sweep expired segments until cancelled"""
+        while True:
+            delay = interval
+            next_expiry = self.next_expiry()
+            if next_expiry is not None:
+                due_in = (next_expiry - datetime.now()).total_seconds()
+                delay = min(interval, max(due_in, 0.0) + 0.001)
+            await asyncio.sleep(delay)
+            self.cleanup_expired()
 
     # New methods for learning and pattern recognition
+    @_synchronized
     def learn_pattern(
         self,
         trigger: str,
@@ -239,12 +1215,15 @@ class MemoryManager:
                 contexts={context.interaction_type},
                 last_used=datetime.now()
             )
+            if self._pattern_index is not None:
+                self._pattern_index.add(pattern_key, trigger)
         
         # Record trigger for context
         self.context_triggers[context.interaction_type].add(trigger)
+        self._trigger_usage[trigger] += 1
         
         # Record learning outcome
-        self.outcomes.append(LearningOutcome(
+        self._record_outcome(LearningOutcome(
             pattern=pattern_key,
             success=success,
             feedback=None,
@@ -252,20 +1231,44 @@ class MemoryManager:
             timestamp=datetime.now()
         ))
 
+    @_synchronized
     def find_similar_pattern(
         self,
         trigger: str,
         context: ContextState,
-        min_similarity: float = 0.7
+        min_similarity: float = 0.7,
+        lexical_threshold: float = 0.4
     ) -> Optional[InteractionPattern]:
-        """Find a similar interaction pattern"""
+        """Find a similar interaction pattern
+        
+        Patterns must succeed more often than min_similarity. Without a
+        similarity index only patterns with the same trigger match. With one,
+        patterns whose trigger is lexically similar (estimated Jaccard
+        similarity of at least lexical_threshold) also match, ranked by
+        success rate times similarity.
+        """
         best_match = None
-        best_score = min_similarity
+        best_score = 0.0
+        
+        candidates = []
+        if self._pattern_index is not None:
+            candidates = [
+                (self.patterns[key], similarity)
+                for key, similarity in self._pattern_index.query(
+                    trigger, k=len(self._pattern_index), min_similarity=lexical_threshold
+                )
+            ]
+        if not candidates:
+            candidates = [
+                (pattern, 1.0) for pattern in self.patterns.values()
+                if pattern.trigger == trigger
+            ]
         
-        # Check patterns with same trigger in similar contexts
-        for pattern in self.patterns.values():
-            if pattern.trigger == trigger and context.interaction_type in pattern.contexts:
-                score = pattern.success_rate
+        # Check patterns with same or similar trigger in similar contexts
+        for pattern, similarity in candidates:
+            if (context.interaction_type in pattern.contexts and
+                    pattern.success_rate > min_similarity):
+                score = pattern.success_rate * similarity
                 if score > best_score:
                     best_match = pattern
                     best_score = score
@@ -275,18 +1278,57 @@ class MemoryManager:
         
         return best_match
 
+    @_synchronized
+    def find_similar(
+        self,
+        text: str,
+        k: int = 5,
+        min_similarity: float = 0.2,
+        memory_types: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, MemorySegment, float]]:
+        """Find stored text content lexically similar to text
+        
+        Requires the content index. Only candidates sharing an LSH bucket with
+        the query are scored, so the cost does not grow with store sizes.
+        
+        Returns:
+            List of (key, segment, estimated similarity), most similar first
+        """
+        if self._content_index is None:
+            raise RuntimeError("MemoryManager was created without a content index")
+        memory_types = set(memory_types) if memory_types is not None else None
+        
+        now = datetime.now()
+        results = []
+        matches = self._content_index.query(
+            text, k=len(self._content_index), min_similarity=min_similarity
+        )
+        for (memory_type, key), similarity in matches:
+            if len(results) >= k:
+                break
+            if memory_types is not None and memory_type not in memory_types:
+                continue
+            segment = self._get_memory_store(memory_type)[key]
+            if segment.expires_at and now > segment.expires_at:
+                continue
+            results.append((key, segment, similarity))
+        return results
+
     def get_context_patterns(
         self,
         context_type: InteractionType,
         min_success_rate: float = 0.5
     ) -> List[InteractionPattern]:
         """Get patterns that work well in a context"""
+        with self._lock:
+            patterns = list(self.patterns.values())  # Snapshot
         return [
-            pattern for pattern in self.patterns.values()
+            pattern for pattern in patterns
             if (context_type in pattern.contexts and
                 pattern.success_rate >= min_success_rate)
         ]
 
+    @_synchronized
     def record_feedback(
         self,
         pattern: str,
@@ -294,7 +1336,7 @@ class MemoryManager:
         context: ContextState
     ) -> None:
         """Record feedback about a pattern"""
-        self.outcomes.append(LearningOutcome(
+        self._record_outcome(LearningOutcome(
             pattern=pattern,
             success=True,  # Feedback implies engagement
             feedback=feedback,
@@ -302,99 +1344,144 @@ class MemoryManager:
             timestamp=datetime.now()
         ))
 
+    def _record_outcome(self, outcome: LearningOutcome) -> None:
+        """Append a learning outcome, dropping the oldest beyond max_outcomes"""
+        if self.outcomes.maxlen is not None and len(self.outcomes) == self.outcomes.maxlen:
+            self.evictions["outcomes"] += 1
+        self.outcomes.append(outcome)
+
+    @_synchronized
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """Get entry counts, tracked sizes and eviction counts per store"""
+        stats = {
+            store: {
+                "entries": len(self._get_memory_store(store)),
+                "bytes": self._store_bytes[store],
+                "evictions": self.evictions[store]
+            }
+            for store in ("short_term", "long_term", "working")
+        }
+        stats["shared"] = {
+            "entries": len(self.shared.segments),
+            "bytes": sum(
+                size for store, size in self._store_bytes.items() if store.startswith("shared:")
+            ),
+            "evictions": self.evictions["shared"]
+        }
+        stats["outcomes"] = {"entries": len(self.outcomes), "evictions": self.evictions["outcomes"]}
+        stats["spilled"] = self.evictions["spilled"]
+        return stats
+
+    @_synchronized
     def get_learning_summary(
         self,
         time_window: Optional[timedelta] = None
     ) -> Dict[str, Any]:
         """Get summary of learning outcomes"""
-        if time_window:
-            cutoff = datetime.now() - time_window
-            relevant_outcomes = [
-                o for o in self.outcomes
-                if o.timestamp > cutoff
-            ]
-        else:
-            relevant_outcomes = self.outcomes
-            
+        cutoff = datetime.now() - time_window if time_window else None
+        total, successes, feedback_count = self.outcomes.summarize(cutoff)
+        
         return {
             "total_patterns": len(self.patterns),
-            "pattern_usage": {
-                pattern.trigger: pattern.usage_count
-                for pattern in self.patterns.values()
-            },
+            "pattern_usage": dict(self._trigger_usage),
             "context_distribution": {
                 context_type.name: len(triggers)
                 for context_type, triggers in self.context_triggers.items()
             },
-            "success_rate": (
-                sum(1 for o in relevant_outcomes if o.success)
-                / len(relevant_outcomes)
-                if relevant_outcomes else 0.0
-            ),
-            "feedback_count": sum(
-                1 for o in relevant_outcomes
-                if o.feedback is not None
-            )
+            "success_rate": successes / total if total else 0.0,
+            "feedback_count": feedback_count
         }
 
     def _save_segment(self, key: str, segment: MemorySegment) -> None:
-        """Save a memory segment to disk"""
-        if not self.persistence_dir:
+        """Save a memory segment to the persistence backend"""
+        if not self.backend:
             return
-            
-        file_path = self.persistence_dir / f"{key}.json"
+        self.backend.save([(key, self._to_record(segment))])
+
+    def _to_record(self, segment: MemorySegment) -> Dict[str, Any]:
+        """Convert a memory segment to a JSON-serializable record"""
+        context = None
+        if segment.context:
+            context = dict(segment.context.__dict__)
+            context["interaction_type"] = segment.context.interaction_type.name
+            context["complexity"] = segment.context.complexity.name
+            context["tools_required"] = sorted(segment.context.tools_required)
         
         # Convert datetime objects to ISO format
-        segment_data = {
+        return {
             "content": segment.content,
             "created_at": segment.created_at.isoformat(),
             "expires_at": segment.expires_at.isoformat() if segment.expires_at else None,
-            "metadata": segment.metadata,
+            "metadata": dict(segment._metadata),
             "access_count": segment.access_count,
             "last_accessed": (
                 segment.last_accessed.isoformat()
                 if segment.last_accessed else None
             ),
-            "context": segment.context.__dict__ if segment.context else None,
-            "tags": list(segment.tags)
+            "context": context,
+            "tags": list(segment._tags)
         }
+
+    def _from_record(self, data: Dict[str, Any]) -> MemorySegment:
+        """Convert a record back to a memory segment"""
+        context = None
+        if data["context"]:
+            context = ContextState(**{
+                **data["context"],
+                "interaction_type": InteractionType[data["context"]["interaction_type"]],
+                "complexity": ComplexityLevel[data["context"]["complexity"]],
+                "tools_required": set(data["context"]["tools_required"])
+            })
         
-        with open(file_path, 'w') as f:
-            json.dump(segment_data, f, indent=2)
+        # Convert ISO format strings back to datetime
+        return MemorySegment(
+            content=data.get("content", _UNLOADED),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            expires_at=(
+                datetime.fromisoformat(data["expires_at"])
+                if data["expires_at"] else None
+            ),
+            metadata=data["metadata"],
+            access_count=data["access_count"],
+            last_accessed=(
+                datetime.fromisoformat(data["last_accessed"])
+                if data["last_accessed"] else None
+            ),
+            context=context,
+            tags=set(data["tags"]) if data["tags"] else None
+        )
 
     def _load_persistent_memory(self) -> None:
-        """Load persistent memory from disk"""
-        if not self.persistence_dir:
+        """Load persistent memory from the backend"""
+        if not self.backend:
             return
             
-        for file_path in self.persistence_dir.glob("*.json"):
+        for key, record in self.backend.load():
             try:
-                with open(file_path) as f:
-                    data = json.load(f)
-                
-                # Convert ISO format strings back to datetime
-                segment = MemorySegment(
-                    content=data["content"],
-                    created_at=datetime.fromisoformat(data["created_at"]),
-                    expires_at=(
-                        datetime.fromisoformat(data["expires_at"])
-                        if data["expires_at"] else None
-                    ),
-                    metadata=data["metadata"],
-                    access_count=data["access_count"],
-                    last_accessed=(
-                        datetime.fromisoformat(data["last_accessed"])
-                        if data["last_accessed"] else None
-                    ),
-                    context=ContextState(**data["context"]) if data["context"] else None,
-                    tags=set(data["tags"])
+                self._insert(
+                    "long_term", key, self._from_record(record), record.get("content_size")
                 )
-                
-                key = file_path.stem
-                self.long_term[key] = segment
-                
             except Exception as e:
-                print(f"Error loading {file_path}: {e}")
+                print(f"Error loading {key}: {e}")
+        self._write_spills()
+
+    def flush(self) -> None:
+        """Wait for queued persistence writes to be applied"""
+        if isinstance(self.backend, WriteBehindBackend):
+            self.backend.flush()
+
+    def close(self) -> None:
+        """Cancel the expiry sweeper and close the backend, applying queued writes"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        if self.backend:
+            self.backend.close()
+
+    async def aclose(self) -> None:
+        """Stop the expiry sweeper and close without blocking the event loop"""
+        await self.stop_expiry_sweeper()
+        await asyncio.to_thread(self.close)
 
     def __str__(self) -> str:
         return (
@@ -0,0 +1,369 @@
+# src/glue/core/memory_backend.py
+
+"""GLUE Memory Persistence Backends"""
+
+import json
+import sqlite3
+import threading
+import asyncio
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Iterable
+from .logger import get_logger
+
+# A persisted segment: key plus JSON-serializable fields (content, created_at,
+# expires_at, metadata, access_count, last_accessed, context, tags)
+Record = Tuple[str, Dict[str, Any]]
+
+class MemoryBackend(ABC):
+    """
+    Storage for persistent (long-term) memory segments.
+
+    Backends deal in plain records so they stay independent of the
+    in-memory segment types. load() may omit "content" from records, in
+    which case it is fetched with load_content() when first needed, and
+    may give its stored size in bytes as "content_size".
+    """
+
+    @abstractmethod
+    def load(self) -> Iterator[Record]:
+        """Yield all stored records, oldest first"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a complete record, or None if not stored"""
+
+    def load_content(self, key: str) -> Any:
+        """Get the content of a stored record"""
+        record = self.get(key)
+        if record is None:
+            raise KeyError(key)
+        return record["content"]
+
+    @abstractmethod
+    def save(self, records: Iterable[Record]) -> None:
+        """Store a batch of records, replacing existing keys"""
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]) -> None:
+        """Remove records if present"""
+
+    def close(self) -> None:
+        """Release backend resources"""
+
+class JsonDirectoryBackend(MemoryBackend):
+    """One pretty-printed JSON file per key (the original layout)"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self) -> Iterator[Record]:
+        records = []
+        for file_path in self.directory.glob("*.json"):
+            try:
+                with open(file_path) as f:
+                    records.append((file_path.stem, json.load(f)))
+            except Exception as e:
+                print(f"Error loading {file_path}: {e}")
+        records.sort(key=lambda record: record[1].get("created_at") or "")
+        return iter(records)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        file_path = self._path(key)
+        if not file_path.exists():
+            return None
+        with open(file_path) as f:
+            return json.load(f)
+
+    def save(self, records: Iterable[Record]) -> None:
+        for key, record in records:
+            with open(self._path(key), 'w') as f:
+                json.dump(record, f, indent=2)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            file_path = self._path(key)
+            if file_path.exists():
+                file_path.unlink()
+
+class SQLiteBackend(MemoryBackend):
+    """
+    Single-file SQLite store in WAL mode.
+
+    Records are written in one transaction per batch and keyed by the
+    memory key itself, so keys may contain any characters. load() skips
+    the content column (reporting only its size); content is read per key
+    on first use. Decoded
+    tags and contexts may be shared between records and must not be mutated.
+    """
+
+    _COLUMNS = (
+        "created_at", "expires_at", "metadata", "access_count",
+        "last_accessed", "context", "tags"
+    )
+    _JSON_COLUMNS = ("metadata", "context", "tags")
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            "key TEXT PRIMARY KEY, content TEXT, created_at TEXT, expires_at TEXT, "
+            "metadata TEXT, access_count INTEGER, last_accessed TEXT, context TEXT, tags TEXT)"
+        )
+        self._conn.commit()
+
+    def load(self) -> Iterator[Record]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, {', '.join(self._COLUMNS)}, length(content) "
+                "FROM segments ORDER BY created_at"
+            ).fetchall()
+        # Tags and contexts repeat across segments; decode each distinct value once
+        decoded: Dict[str, Any] = {}
+        for row in rows:
+            record = dict(zip(self._COLUMNS, row[1:-1]))
+            record["content_size"] = row[-1] or 0
+            record["metadata"] = _loads(record["metadata"])
+            for column in ("context", "tags"):
+                value = record[column]
+                if value not in decoded:
+                    decoded[value] = _loads(value)
+                record[column] = decoded[value]
+            yield row[0], record
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT content, {', '.join(self._COLUMNS)} FROM segments WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(("content",) + self._COLUMNS, row))
+        for column in ("content",) + self._JSON_COLUMNS:
+            record[column] = _loads(record[column])
+        return record
+
+    def load_content(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM segments WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return _loads(row[0])
+
+    def save(self, records: Iterable[Record]) -> None:
+        rows = [
+            (
+                key,
+                json.dumps(record.get("content"), default=str),
+                record.get("created_at"),
+                record.get("expires_at"),
+                json.dumps(record.get("metadata") or {}, default=str),
+                record.get("access_count", 0),
+                record.get("last_accessed"),
+                json.dumps(record.get("context"), default=str),
+                json.dumps(record.get("tags") or [])
+            )
+            for key, record in records
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM segments WHERE key = ?", [(key,) for key in keys]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class WriteBehindBackend(MemoryBackend):
+    """
+    Queues writes to another backend and applies them on a writer thread.
+
+    save() and delete() only record the latest pending operation per key,
+    so repeated writes to a key between batches coalesce into one. Reads
+    see pending operations first. Pending writes are lost if the process
+    exits without flush() or close().
+    """
+
+    def __init__(self, backend: MemoryBackend, delay: float = 0.05):
+        """Initialize write-behind queue
+
+        Args:
+            backend: Backend writes are applied to
+            delay: Seconds the writer waits after a write to gather a batch
+        """
+        self.backend = backend
+        self.delay = delay
+        self.write_errors = 0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # Serializes batches in order
+        self._stop = threading.Event()
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}  # None marks a delete
+        self._inflight: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of keys with writes not yet applied"""
+        with self._cond:
+            return len(self._pending)
+
+    def _enqueue(self, key: str, record: Optional[Dict[str, Any]]) -> None:
+        with self._cond:
+            if self._stop.is_set():
+                raise RuntimeError("Backend is closed")
+            self._pending[key] = record
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run, name="glue-memory-writer", daemon=True
+                )
+                self._writer.start()
+            self._cond.notify()
+
+    def _lookup(self, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Find the queued record for key as (queued, record)"""
+        with self._cond:
+            for queue in (self._pending, self._inflight):
+                if key in queue:
+                    return True, queue[key]
+        return False, None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stop.is_set():
+                    self._cond.wait()
+            if self._stop.is_set():
+                return  # close() writes what is left
+            self._stop.wait(self.delay)
+            try:
+                self._drain()
+            except Exception as e:
+                get_logger().error(f"Error writing memory: {e}")
+                self._stop.wait(1.0)  # Failed records were requeued; retry later
+
+    def _drain(self) -> None:
+        """Apply the pending operations as one batch"""
+        with self._write_lock:
+            with self._cond:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            try:
+                saves = [(key, record) for key, record in batch.items() if record is not None]
+                deletes = [key for key, record in batch.items() if record is None]
+                if saves:
+                    self.backend.save(saves)
+                if deletes:
+                    self.backend.delete(deletes)
+            except Exception:
+                with self._cond:
+                    self.write_errors += 1
+                    for key, record in batch.items():
+                        # Keep operations queued since the batch was taken
+                        self._pending.setdefault(key, record)
+                raise
+            finally:
+                with self._cond:
+                    self._inflight = {}
+
+    def flush(self) -> None:
+        """Apply all pending writes, raising if a batch fails
+        
+        Also waits for a batch the writer thread is applying, since
+        _drain() holds the write lock while writing.
+        """
+        while True:
+            self._drain()
+            if not self.pending:
+                return
+
+    async def aflush(self) -> None:
+        """Apply all pending writes without blocking the event loop"""
+        await asyncio.to_thread(self.flush)
+
+    def load(self) -> Iterator[Record]:
+        self.flush()
+        return self.backend.load()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        queued, record = self._lookup(key)
+        return record if queued else self.backend.get(key)
+
+    def load_content(self, key: str) -> Any:
+        queued, record = self._lookup(key)
+        if not queued:
+            return self.backend.load_content(key)
+        if record is None:
+            raise KeyError(key)
+        return record["content"]
+
+    def save(self, records: Iterable[Record]) -> None:
+        for key, record in records:
+            self._enqueue(key, record)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._enqueue(key, None)
+
+    def close(self) -> None:
+        """Stop the writer, apply pending writes and close the backend"""
+        with self._cond:
+            self._stop.set()
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+        try:
+            self.flush()
+        finally:
+            self.backend.close()
+
+def _loads(value: Optional[str]) -> Any:
+    """Decode a JSON column, skipping the parser for common empty values"""
+    if value is None or value == "null":
+        return None
+    if value == "{}":
+        return {}
+    if value == "[]":
+        return []
+    return json.loads(value)
+
+def migrate_directory(source_dir: str, target: MemoryBackend, batch_size: int = 500) -> int:
+    """Copy segments from a JSON directory into another backend
+
+    Args:
+        source_dir: Directory written by the original per-file persistence
+        target: Backend to copy into
+        batch_size: Records written per batch
+
+    Returns:
+        Number of records migrated
+    """
+    count = 0
+    batch: List[Record] = []
+    for record in JsonDirectoryBackend(source_dir).load():
+        batch.append(record)
+        if len(batch) >= batch_size:
+            target.save(batch)
+            count += len(batch)
+            batch = []
+    target.save(batch)
+    return count + len(batch)
@@ -1,5 +1,6 @@
 # src/glue/core/model.py
-from typing import Dict, Any, Optional, List
+import copy
+from typing import Dict, Any, Optional, List, AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from .types import Message, MessageType, WorkflowState
@@ -14,6 +15,7 @@ class ModelConfig:
     frequency_penalty: float = 0.0
     stop_sequences: list[str] = field(default_factory=list)
     system_prompt: Optional[str] = None
+    context_window: Optional[int] = None  # Token limit for prompt plus completion
 
 class Model:
     """Base class for individual models within a CBM"""
@@ -55,6 +57,12 @@ class Model:
         """Add a tool that this model can use"""
         self._tools[name] = tool
 
+    def fork(self) -> 'Model':
+        """Create a copy sharing configuration and tools but not conversation state"""
+        forked = copy.copy(self)
+        forked._active_workflows = {}
+        return forked
+
     def bind_to(self, model: 'Model', binding_type: str = 'glue') -> None:
         """Create a binding to another model"""
         self._bound_models[model.name] = model
@@ -63,6 +71,13 @@ class Model:
         """Generate a response (to be implemented by provider-specific classes)"""
         raise NotImplementedError
 
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Generate a response as a stream of text chunks
+
+        Models without native streaming yield the full response as one chunk.
+        """
+        yield await self.generate(prompt)
+
     # Communication methods
     async def send_message(
         self,
@@ -0,0 +1,93 @@
+# src/glue/core/prompt.py
+
+"""GLUE Token-Budgeted Prompt Assembly"""
+
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+# Tokens added per chat message for role and separators
+MESSAGE_OVERHEAD = 4
+
+@lru_cache(maxsize=8192)
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer.
+
+    Uses the larger of ~4 characters per token and the word count, which
+    tracks BPE tokenizers closely enough for budgeting. Results are
+    memoized, so re-counting an unchanged message is a cache hit.
+    """
+    if not text:
+        return 0
+    return max((len(text) + 3) // 4, len(text.split()))
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    """Estimate the token count of a chat message"""
+    return estimate_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD
+
+def fit_messages(messages: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+    """
+    Keep system messages plus the most recent messages that fit the budget.
+
+    The latest message is always kept, even if it alone exceeds the budget.
+    """
+    system = [m for m in messages if m.get("role") == "system"]
+    remaining = budget - sum(estimate_message_tokens(m) for m in system)
+
+    kept = []
+    for message in reversed(messages):
+        if message.get("role") == "system":
+            continue
+        tokens = estimate_message_tokens(message)
+        if kept and tokens > remaining:
+            break
+        kept.append(message)
+        remaining -= tokens
+
+    kept_ids = {id(m) for m in kept}
+    return [m for m in messages if m.get("role") == "system" or id(m) in kept_ids]
+
+class PromptAssembler:
+    """
+    Assembles a model input from the current input, recent turns and
+    memory, filling a token budget by priority.
+
+    The current input is always included. Recent turns are added newest
+    first, then memory entries, until the budget is spent. Without a
+    budget everything is included.
+    """
+
+    def build(
+        self,
+        current_input: Any,
+        recent_history: List[Dict[str, Any]],
+        memory: Optional[Dict[str, Any]] = None,
+        budget: Optional[int] = None
+    ) -> str:
+        """Build the model input"""
+        history_lines = [f"{msg['role']}: {msg['content']}" for msg in recent_history]
+        memory_lines = [f"{key}: {value}" for key, value in (memory or {}).items()]
+
+        if budget is not None:
+            remaining = budget - estimate_tokens(str(current_input)) - MESSAGE_OVERHEAD
+            history_lines, remaining = self._take_newest(history_lines, remaining)
+            memory_lines, remaining = self._take_newest(memory_lines, remaining)
+
+        sections = ["Context:\n" + "\n".join(history_lines)]
+        if memory_lines:
+            sections.append("Memory:\n" + "\n".join(memory_lines))
+        sections.append(f"Current Input:\n{current_input}")
+        return "\n\n".join(sections)
+
+    @staticmethod
+    def _take_newest(lines: List[str], budget: int) -> Tuple[List[str], int]:
+        """Keep the newest lines that fit the budget, preserving their order"""
+        kept = []
+        for line in reversed(lines):
+            tokens = estimate_tokens(line)
+            if tokens > budget:
+                break
+            kept.append(line)
+            budget -= tokens
+        kept.reverse()
+        return kept, budget
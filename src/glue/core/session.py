@@ -0,0 +1,157 @@
+# src/glue/core/session.py
+
+"""GLUE Multi-Session Conversation Management"""
+
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+from .model import Model
+from .conversation import ConversationManager
+from .context import ContextAnalyzer
+from .logger import get_logger
+from ..tools.chain import ToolChainOptimizer
+
+@dataclass
+class ConversationSession:
+    """State belonging to a single conversation session"""
+    session_id: str
+    conversation: ConversationManager
+    models: Dict[str, Model] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.monotonic)
+    last_active: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def get_models(self, models: Dict[str, Model]) -> Dict[str, Model]:
+        """Get this session's copies of the given models, forking new ones"""
+        for name, model in models.items():
+            if name not in self.models:
+                self.models[name] = model.fork()
+        return {name: self.models[name] for name in models}
+
+class SessionManager:
+    """
+    Serves many isolated conversations from a single process.
+
+    Each session gets its own ConversationManager (history, memory, model
+    states and roles) and its own forked copy of every model, so provider
+    message history never leaks between sessions. The context analyzer,
+    tool optimizer and enhanced role cache are built once and shared.
+    Sessions idle for longer than idle_timeout seconds are evicted, and
+    the least recently used session is evicted beyond max_sessions.
+    Sessions processing a turn are never evicted, so max_sessions may be
+    exceeded while every other session is busy.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: Optional[float] = 1800.0,
+        max_sessions: Optional[int] = None,
+        workspace_dir: Optional[str] = None,
+        **conversation_options: Any
+    ):
+        if max_sessions is not None and max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.workspace_dir = os.path.abspath(workspace_dir or "workspace")
+        self.conversation_options = conversation_options
+        self.logger = get_logger()
+
+        # Shared components
+        self.context_analyzer = ContextAnalyzer()
+        self.tool_optimizer = ToolChainOptimizer()
+        self._role_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
+        # Sessions ordered from least to most recently active
+        self.sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self.evicted_count = 0
+
+    def get_session(self, session_id: str) -> ConversationSession:
+        """Get a session, creating it if needed"""
+        self.evict_idle()
+
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = ConversationSession(
+                session_id=session_id,
+                conversation=ConversationManager(
+                    workspace_dir=os.path.join(self.workspace_dir, "sessions", session_id),
+                    context_analyzer=self.context_analyzer,
+                    tool_optimizer=self.tool_optimizer,
+                    role_cache=self._role_cache,
+                    **self.conversation_options
+                )
+            )
+            self.sessions[session_id] = session
+            self.logger.debug(f"Created session {session_id}")
+            self._enforce_capacity(keep=session_id)
+
+        session.last_active = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    async def process(
+        self,
+        session_id: str,
+        models: Dict[str, Model],
+        binding_patterns: Dict[str, List],
+        user_input: str,
+        tools: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Process user input within a session"""
+        session = self.get_session(session_id)
+        # Turns within one session are processed in order
+        async with session.lock:
+            response = await session.conversation.process(
+                models=session.get_models(models),
+                binding_patterns=binding_patterns,
+                user_input=user_input,
+                tools=tools
+            )
+        session.last_active = time.monotonic()
+        return response
+
+    def end_session(self, session_id: str) -> None:
+        """End a session and release its state"""
+        session = self.sessions.pop(session_id, None)
+        if session:
+            session.conversation.close()
+            self.logger.debug(f"Ended session {session_id}")
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Evict sessions idle for longer than idle_timeout"""
+        if self.idle_timeout is None:
+            return []
+        now = time.monotonic() if now is None else now
+
+        evicted = []
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if now - session.last_active <= self.idle_timeout or session.lock.locked():
+                break
+            self.end_session(session_id)
+            evicted.append(session_id)
+        self.evicted_count += len(evicted)
+        return evicted
+
+    def _enforce_capacity(self, keep: Optional[str] = None) -> None:
+        """Evict least recently used idle sessions beyond max_sessions, sparing keep"""
+        if self.max_sessions is None:
+            return
+        for session_id in list(self.sessions):
+            if len(self.sessions) <= self.max_sessions:
+                break
+            if session_id != keep and not self.sessions[session_id].lock.locked():
+                self.end_session(session_id)
+                self.evicted_count += 1
+
+    def close(self) -> None:
+        """End all sessions"""
+        for session_id in list(self.sessions):
+            self.end_session(session_id)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
@@ -0,0 +1,157 @@
+# src/glue/core/similarity.py
+
+"""GLUE Lexical Similarity Index"""
+
+import re
+import random
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple, Hashable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Optional, signatures fall back to pure Python
+    np = None
+
+_WORD = re.compile(r"\w+")
+
+# Words too common to say anything about what a request is about
+STOPWORDS = frozenset((
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "about",
+    "is", "are", "be", "me", "my", "i", "you", "your", "it", "this", "that",
+    "please", "can", "could", "would", "will", "do", "some", "any"
+))
+
+# Mersenne prime modulus for the universal hash family
+_PRIME = (1 << 31) - 1
+
+def shingles(text: str) -> Set[str]:
+    """Split text into content words plus their character trigrams
+
+    Trigrams let inflections of a word ("search", "searching") overlap.
+    """
+    features = set()
+    for word in _WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        features.add(word)
+        padded = f"#{word}#"
+        features.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return features
+
+class MinHashIndex:
+    """
+    MinHash signatures with LSH banding for approximate Jaccard search.
+
+    Each text is reduced to a num_perm-value signature whose agreement with
+    another signature estimates the Jaccard similarity of their shingle
+    sets. Signatures are split into bands; texts sharing any band land in
+    the same bucket, so a query only scores the texts it collides with
+    instead of the whole index. Adds and removals are incremental.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 32, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        self._params = list(zip(a, b))
+        if np is not None:
+            self._a = np.array(a, dtype=np.uint64)[:, None]
+            self._b = np.array(b, dtype=np.uint64)[:, None]
+
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [
+            defaultdict(set) for _ in range(bands)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """Compute the MinHash signature of text, or None if it has no shingles"""
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(text)]
+        if not hashes:
+            return None
+        if np is not None:
+            values = (self._a * np.array(hashes, dtype=np.uint64) + self._b) % _PRIME
+            return tuple(values.min(axis=1).tolist())
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._params)
+
+    def _bands(self, signature: Sequence[int]):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, tuple(signature[band * rows:(band + 1) * rows])
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index text under key, replacing any previous text"""
+        self.remove(key)
+        signature = self.signature(text)
+        if signature is None:
+            return
+        self._signatures[key] = signature
+        for band, value in self._bands(signature):
+            self._buckets[band][value].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove key from the index if present"""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, value in self._bands(signature):
+            bucket = self._buckets[band].get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][value]
+
+    def clear(self) -> None:
+        self._signatures.clear()
+        for buckets in self._buckets:
+            buckets.clear()
+
+    def query(
+        self,
+        text: str,
+        k: int = 5,
+        min_similarity: float = 0.0
+    ) -> List[Tuple[Hashable, float]]:
+        """Find up to k indexed keys most similar to text
+
+        Returns:
+            List of (key, estimated Jaccard similarity), most similar first
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return []
+
+        candidates = set()
+        for band, value in self._bands(signature):
+            candidates.update(self._buckets[band].get(value, ()))
+        if not candidates:
+            return []
+
+        keys = list(candidates)
+        if np is not None:
+            matrix = np.array([self._signatures[key] for key in keys], dtype=np.uint64)
+            scores = (matrix == np.array(signature, dtype=np.uint64)).mean(axis=1).tolist()
+        else:
+            scores = [
+                sum(x == y for x, y in zip(self._signatures[key], signature)) / self.num_perm
+                for key in keys
+            ]
+
+        ranked = sorted(
+            ((key, score) for key, score in zip(keys, scores) if score >= min_similarity),
+            key=lambda item: item[1],
+            reverse=True
+        )
+        return ranked[:k]
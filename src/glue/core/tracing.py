@@ -0,0 +1,167 @@
+# src/glue/core/tracing.py
+
+"""GLUE Latency Tracing"""
+
+import json
+import math
+import time
+import threading
+import itertools
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Deque
+
+# Innermost active span in the current task
+_current_span: ContextVar[Optional["Span"]] = ContextVar("glue_current_span", default=None)
+
+class _NoopSpan:
+    """Span returned while tracing is disabled"""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Span:
+    """A timed, nestable section of work"""
+
+    __slots__ = ("tracer", "name", "span_id", "parent_id", "attributes", "_start", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = next(tracer._ids)
+        self.parent_id: Optional[int] = None
+        self.attributes = attributes
+        self._start = 0.0
+        self._token = None
+
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes to the span"""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent else None
+        self._token = _current_span.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._start
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.tracer._record(self, duration)
+        return False
+
+class Tracer:
+    """
+    Lightweight span tracer.
+
+    Spans nest per asyncio task through a context variable. Finished spans
+    are appended to a JSON-lines trace file (if given) and their durations
+    kept in a bounded per-name window for p50/p95 summaries. While disabled,
+    span() returns a shared no-op object.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        trace_file: Optional[str] = None,
+        max_samples: int = 1000
+    ):
+        self.enabled = enabled
+        self.trace_file = trace_file
+        self.max_samples = max_samples
+        self._ids = itertools.count(1)
+        self._durations: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=max_samples))
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._file = open(trace_file, "a", encoding="utf-8") if enabled and trace_file else None
+
+    def span(self, name: str, **attributes: Any):
+        """Start a span; use as a context manager"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def _record(self, span: Span, duration: float) -> None:
+        """Record a finished span"""
+        with self._lock:
+            self._durations[span.name].append(duration)
+            self._counts[span.name] += 1
+            if self._file:
+                self._file.write(json.dumps({
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "end": time.time(),
+                    "duration_ms": round(duration * 1000, 3),
+                    "attributes": span.attributes
+                }, default=str) + "\n")
+                self._file.flush()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Get count and p50/p95/max latency (ms) per span name"""
+        with self._lock:
+            samples = {name: sorted(durations) for name, durations in self._durations.items()}
+            counts = dict(self._counts)
+
+        summary = {}
+        for name, durations in samples.items():
+            if not durations:
+                continue
+            summary[name] = {
+                "count": counts[name],
+                "p50_ms": _percentile(durations, 0.50) * 1000,
+                "p95_ms": _percentile(durations, 0.95) * 1000,
+                "max_ms": durations[-1] * 1000
+            }
+        return summary
+
+    def reset(self) -> None:
+        """Discard collected samples"""
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+
+    def close(self) -> None:
+        """Close the trace file"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of pre-sorted values"""
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, rank - 1)]
+
+# Global tracer instance
+_tracer: Optional[Tracer] = None
+
+def init_tracer(
+    enabled: bool = True,
+    trace_file: Optional[str] = None,
+    max_samples: int = 1000
+) -> Tracer:
+    """Initialize global tracer"""
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(enabled=enabled, trace_file=trace_file, max_samples=max_samples)
+    return _tracer
+
+def get_tracer() -> Tracer:
+    """Get global tracer instance (disabled unless initialized)"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(enabled=False)
+    return _tracer
@@ -3,11 +3,12 @@
 """GLUE Domain Specific Language"""
 
 from .parser import parse_glue_file
-from .executor import execute_glue_app
+from .executor import execute_glue_app, execute_glue_app_many
 from .environment import load_env
 
 __all__ = [
     'parse_glue_file',
     'execute_glue_app',
+    'execute_glue_app_many',
     'load_env'
 ]
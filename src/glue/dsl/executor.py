@@ -13,13 +13,15 @@ from ..adhesive import (
     tool as create_tool
 )
 from ..providers import (
-    OpenRouterProvider
+    OpenRouterProvider,
+    ResponseCache
 )
 from ..magnetic.field import MagneticField
 from ..core.conversation import ConversationManager
 from ..core.group_chat_flow import GroupChatManager
 from ..core.workspace import WorkspaceManager
 from ..core.logger import init_logger, get_logger
+from ..core.tracing import init_tracer
 
 class GlueExecutor:
     """Executor for GLUE Applications"""
@@ -32,13 +34,22 @@ class GlueExecutor:
         # Initialize logger
         self._setup_logger()
         self.logger = get_logger()
+        self.tracer = self._setup_tracer()
         
         # Initialize workspace manager
         self.workspace_manager = WorkspaceManager()
         
         # Initialize managers
         self.conversation = ConversationManager(
-            sticky=app.config.get("sticky", False)
+            sticky=app.config.get("sticky", False),
+            parallel=app.config.get("parallel", False),
+            max_concurrency=app.config.get("max_concurrency", 4),
+            turn_timeout=app.config.get("turn_timeout"),
+            speculative_tools=(
+                list(ConversationManager.SPECULATIVE_TOOLS)
+                if app.config.get("speculative", False) else None
+            ),
+            memory_limits=app.config.get("memory_limits")
         )
         self.group_chat = GroupChatManager(app.name)
         self._setup_environment()
@@ -59,6 +70,14 @@ class GlueExecutor:
             development=development
         )
     
+    def _setup_tracer(self):
+        """Setup latency tracing if enabled in config"""
+        if not self.app.config.get("trace", False):
+            return None
+        return init_tracer(
+            trace_file=os.path.join("workspace", "logs", f"{self.app.name}_trace.jsonl")
+        )
+    
     def _mask_sensitive_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Mask sensitive data like API keys in settings"""
         masked = deepcopy(data)
@@ -168,6 +187,14 @@ class GlueExecutor:
         self.logger.info("\nSetting up models...")
         self.logger.info(f"Available models: {list(self.app.model_configs.keys())}")
         
+        # Optional response cache shared by all models
+        response_cache = None
+        if self.app.config.get("cache", False):
+            response_cache = ResponseCache(
+                ttl=self.app.config.get("cache_ttl", 3600.0),
+                cache_dir=os.path.join("workspace", "cache")
+            )
+        
         for model_name, config in self.app.model_configs.items():
             self.logger.info(f"\nSetting up model: {model_name}")
             
@@ -199,7 +226,8 @@ class GlueExecutor:
                 model_settings = {
                     "api_key": api_key,
                     "system_prompt": config.role,
-                    "name": model_name  # Use role name instead of model name
+                    "name": model_name,  # Use role name instead of model name
+                    "response_cache": response_cache
                 }
                 
                 # Add optional configuration
@@ -343,21 +371,7 @@ class GlueExecutor:
             async with MagneticField(self.app.name) as field, \
                       MagneticField(f"{self.app.name}_chat") as chat_field:
                 
-                # Set chat field in group chat manager
-                self.group_chat.field = chat_field
-                
-                # Setup tools in field
-                await self._setup_tools(field, workspace_path)
-                
-                # Link tools to models
-                for model_name, model in self.models.items():
-                    if hasattr(model, "_tools"):
-                        for tool_name in list(model._tools.keys()):
-                            if tool_name in self.tools:
-                                model._tools[tool_name] = self.tools[tool_name]
-                
-                # Setup workflow
-                await self._setup_workflow(field)
+                await self._setup_fields(field, chat_field, workspace_path)
                 
                 # Create workspace
                 async with workspace(self.app.name) as ws:
@@ -381,6 +395,19 @@ class GlueExecutor:
                                 chat_id,
                                 user_input
                             )
+                        elif self.app.config.get("stream", False):
+                            # Stream partial output as it arrives
+                            binding_patterns = self._get_binding_patterns(field)
+                            print("\nresponse: ", end="", flush=True)
+                            async for chunk in self.conversation.process_stream(
+                                models=self.models,
+                                binding_patterns=binding_patterns,
+                                user_input=user_input,
+                                tools=self.tools
+                            ):
+                                print(chunk, end="", flush=True)
+                            print(flush=True)
+                            continue
                         else:
                             # Use regular conversation manager for non-chat interactions
                             binding_patterns = self._get_binding_patterns(field)
@@ -393,23 +420,97 @@ class GlueExecutor:
                         
                         print(f"\nresponse: {response}", flush=True)
         finally:
-            # Save conversation state if sticky
-            if self.app.config.get("sticky", False):
-                self.conversation.save_state()
-            
-            # Cleanup any remaining sessions
-            for tool in self.tools.values():
-                if hasattr(tool, 'cleanup'):
-                    await tool.cleanup()
-            
-            # Cleanup group chat
-            await self.group_chat.cleanup()
+            await self._cleanup(workspace_path)
+    
+    async def execute_many(self, inputs: List[str], concurrency: int = None) -> List[Any]:
+        """Run a batch of independent inputs through the application
+        
+        Returns one BatchResult per input, in input order.
+        """
+        await self._setup_models()
+        
+        try:
+            workspace_path = self.workspace_manager.get_workspace(
+                self.app.name,
+                sticky=self.app.config.get("sticky", False)
+            )
             
-            # Cleanup workspace if not sticky
-            if not self.app.config.get("sticky", False):
-                self.workspace_manager.cleanup_workspace(workspace_path)
+            async with MagneticField(self.app.name) as field, \
+                      MagneticField(f"{self.app.name}_chat") as chat_field:
+                
+                await self._setup_fields(field, chat_field, workspace_path)
+                
+                return await self.conversation.process_many(
+                    models=self.models,
+                    binding_patterns=self._get_binding_patterns(field),
+                    inputs=inputs,
+                    tools=self.tools,
+                    concurrency=concurrency or self.app.config.get("batch_concurrency")
+                )
+        finally:
+            await self._cleanup(workspace_path)
+    
+    async def _setup_fields(
+        self,
+        field: MagneticField,
+        chat_field: MagneticField,
+        workspace_path: str
+    ) -> None:
+        """Setup tools and workflow in the magnetic fields"""
+        # Set chat field in group chat manager
+        self.group_chat.field = chat_field
+        
+        # Setup tools in field
+        await self._setup_tools(field, workspace_path)
+        
+        # Link tools to models
+        for model_name, model in self.models.items():
+            if hasattr(model, "_tools"):
+                for tool_name in list(model._tools.keys()):
+                    if tool_name in self.tools:
+                        model._tools[tool_name] = self.tools[tool_name]
+        
+        # Setup workflow
+        await self._setup_workflow(field)
+    
+    async def _cleanup(self, workspace_path: str) -> None:
+        """Persist state and release resources after a run"""
+        # Save conversation state if sticky
+        if self.app.config.get("sticky", False):
+            self.conversation.save_state()
+        self.conversation.close()
+        
+        # Cleanup any remaining sessions
+        for tool in self.tools.values():
+            if hasattr(tool, 'cleanup'):
+                await tool.cleanup()
+        
+        # Cleanup group chat
+        await self.group_chat.cleanup()
+        
+        # Cleanup workspace if not sticky
+        if not self.app.config.get("sticky", False):
+            self.workspace_manager.cleanup_workspace(workspace_path)
+        
+        # Report latency summary
+        if self.tracer:
+            for name, stats in sorted(self.tracer.summary().items()):
+                self.logger.info(
+                    f"{name}: n={stats['count']} p50={stats['p50_ms']:.1f}ms "
+                    f"p95={stats['p95_ms']:.1f}ms max={stats['max_ms']:.1f}ms"
+                )
+            self.tracer.close()
 
 async def execute_glue_app(app: GlueApp) -> Any:
     """Execute GLUE application"""
     executor = GlueExecutor(app)
     return await executor.execute()
+
+async def execute_glue_app_many(
+    app: GlueApp,
+    inputs: List[str],
+    concurrency: int = None
+) -> List[Any]:
+    """Execute GLUE application over a batch of inputs"""
+    executor = GlueExecutor(app)
+    return await executor.execute_many(inputs, concurrency=concurrency)
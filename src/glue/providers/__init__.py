@@ -3,9 +3,11 @@
 """GLUE Provider Implementations"""
 
 from .base import BaseProvider
+from .cache import ResponseCache
 from .openrouter import OpenRouterProvider
 
 __all__ = [
     'BaseProvider',
+    'ResponseCache',
     'OpenRouterProvider',
 ]
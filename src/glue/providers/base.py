@@ -1,9 +1,12 @@
 # src/glue/providers/base.py
 
 # ==================== Imports ====================
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, Optional, AsyncIterator
 from abc import ABC, abstractmethod
 from ..core.model import Model, ModelConfig
+from .cache import ResponseCache
+from ..core.tracing import get_tracer
 
 # ==================== Base Provider Class ====================
 class BaseProvider(Model, ABC):
@@ -13,7 +16,8 @@ class BaseProvider(Model, ABC):
         name: str,
         api_key: str,
         config: Optional[ModelConfig] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None
     ):
         super().__init__(
             name=name,
@@ -22,6 +26,7 @@ class BaseProvider(Model, ABC):
             config=config
         )
         self.base_url = base_url
+        self.response_cache = response_cache
         self._session = None
 
     # ==================== Abstract Methods ====================
@@ -38,17 +43,61 @@ class BaseProvider(Model, ABC):
     # ==================== Shared Methods ====================
     async def generate(self, prompt: str) -> str:
         """Generate a response using the provider's API"""
+        tracer = get_tracer()
+        try:
+            with tracer.span("provider.prepare", provider=self.provider):
+                request_data = await self._prepare_request(prompt)
+            cache_key = self._get_cache_key(request_data)
+            response = self.response_cache.get(cache_key) if cache_key else None
+            if response is None:
+                with tracer.span("provider.network", provider=self.provider):
+                    response = await self._make_request(request_data)
+                if cache_key:
+                    self.response_cache.set(cache_key, response)
+            with tracer.span("provider.parse", provider=self.provider):
+                return await self._process_response(response)
+        except asyncio.TimeoutError:
+            # Deadline overruns and request timeouts propagate unchanged
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Generation failed: {str(e)}")
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Generate a response as text chunks using the provider's API
+        
+        Cached responses are yielded as a single chunk. Streamed responses
+        are not added to the cache.
+        """
         try:
             request_data = await self._prepare_request(prompt)
-            response = await self._make_request(request_data)
-            return await self._process_response(response)
+            cache_key = self._get_cache_key(request_data)
+            response = self.response_cache.get(cache_key) if cache_key else None
+            if response is not None:
+                yield await self._process_response(response)
+                return
+            async for chunk in self._make_stream_request(request_data):
+                yield chunk
+        except asyncio.TimeoutError:
+            # Deadline overruns and request timeouts propagate unchanged
+            raise
         except Exception as e:
             raise RuntimeError(f"Generation failed: {str(e)}")
 
+    def _get_cache_key(self, request_data: Dict[str, Any]) -> Optional[str]:
+        """Get the response cache key for a request, if caching is enabled"""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.make_key({"provider": self.provider, **request_data})
+
     async def _make_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Make the actual API request"""
         raise NotImplementedError("Provider must implement _make_request")
 
+    async def _make_stream_request(self, request_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """Make a streaming API request (defaults to a single full chunk)"""
+        response = await self._make_request(request_data)
+        yield await self._process_response(response)
+
     async def _handle_error(self, error: Exception) -> None:
         """Handle provider-specific errors"""
         raise NotImplementedError("Provider must implement _handle_error")
@@ -0,0 +1,130 @@
+# src/glue/providers/cache.py
+
+"""Provider Response Cache"""
+
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+class ResponseCache:
+    """
+    Exact-match cache of raw provider responses.
+
+    Entries are keyed by a hash of the full request payload (model,
+    messages and sampling parameters), kept in an in-memory LRU tier and
+    optionally mirrored to JSON files in cache_dir so they survive
+    restarts. Entries older than ttl seconds are treated as misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: Optional[float] = 3600.0,
+        cache_dir: Optional[str] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Dict[str, Any]]]" = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(request_data: Dict[str, Any]) -> str:
+        """Hash a request payload into a cache key"""
+        payload = {k: v for k, v in request_data.items() if k != "stream"}
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is None and self.cache_dir:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                self.disk_hits += 1
+                self._remember(key, entry)
+
+        if entry is None or self._is_expired(entry[0]):
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Cache a response"""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        entry = (expires_at, response)
+        self._remember(key, entry)
+        if self.cache_dir:
+            with open(self._disk_path(key), "w") as f:
+                json.dump({"expires_at": expires_at, "response": response}, f)
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        for key in list(self._entries):
+            self._discard(key)
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def _remember(self, key: str, entry: Tuple[Optional[float], Dict[str, Any]]) -> None:
+        """Add an entry to the memory tier, evicting the least recently used"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _discard(self, key: str) -> None:
+        """Remove an entry from both tiers"""
+        self._entries.pop(key, None)
+        if self.cache_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _is_expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and time.time() > expires_at
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[Optional[float], Dict[str, Any]]]:
+        """Load an entry from the disk tier"""
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return data["expires_at"], data["response"]
+        except (OSError, ValueError, KeyError):
+            return None
@@ -5,10 +5,13 @@
 import os
 import json
 import aiohttp
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from .base import BaseProvider
+from .cache import ResponseCache
 from ..core.model import ModelConfig
 from ..core.logger import get_logger
+from ..core.prompt import fit_messages
+from ..core.deadline import request_timeout
 from ..magnetic.field import MagneticResource
 
 class OpenRouterProvider(BaseProvider, MagneticResource):
@@ -21,13 +24,16 @@ class OpenRouterProvider(BaseProvider, MagneticResource):
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 1000,
-        name: Optional[str] = None  # Add name parameter for MagneticResource
+        name: Optional[str] = None,  # Add name parameter for MagneticResource
+        context_window: Optional[int] = None,
+        response_cache: Optional[ResponseCache] = None
     ):
         # Create model config
         config = ModelConfig(
             temperature=temperature,
             max_tokens=max_tokens,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            context_window=context_window
         )
         
         # Initialize base provider with model name
@@ -36,7 +42,8 @@ class OpenRouterProvider(BaseProvider, MagneticResource):
             name=model,  # Use model ID for API calls
             api_key=api_key or os.getenv("OPENROUTER_API_KEY"),
             config=config,
-            base_url="https://openrouter.ai/api/v1"
+            base_url="https://openrouter.ai/api/v1",
+            response_cache=response_cache
         )
         
         # Initialize magnetic resource with role name
@@ -97,6 +104,11 @@ class OpenRouterProvider(BaseProvider, MagneticResource):
             "content": prompt
         })
         
+        # Drop the oldest turns once history outgrows the context window
+        if self.config.context_window:
+            budget = self.config.context_window - self.config.max_tokens
+            self.messages = fit_messages(self.messages, budget)
+        
         request_data = {
             "model": self.model_id,  # Use model ID for API calls
             "messages": self.messages,
@@ -142,7 +154,7 @@ class OpenRouterProvider(BaseProvider, MagneticResource):
         headers = self._get_headers()
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(timeout=request_timeout()) as session:
                 self.logger.debug(f"Making request to: {self.base_url}/chat/completions")
                 async with session.post(
                     f"{self.base_url}/chat/completions",
@@ -164,6 +176,70 @@ class OpenRouterProvider(BaseProvider, MagneticResource):
             self.logger.error(f"Error decoding response: {str(e)}")
             raise
     
+    async def _make_stream_request(self, request_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """Make a streaming request to OpenRouter API and yield content deltas"""
+        headers = self._get_headers()
+        chunks: List[str] = []
+        
+        try:
+            async with aiohttp.ClientSession(timeout=request_timeout()) as session:
+                self.logger.debug(f"Making streaming request to: {self.base_url}/chat/completions")
+                async with session.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=headers,
+                    json={**request_data, "stream": True}
+                ) as response:
+                    if response.status != 200:
+                        result = await response.json()
+                        self.logger.error(f"API Error (Status {response.status}):")
+                        self.logger.error(json.dumps(result, indent=2))
+                        await self._handle_error(result)
+                    
+                    # Server-sent events arrive one line at a time
+                    async for raw_line in response.content:
+                        event = self._parse_sse_line(raw_line.decode("utf-8"))
+                        if event is None:
+                            continue
+                        if event.get("done"):
+                            break
+                        if "error" in event:
+                            await self._handle_error(event)
+                        
+                        choices = event.get("choices") or [{}]
+                        delta = choices[0].get("delta", {}).get("content")
+                        if delta:
+                            chunks.append(delta)
+                            yield delta
+        except aiohttp.ClientError as e:
+            self.logger.error(f"Network error: {str(e)}")
+            raise
+        
+        # Add the assembled assistant response to conversation
+        self.messages.append({
+            "role": "assistant",
+            "content": "".join(chunks)
+        })
+    
+    @staticmethod
+    def _parse_sse_line(line: str) -> Optional[Dict[str, Any]]:
+        """Parse a single server-sent event line from a streaming response
+        
+        Returns the decoded JSON payload, {"done": True} for the end-of-stream
+        marker, or None for blank lines, comments and non-data fields.
+        """
+        line = line.strip()
+        if not line or line.startswith(":") or not line.startswith("data:"):
+            return None
+        
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            return {"done": True}
+        
+        try:
+            return json.loads(payload)
+        except json.JSONDecodeError:
+            return None
+    
     async def _handle_error(self, error_response: Dict[str, Any]) -> None:
         """Handle OpenRouter API errors"""
         error_message = error_response.get('error', {}).get('message', str(error_response))
@@ -179,6 +255,12 @@ class OpenRouterProvider(BaseProvider, MagneticResource):
         }
         return headers
     
+    def fork(self) -> 'OpenRouterProvider':
+        """Create a copy with its own conversation history"""
+        forked = super().fork()
+        forked.clear_history()
+        return forked
+    
     def clear_history(self) -> None:
         """Clear conversation history"""
         self.messages = []
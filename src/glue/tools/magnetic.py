@@ -4,6 +4,7 @@ import asyncio
 from typing import List, Optional, Any, Dict
 from .base import BaseTool
 from ..magnetic.field import MagneticResource
+from ..core.tracing import get_tracer
 
 class MagneticTool(BaseTool, MagneticResource):
     """Base class for tools that can share resources in a magnetic workspace"""
@@ -71,11 +72,18 @@ class MagneticTool(BaseTool, MagneticResource):
         if self._current_field:
             for tool in self._attracted_to:
                 if isinstance(tool, MagneticTool):
-                    task = asyncio.create_task(tool._on_resource_shared(self, resource_name, data))
+                    task = asyncio.create_task(self._notify_shared(tool, resource_name, data))
                     self._pending_tasks.append(task)
                     # Clean up completed tasks
                     self._pending_tasks = [t for t in self._pending_tasks if not t.done()]
 
+    async def _notify_shared(self, tool: 'MagneticTool', resource_name: str, data: Any) -> None:
+        """Deliver a shared resource to an attracted tool"""
+        with get_tracer().span(
+            "tool.share_resource", tool=self.name, target=tool.name, resource=resource_name
+        ):
+            await tool._on_resource_shared(self, resource_name, data)
+
     def get_shared_resource(self, resource_name: str) -> Any:
         """Get a shared resource from the workspace"""
         if not self.magnetic:
@@ -119,7 +127,8 @@ class MagneticTool(BaseTool, MagneticResource):
         """Clean up resources when tool is done"""
         # Wait for any pending resource sharing tasks
         if self._pending_tasks:
-            await asyncio.gather(*self._pending_tasks)
+            with get_tracer().span("tool.cleanup", tool=self.name):
+                await asyncio.gather(*self._pending_tasks)
         await self.detach_from_workspace()
         await super().cleanup()
 
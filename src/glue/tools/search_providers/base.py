@@ -6,6 +6,7 @@ import aiohttp
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
+from ...core.deadline import request_timeout
 
 @dataclass
 class SearchResult:
@@ -82,7 +83,8 @@ class GenericSearchProvider(SearchProvider):
                 self.endpoint,
                 headers=self.headers,
                 params=params,
-                json=json_data
+                json=json_data,
+                timeout=request_timeout()
             ) as response:
                 if response.status == 405:  # Method Not Allowed
                     return None
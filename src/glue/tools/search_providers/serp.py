@@ -5,6 +5,7 @@
 import aiohttp
 from typing import Dict, List, Any, Optional
 from .base import SearchProvider, SearchResult
+from ...core.deadline import request_timeout
 
 class SerpSearchProvider(SearchProvider):
     """SERP API search provider implementation"""
@@ -66,7 +67,9 @@ class SerpSearchProvider(SearchProvider):
         
         try:
             # Make request
-            async with self._session.get(self.endpoint, params=params) as response:
+            async with self._session.get(
+                self.endpoint, params=params, timeout=request_timeout()
+            ) as response:
                 response.raise_for_status()
                 data = await response.json()
                 
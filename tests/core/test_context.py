@@ -0,0 +1,170 @@
+# tests/core/test_context.py
+
+# ==================== Imports ====================
+import re
+import pytest
+from src.glue.core.context import (
+    ContextAnalyzer, PatternScanner, InteractionType, ComplexityLevel
+)
+
+# ==================== Fixtures ====================
+@pytest.fixture
+def analyzer():
+    return ContextAnalyzer()
+
+# ==================== Scanner Tests ====================
+def test_scanner_reports_every_category():
+    """Test overlapping patterns from different categories are all reported"""
+    scanner = PatternScanner((
+        ("research", "research", r"(?i)research", 0.8),
+        ("model", "researcher", r"(?i)research(?:er)?", 1.0),
+        ("task", "search", r"(?i)search", 0.7),
+        ("steps", "steps", r"(?i)(?:and|then)", 1.0),
+    ))
+    scan = scanner.scan("Ask the Researcher and then search")
+    
+    assert scan.categories() == {"research": 0.8, "model": 1.0, "task": 0.7, "steps": 1.0}
+    assert scan.count("task") == 2
+    assert scan.count("steps") == 2
+    assert not scan.has("chat")
+
+@pytest.mark.parametrize("pattern,text", [
+    (r"(?i)(?:and|then|after|next|finally)", "thenext andand Finally and"),
+    (r"[.!?]+", "One. Two!? Three..."),
+    (r"(?i)^(?:hi|hello)(?:\s|$)", "hello hello"),
+    (r"(?i)what (?:is|are)", "WHAT is what are"),
+])
+def test_scanner_counts_match_findall(pattern, text):
+    """Test counts agree with re.findall"""
+    scan = PatternScanner((("c", pattern, pattern, 1.0),)).scan(text)
+    assert scan.count("c") == len(re.findall(pattern, text))
+
+def test_scanner_respects_case_sensitive_patterns():
+    """Test patterns without (?i) stay case-sensitive"""
+    scanner = PatternScanner((("name", "GLUE", "GLUE", 1.0),))
+    assert scanner.scan("about GLUE").has("name")
+    assert not scanner.scan("about glue").has("name")
+
+# ==================== Analyzer Tests ====================
+def test_analyze_research(analyzer):
+    """Test research requests need web search"""
+    state = analyzer.analyze(
+        "Research the history of GLUE and then save a document",
+        available_tools=["web_search", "file_handler"]
+    )
+    assert state.interaction_type == InteractionType.RESEARCH
+    assert state.requires_research
+    assert state.requires_persistence
+    assert state.tools_required == {"web_search", "file_handler"}
+    assert state.complexity == ComplexityLevel.MODERATE
+
+def test_analyze_chat(analyzer):
+    """Test greetings are classified as chat"""
+    state = analyzer.analyze("Hello there")
+    assert state.interaction_type == InteractionType.CHAT
+    assert state.confidence == 0.9
+    assert state.tools_required == set()
+
+def test_analyze_targets_model(analyzer):
+    """Test model targeting and chat mode detection"""
+    state = analyzer.analyze("Ask the writer to organize this again")
+    assert state.target_model == "writer"
+    assert state.chat_mode
+    assert state.requires_memory
+
+def test_scanner_shared_between_analyzers():
+    """Test pattern tables are compiled once"""
+    assert ContextAnalyzer()._scanner is ContextAnalyzer()._scanner
+
+# ==================== Cache Tests ====================
+def test_analysis_is_memoized(analyzer):
+    """Test repeated inputs reuse the cached analysis"""
+    first = analyzer.analyze("Research  the history of GLUE", ["web_search"])
+    second = analyzer.analyze("Research the history of GLUE ", ["web_search"])
+    
+    assert second == first
+    assert second is not first
+    assert analyzer.get_cache_stats()["hits"] == 1
+    
+    # Callers may mutate their copy without affecting the cache
+    second.tools_required.add("file_handler")
+    assert analyzer.analyze("Research the history of GLUE", ["web_search"]).tools_required == {"web_search"}
+
+def test_whitespace_does_not_change_fresh_analysis(analyzer):
+    """Test analysis sees the original text, not the normalized cache key"""
+    state = analyzer.analyze("  hi there")
+    assert state.interaction_type == InteractionType.UNKNOWN
+    assert state.confidence == 0.3
+    
+    state = analyzer.analyze("look\nup the weather")
+    assert state.interaction_type == InteractionType.UNKNOWN
+    assert state.tools_required == set()
+
+def test_cache_keyed_by_tools(analyzer):
+    """Test different tool sets are analyzed separately"""
+    analyzer.analyze("Research the history of GLUE", ["web_search"])
+    state = analyzer.analyze("Research the history of GLUE", ["file_handler"])
+    assert state.tools_required == set()
+    assert analyzer.get_cache_stats()["misses"] == 2
+
+def test_cache_is_bounded():
+    """Test least recently used analyses are evicted"""
+    analyzer = ContextAnalyzer(cache_size=2)
+    for text in ["hello", "thanks", "hello", "what is GLUE"]:
+        analyzer.analyze(text)
+    assert analyzer.get_cache_stats()["entries"] == 2
+    analyzer.analyze("hello")
+    assert analyzer.get_cache_stats()["hits"] == 2
+
+# ==================== History Tests ====================
+def test_history_ring_and_counters():
+    """Test history keeps a fixed window while counters cover every call"""
+    analyzer = ContextAnalyzer(history_size=3)
+    for text in ["hello", "research GLUE", "hello", "thanks", "research GLUE"]:
+        analyzer.analyze(text)
+    
+    assert len(analyzer.interaction_history) == 3
+    recent = analyzer.get_recent_context(2)
+    assert [s.interaction_type for s in recent] == [InteractionType.CHAT, InteractionType.RESEARCH]
+    assert analyzer.get_type_counts() == {InteractionType.CHAT: 3, InteractionType.RESEARCH: 2}
+    
+    analyzer.clear_history()
+    assert analyzer.get_recent_context() == []
+    assert analyzer.get_type_counts() == {}
+
+# ==================== Batch Tests ====================
+BATCH_TEXTS = [
+    "Hello there",
+    "hello  there",
+    "Research the history of GLUE and then save a document",
+    "Ask the writer to organize this again",
+    "Create a file. Then run it! What happened?",
+    "thanks",
+    "",
+    "lorem ipsum",
+    "  hi there",
+    "look\nup the weather",
+]
+
+@pytest.mark.parametrize("tools", [None, ["web_search", "file_handler"], ["code_interpreter"]])
+def test_analyze_batch_matches_scalar(tools):
+    """Test vectorized results equal the scalar path"""
+    pytest.importorskip("numpy")
+    analyzer = ContextAnalyzer(cache_size=0)
+    
+    batch = analyzer.analyze_batch(BATCH_TEXTS, tools)
+    scalar = [analyzer.analyze(text, tools) for text in BATCH_TEXTS]
+    
+    assert batch == scalar
+    assert analyzer.get_type_counts()[InteractionType.CHAT] == 2 * 3
+
+def test_analyze_batch_without_numpy(monkeypatch):
+    """Test the batch API falls back to scalar analysis"""
+    from src.glue.core import context
+    monkeypatch.setattr(context, "np", None)
+    analyzer = ContextAnalyzer()
+    
+    states = analyzer.analyze_batch(BATCH_TEXTS[:3])
+    assert [s.interaction_type for s in states] == [
+        InteractionType.CHAT, InteractionType.CHAT, InteractionType.RESEARCH
+    ]
@@ -1,6 +1,7 @@
 # tests/core/test_conversation.py
 
 # ==================== Imports ====================
+import asyncio
 import pytest
 from datetime import datetime
 from src.glue.core.conversation import ConversationManager
@@ -172,4 +173,338 @@ async def test_process_error_handling(conversation_manager):
     if len(conversation_manager.history) > 0:
         last_entry = conversation_manager.history[-1]
         assert last_entry["role"] == "error"
-        assert "Error processing conversation" in last_entry["content"]
\ No newline at end of file
+        assert "Error processing conversation" in last_entry["content"]
+
+# ==================== Streaming Tests ====================
+class StreamingModel(Model):
+    """Model that streams a fixed response in chunks"""
+    def __init__(self, name: str, chunks, delay: float = 0):
+        super().__init__(name, "test")
+        self.role = "You are a helpful assistant"
+        self.chunks = chunks
+        self.delay = delay
+
+    async def generate(self, prompt: str) -> str:
+        return "".join(self.chunks)
+
+    async def generate_stream(self, prompt: str):
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+
+@pytest.mark.asyncio
+async def test_process_stream(conversation_manager):
+    """Test streaming chunks through the conversation flow"""
+    models = {"model1": StreamingModel("model1", ["Hel", "lo ", "there"])}
+    bindings = {"glue": [], "velcro": [], "tape": [], "magnet": []}
+    
+    chunks = [
+        chunk async for chunk in conversation_manager.process_stream(
+            models, bindings, "hello"
+        )
+    ]
+    
+    assert chunks == ["Hel", "lo ", "there"]
+    assert conversation_manager.history[-1]["content"] == "Hello there"
+
+# ==================== Parallel Flow Tests ====================
+class SlowModel(Model):
+    """Model that records how many generations overlap"""
+    active = 0
+    max_active = 0
+
+    def __init__(self, name: str):
+        super().__init__(name, "test")
+        self.role = "You are a helpful assistant"
+        self.prompts = []
+
+    async def generate(self, prompt: str) -> str:
+        SlowModel.active += 1
+        SlowModel.max_active = max(SlowModel.max_active, SlowModel.active)
+        self.prompts.append(prompt)
+        await asyncio.sleep(0.05)
+        SlowModel.active -= 1
+        return f"{self.name} done"
+
+def test_build_flow_graph(conversation_manager):
+    """Test compiling binding patterns into flow dependencies"""
+    bindings = {
+        "glue": [("model1", "model2")],
+        "magnet": [("model3", "model4")]
+    }
+    graph = conversation_manager._build_flow_graph(
+        ["model1", "model2", "model3", "model4"], bindings
+    )
+    assert graph == {
+        "model1": [],
+        "model2": ["model1"],
+        "model3": [],
+        "model4": ["model3"]
+    }
+
+@pytest.mark.asyncio
+async def test_parallel_flow():
+    """Test independent branches run concurrently with ordered responses"""
+    manager = ConversationManager(parallel=True, max_concurrency=4)
+    models = {name: SlowModel(name) for name in ["model1", "model2", "model3", "model4"]}
+    bindings = {
+        "glue": [("model1", "model2")],
+        "velcro": [("model3", "model4")],
+        "tape": [],
+        "magnet": []
+    }
+    SlowModel.active = SlowModel.max_active = 0
+    
+    response = await manager.process(models, bindings, "hello")
+    
+    assert SlowModel.max_active == 2
+    assert response == "model4 done"
+    assert "model1 done" in models["model2"].prompts[0]
+    assert [entry.get("model") for entry in manager.history[1:]] == [
+        "model1", "model2", "model3", "model4"
+    ]
+
+@pytest.mark.asyncio
+async def test_parallel_stream_keeps_models_contiguous():
+    """Test concurrently streaming models are not interleaved"""
+    manager = ConversationManager(parallel=True)
+    models = {
+        "model1": StreamingModel("model1", ["a1", "a2", "a3"], delay=0.01),
+        "model2": StreamingModel("model2", ["b1", "b2", "b3"], delay=0.015)
+    }
+    bindings = {"glue": [], "velcro": [("model1", "model1"), ("model2", "model2")], "tape": [], "magnet": []}
+    
+    chunks = [chunk async for chunk in manager.process_stream(models, bindings, "hello")]
+    
+    assert chunks == ["a1", "a2", "a3", "\n\n", "b1", "b2", "b3"]
+
+# ==================== Pattern Recall Tests ====================
+@pytest.mark.asyncio
+async def test_recalled_flow_for_paraphrased_input():
+    """Test a paraphrased request reuses the flow of a learned pattern"""
+    manager = ConversationManager()
+    models = {name: SlowModel(name) for name in ["model1", "model2"]}
+    bindings = {"glue": [], "velcro": [], "tape": [], "magnet": []}
+    trigger = "hello there my good friend"
+    manager.memory_manager.learn_pattern(
+        trigger=trigger,
+        sequence=["model2"],
+        success=True,
+        context=manager.context_analyzer.analyze(trigger)
+    )
+    
+    response = await manager.process(models, bindings, "hello there, my good friends")
+    
+    assert response == "model2 done"
+    assert not models["model1"].prompts
+
+def test_pattern_recall_skips_content_index():
+    """Test default conversations index pattern triggers but not message content"""
+    manager = ConversationManager()
+    assert manager.memory_manager._pattern_index is not None
+    assert manager.memory_manager._content_index is None
+
+# ==================== Memory Expiry Tests ====================
+@pytest.mark.asyncio
+async def test_memory_ttl_sweeps_short_term():
+    """Test short-term messages expire in the background when memory_ttl is set"""
+    manager = ConversationManager(memory_ttl=0.05)
+    models = {"model1": SlowModel("model1")}
+    bindings = {"glue": [], "velcro": [], "tape": [], "magnet": []}
+    
+    await manager.process(models, bindings, "hello")
+    assert manager.memory_manager.short_term
+    await asyncio.sleep(0.2)
+    assert not manager.memory_manager.short_term
+    
+    sweeper = manager.memory_manager._sweeper
+    manager.close()
+    await asyncio.sleep(0)
+    assert sweeper.cancelled()
+
+# ==================== Role Enhancement Tests ====================
+def test_enhance_role_with_tools(conversation_manager):
+    """Test tool patterns are rewritten in the enhanced role"""
+    enhanced = conversation_manager._enhance_role_with_tools(
+        "As an AI model, I can't directly browse. Shall I summarize?",
+        ["web_search"]
+    )
+    assert enhanced.startswith("Using my integrated capabilities, I'll use my tools to browse.")
+    assert "I will summarize?" in enhanced
+    assert "you MUST use web_search" in enhanced
+
+def test_enhance_role_overlapping_patterns(conversation_manager):
+    """Test tool patterns apply in order, each to the previous output"""
+    enhanced = conversation_manager._enhance_role_with_tools("I would need to search.", [])
+    assert enhanced == "I would will use web_search."
+
+def test_enhanced_role_is_cached(conversation_manager):
+    """Test enhanced roles are memoized and do not accumulate"""
+    first = conversation_manager._get_enhanced_role("You are a researcher", ["web_search"])
+    second = conversation_manager._get_enhanced_role("You are a researcher", ["web_search"])
+    assert first is second
+    assert first.count("IMPORTANT") == 1
+    
+    other = conversation_manager._get_enhanced_role("You are a researcher", ["file_handler"])
+    assert other != first
+
+# ==================== Sticky History Tests ====================
+def test_sticky_history_journal(tmp_path):
+    """Test sticky history is appended to a journal and reloaded"""
+    manager = ConversationManager(sticky=True, workspace_dir=str(tmp_path))
+    manager.history.append({"role": "user", "content": "first"})
+    manager._save_history()
+    manager.history.append({"role": "user", "content": "second"})
+    manager._save_history()
+    manager.close()
+    
+    with open(tmp_path / "chat_history.jsonl") as f:
+        assert len(f.readlines()) == 2
+    
+    reloaded = ConversationManager(sticky=True, workspace_dir=str(tmp_path), history_tail=1)
+    assert [m["content"] for m in reloaded.history] == ["second"]
+    reloaded.close()
+
+def test_legacy_history_migration(tmp_path):
+    """Test a legacy chat_history.json is migrated into the journal"""
+    import json
+    with open(tmp_path / "chat_history.json", "w") as f:
+        json.dump([{"role": "user", "content": "old"}], f)
+    
+    manager = ConversationManager(sticky=True, workspace_dir=str(tmp_path))
+    assert manager.history == [{"role": "user", "content": "old"}]
+    assert (tmp_path / "chat_history.jsonl").exists()
+    manager.close()
+
+# ==================== Batch Processing Tests ====================
+class FailingModel(Model):
+    """Model that fails on inputs containing 'fail'"""
+    def __init__(self, name: str):
+        super().__init__(name, "test")
+        self.role = "You are a helpful assistant"
+
+    async def generate(self, prompt: str) -> str:
+        if "fail" in prompt:
+            raise RuntimeError("generation failed")
+        return prompt.rsplit("\n", 1)[-1].upper()
+
+@pytest.mark.asyncio
+async def test_process_many_bounded_and_ordered():
+    """Test batch inputs run concurrently up to the limit, in input order"""
+    manager = ConversationManager()
+    models = {"model1": SlowModel("model1")}
+    bindings = {"glue": [], "velcro": [], "tape": [], "magnet": []}
+    SlowModel.active = SlowModel.max_active = 0
+    
+    results = await manager.process_many(
+        models, bindings, [f"hello {i}" for i in range(6)], concurrency=3
+    )
+    
+    assert SlowModel.max_active == 3
+    assert [r.index for r in results] == list(range(6))
+    assert all(r.ok and r.response == "model1 done" for r in results)
+    # Batch items do not touch the parent conversation
+    assert manager.history == []
+
+@pytest.mark.asyncio
+async def test_process_many_reports_errors():
+    """Test a failing item does not abort the batch"""
+    manager = ConversationManager()
+    models = {"model1": FailingModel("model1")}
+    bindings = {"glue": [], "velcro": [], "tape": [], "magnet": []}
+    
+    results = await manager.process_many(models, bindings, ["hello one", "hello fail", "hello three"])
+    
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[0].response == "HELLO ONE"
+    assert "generation failed" in results[1].error
+    assert results[2].response == "HELLO THREE"
+
+# ==================== Deadline Tests ====================
+class HangingModel(Model):
+    """Model that never finishes unless cancelled"""
+    def __init__(self, name: str):
+        super().__init__(name, "test")
+        self.role = "You are a helpful assistant"
+        self.cancelled = False
+
+    async def generate(self, prompt: str) -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "too late"
+
+@pytest.mark.asyncio
+async def test_turn_deadline_returns_partial_result():
+    """Test an expired turn cancels remaining steps and keeps finished ones"""
+    manager = ConversationManager(turn_timeout=0.2)
+    models = {"model1": SlowModel("model1"), "model2": HangingModel("model2")}
+    bindings = {"glue": [("model1", "model2")], "velcro": [], "tape": [], "magnet": []}
+    
+    response = await manager.process(models, bindings, "hello")
+    
+    assert response.startswith("model1 done")
+    assert "deadline" in response
+    assert models["model2"].cancelled
+    assert manager.history[-1]["role"] == "error"
+
+@pytest.mark.asyncio
+async def test_turn_deadline_parallel():
+    """Test an expired parallel turn keeps completed branches"""
+    manager = ConversationManager(parallel=True)
+    models = {"model1": SlowModel("model1"), "model2": HangingModel("model2")}
+    # Self-bindings add both models to the flow without dependencies
+    bindings = {"glue": [], "velcro": [("model1", "model1"), ("model2", "model2")], "tape": [], "magnet": []}
+    
+    response = await manager.process(models, bindings, "hello", timeout=0.2)
+    
+    assert response.startswith("model1 done")
+    assert models["model2"].cancelled
+
+# ==================== Speculative Prefetch Tests ====================
+class RecordingSearchTool:
+    """Tool that records the inputs it was executed with"""
+    def __init__(self):
+        self.name = "web_search"
+        self.inputs = []
+
+    async def execute(self, input_data):
+        self.inputs.append(input_data)
+        await asyncio.sleep(0.01)
+        return f"results for {input_data}"
+
+@pytest.mark.asyncio
+async def test_speculative_prefetch_hit():
+    """Test a predicted tool starts on the raw input and its result is used"""
+    manager = ConversationManager(speculative_tools=["web_search"])
+    tools = {"web_search": RecordingSearchTool()}
+    models = {"model1": SlowModel("model1")}
+    models["model1"].add_tool("web_search", tools["web_search"])
+    bindings = {"glue": [], "velcro": [], "tape": [], "magnet": [("model1", "web_search")]}
+    user_input = "research the latest python release"
+    
+    response = await manager.process(models, bindings, user_input, tools)
+    
+    assert response == f"results for {user_input}"
+    assert tools["web_search"].inputs == [user_input]
+    assert manager.get_speculation_stats()["hits"] == 1
+    assert manager.get_speculation_stats()["wasted"] == 0
+
+@pytest.mark.asyncio
+async def test_speculative_prefetch_wasted():
+    """Test a prefetch the flow never reaches is discarded and counted"""
+    manager = ConversationManager(speculative_tools=["web_search"])
+    tools = {"web_search": RecordingSearchTool()}
+    models = {"model1": FailingModel("model1")}
+    models["model1"].add_tool("web_search", tools["web_search"])
+    bindings = {"glue": [], "velcro": [], "tape": [], "magnet": [("model1", "web_search")]}
+    
+    response = await manager.process(models, bindings, "research how to fail well", tools)
+    
+    assert response.startswith("Error")
+    stats = manager.get_speculation_stats()
+    assert stats["started"] == 1
+    assert stats["wasted"] == 1
+    assert stats["hits"] == 0
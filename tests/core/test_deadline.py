@@ -0,0 +1,56 @@
+# tests/core/test_deadline.py
+
+# ==================== Imports ====================
+import asyncio
+import pytest
+from src.glue.core.deadline import (
+    Deadline, DeadlineExceeded, deadline_scope, get_deadline,
+    request_timeout, DEFAULT_REQUEST_TIMEOUT
+)
+
+# ==================== Deadline Tests ====================
+def test_remaining_and_check():
+    """Test remaining time and expiry checks"""
+    deadline = Deadline(60)
+    assert 59 < deadline.remaining() <= 60
+    deadline.check()
+    
+    expired = Deadline(0)
+    assert expired.expired
+    with pytest.raises(DeadlineExceeded):
+        expired.check()
+
+@pytest.mark.asyncio
+async def test_run_cancels_on_expiry():
+    """Test work past the deadline is cancelled"""
+    cancelled = asyncio.Event()
+    
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    with pytest.raises(DeadlineExceeded):
+        await Deadline(0.05).run(hang())
+    assert cancelled.is_set()
+
+# ==================== Scope Tests ====================
+def test_scope_keeps_sooner_deadline():
+    """Test nested scopes never extend an enclosing deadline"""
+    assert get_deadline() is None
+    with deadline_scope(1) as outer:
+        with deadline_scope(60) as inner:
+            assert inner is outer
+        with deadline_scope(0.5) as inner:
+            assert inner is not outer
+            assert get_deadline() is inner
+        assert get_deadline() is outer
+    assert get_deadline() is None
+
+def test_request_timeout():
+    """Test HTTP timeouts follow the current deadline"""
+    assert request_timeout() is DEFAULT_REQUEST_TIMEOUT
+    with deadline_scope(5):
+        assert request_timeout().total <= 5
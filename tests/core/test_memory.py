@@ -1,7 +1,15 @@
 # tests/core/test_memory.py
+import asyncio
+import random
+import sys
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 import pytest
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from src.glue.core.memory import MemoryManager, MemorySegment
+from src.glue.core.memory import MemoryManager, MemorySegment, MemoryLimit, LearningOutcome, OutcomeLog
+from src.glue.core.context import ContextState, InteractionType, ComplexityLevel
 
 @pytest.fixture
 def memory_manager():
@@ -146,4 +154,398 @@ def test_invalid_memory_type(memory_manager):
         memory_manager.store("key", "content", "invalid_type")
     
     with pytest.raises(ValueError):
-        memory_manager.recall("key", "invalid_type")
\ No newline at end of file
+        memory_manager.recall("key", "invalid_type")
+
+def test_recent_messages(memory_manager):
+    """Test the recent message index"""
+    for i in range(10):
+        role = "user" if i % 2 == 0 else "assistant"
+        memory_manager.store(f"msg_{i}", {"role": role, "content": f"message {i}"})
+    memory_manager.store("plain", "not a message")
+    
+    recent = memory_manager.get_recent_messages(limit=3)
+    assert [m["content"] for m in recent] == ["message 7", "message 8", "message 9"]
+    
+    users = memory_manager.get_recent_messages(limit=2, roles=["user"])
+    assert [m["content"] for m in users] == ["message 6", "message 8"]
+    
+    # Forgotten messages drop out of the index
+    memory_manager.forget("msg_9")
+    recent = memory_manager.get_recent_messages(limit=1)
+    assert recent[0]["content"] == "message 8"
+    
+    memory_manager.clear("short_term")
+    assert memory_manager.get_recent_messages() == []
+
+def _context(interaction_type):
+    return ContextState(
+        interaction_type=interaction_type,
+        complexity=ComplexityLevel.SIMPLE,
+        tools_required=set(),
+        requires_research=False,
+        requires_memory=False,
+        requires_persistence=False,
+        confidence=1.0
+    )
+
+def test_query_by_tags_and_context(memory_manager):
+    """Test tag and context type queries"""
+    research = _context(InteractionType.RESEARCH)
+    chat = _context(InteractionType.CHAT)
+    memory_manager.store("a", "A", tags={"web", "ai"}, context=research)
+    memory_manager.store("b", "B", "long_term", tags={"web"}, context=chat)
+    memory_manager.store("c", "C", "working", tags={"ai"}, context=research)
+    
+    assert [k for k, _ in memory_manager.query(tags=["web"])] == ["b", "a"]
+    assert [k for k, _ in memory_manager.query(tags=["web", "ai"])] == ["a"]
+    assert [k for k, _ in memory_manager.query(context_type=InteractionType.RESEARCH)] == ["c", "a"]
+    assert [k for k, _ in memory_manager.query(tags=["ai"], memory_types=["working"])] == ["c"]
+    assert memory_manager.query(tags=["missing"]) == []
+    
+    # Replaced and forgotten segments leave the indexes
+    memory_manager.store("a", "A2", tags={"other"})
+    memory_manager.forget("b", "long_term")
+    assert memory_manager.query(tags=["web"]) == []
+    assert [s.content for _, s in memory_manager.query(tags=["other"])] == ["A2"]
+    
+    memory_manager.clear()
+    assert memory_manager.query() == []
+
+def test_query_by_time_range(memory_manager):
+    """Test creation time range queries"""
+    start = datetime(2024, 1, 1)
+    for i in range(5):
+        segment = MemorySegment(content=i, created_at=start + timedelta(hours=i))
+        memory_manager._insert("short_term", f"m{i}", segment)
+    memory_manager.store("expired", "gone", duration=timedelta(seconds=-1))
+    
+    results = memory_manager.query(since=start + timedelta(hours=1), until=start + timedelta(hours=4))
+    assert [s.content for _, s in results] == [3, 2, 1]
+    assert [k for k, _ in memory_manager.query(limit=2)] == ["m4", "m3"]
+    assert "expired" not in [k for k, _ in memory_manager.query()]
+    
+    memory_manager.cleanup_expired()
+    assert len(memory_manager._time_index) == 5
+
+def test_cleanup_expired_uses_queue(memory_manager):
+    """Test only due, current segments are removed by cleanup"""
+    past = timedelta(seconds=-1)
+    memory_manager.store("old", "gone", duration=past)
+    memory_manager.store("kept", "stale entry", duration=past)
+    memory_manager.store("kept", "replaced")  # Replacement has no expiry
+    memory_manager.store("later", "soon", "working", duration=timedelta(hours=1))
+    memory_manager.share("model1", "model2", "shared", "data", duration=past)
+    
+    assert memory_manager.cleanup_expired() == 2  # Shared segments expire once
+    assert "old" not in memory_manager.short_term
+    assert memory_manager.recall("kept") == "replaced"
+    assert memory_manager.shared["model1"] == {}
+    assert memory_manager.shared["model2"] == {}
+    assert memory_manager.recall("later", "working") == "soon"
+    assert memory_manager.next_expiry() == memory_manager.working["later"].expires_at
+
+@pytest.mark.asyncio
+async def test_expiry_sweeper(memory_manager):
+    """Test the background sweeper removes segments when due"""
+    memory_manager.store("brief", "content", duration=timedelta(milliseconds=20))
+    memory_manager.start_expiry_sweeper(interval=5.0)
+    try:
+        await asyncio.sleep(0.1)
+        assert "brief" not in memory_manager.short_term
+    finally:
+        await memory_manager.stop_expiry_sweeper()
+
+def test_lru_entry_limit():
+    """Test least recently used segments are evicted first"""
+    manager = MemoryManager(limits={"short_term": MemoryLimit(max_entries=3)})
+    for i in range(3):
+        manager.store(f"k{i}", i)
+    manager.recall("k0")  # k1 is now least recently used
+    manager.store("k3", 3)
+    
+    assert list(manager.short_term) == ["k2", "k0", "k3"]
+    assert manager.get_memory_stats()["short_term"]["evictions"] == 1
+    assert [k for k, _ in manager.query()] == ["k3", "k2", "k0"]
+
+def test_lfu_byte_budget():
+    """Test byte budgets evict the least frequently used segments"""
+    manager = MemoryManager(limits={"working": {"max_bytes": 2000, "policy": "lfu"}})
+    manager.store("hot", "x" * 500, "working")
+    manager.store("cold", "y" * 500, "working")
+    for _ in range(3):
+        manager.recall("hot", "working")
+    manager.store("new", "z" * 1000, "working")
+    
+    assert set(manager.working) == {"hot", "new"}
+    stats = manager.get_memory_stats()["working"]
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 2000
+
+def test_shared_and_outcome_limits():
+    """Test shared spaces and learning outcomes are bounded"""
+    manager = MemoryManager(limits={"shared": {"max_entries": 2}}, max_outcomes=2)
+    for i in range(4):
+        manager.share("model1", "model2", f"k{i}", i)
+    assert list(manager.shared["model1"]) == ["k2", "k3"]
+    assert len(manager.shared["model2"]) == 2
+    
+    for i in range(3):
+        manager.record_feedback(f"p{i}", "good", None)
+    assert [o.pattern for o in manager.outcomes] == ["p1", "p2"]
+    stats = manager.get_memory_stats()
+    assert stats["shared"]["evictions"] == 4
+    assert stats["outcomes"]["evictions"] == 1
+
+def test_long_term_spill(tmp_path):
+    """Test evicted long-term segments are spilled and reloaded on recall"""
+    manager = MemoryManager(limits={"long_term": {"max_entries": 1}}, spill_dir=str(tmp_path))
+    manager.store("first", {"data": 1}, "long_term", tags={"a"})
+    manager.store("second", {"data": 2}, "long_term")
+    
+    assert list(manager.long_term) == ["second"]
+    assert (tmp_path / "first.json").exists()
+    assert manager.recall("first", "long_term") == {"data": 1}
+    assert list(manager.long_term) == ["first"]
+    assert manager.long_term["first"].tags == {"a"}
+    assert manager.get_memory_stats()["spilled"] == 2
+
+def test_spill_writes_outside_structure_lock(tmp_path):
+    """Test spill files are written after the structure lock is released"""
+    manager = MemoryManager(limits={"long_term": {"max_entries": 1}}, spill_dir=str(tmp_path))
+    save = manager._spill.save
+    lock_free = []
+    
+    def try_lock():
+        acquired = manager._lock.acquire(blocking=False)
+        lock_free.append(acquired)
+        if acquired:
+            manager._lock.release()
+    
+    def checked_save(records):
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+        save(records)
+    
+    manager._spill.save = checked_save
+    for i in range(3):
+        manager.store(f"key{i}", i, "long_term")
+    
+    assert lock_free == [True, True]
+    assert manager.recall("key0", "long_term") == 0
+
+def test_invalid_limits():
+    """Test unknown stores and policies are rejected"""
+    with pytest.raises(ValueError):
+        MemoryManager(limits={"invalid": {"max_entries": 1}})
+    with pytest.raises(ValueError):
+        MemoryManager(limits={"short_term": {"policy": "random"}})
+
+def test_segment_lazy_containers():
+    """Test metadata and tags are allocated on first access"""
+    segment = MemorySegment(content="x")
+    assert segment.metadata == {}
+    segment.metadata["source"] = "test"
+    segment.tags.add("a")
+    assert segment == MemorySegment(content="x", created_at=segment.created_at,
+                                    metadata={"source": "test"}, tags={"a"})
+    assert not hasattr(segment, "__dict__")
+
+def test_outcome_ring():
+    """Test the outcome ring keeps the newest outcomes in order"""
+    log = OutcomeLog(maxlen=3)
+    start = datetime(2024, 1, 1)
+    for i in range(5):
+        log.append(LearningOutcome(
+            pattern=f"p{i % 2}", success=i % 2 == 0, feedback="ok" if i == 4 else None,
+            context=None, timestamp=start + timedelta(minutes=i)
+        ))
+    
+    assert [o.pattern for o in log] == ["p0", "p1", "p0"]
+    assert log[0].timestamp == start + timedelta(minutes=2)
+    assert log[-1].feedback == "ok"
+    assert log.summarize() == (5, 3, 1)  # Totals include dropped outcomes
+    assert log.summarize(start + timedelta(minutes=2)) == (2, 1, 1)
+
+@dataclass
+class _DataclassSegment:
+    """The previous dataclass layout, for comparison"""
+    content: object
+    created_at: datetime = field(default_factory=datetime.now)
+    expires_at: object = None
+    metadata: dict = field(default_factory=dict)
+    access_count: int = 0
+    last_accessed: object = None
+    context: object = None
+    tags: set = field(default_factory=set)
+
+def _allocated_per_item(factory, count=2000):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = [factory(i) for i in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(items) == count
+    return (after - before) / count
+
+def test_memory_footprint():
+    """Test slotted segments and outcomes use less memory per entry"""
+    now = datetime.now()
+    segment_bytes = _allocated_per_item(lambda i: MemorySegment(i, created_at=now))
+    dataclass_bytes = _allocated_per_item(lambda i: _DataclassSegment(i, created_at=now))
+    assert segment_bytes < dataclass_bytes / 2.5
+    
+    log = OutcomeLog()
+    outcome = LearningOutcome("pattern", True, None, None, now)
+    log.append(outcome)  # Allocates the minute buckets
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(2000):
+            log.append(outcome)
+        outcome_bytes = (tracemalloc.get_traced_memory()[0] - before) / 2000
+    finally:
+        tracemalloc.stop()
+    assert outcome_bytes < 40
+
+def test_windowed_outcome_summary():
+    """Test windowed summaries from minute buckets match a full scan"""
+    log = OutcomeLog(bucket_count=60)
+    start = datetime(2024, 1, 1)
+    outcomes = [
+        LearningOutcome(f"p{i}", i % 3 != 0, "note" if i % 5 == 0 else None, None,
+                        start + timedelta(seconds=7 * i))
+        for i in range(1000)
+    ]
+    for outcome in outcomes:
+        log.append(outcome)
+    
+    for minutes_back in (0.5, 1, 10, 59, 90, 200):
+        since = outcomes[-1].timestamp - timedelta(minutes=minutes_back)
+        recent = [o for o in outcomes if o.timestamp > since]
+        expected = (
+            len(recent),
+            sum(o.success for o in recent),
+            sum(o.feedback is not None for o in recent)
+        )
+        assert log.summarize(since) == expected
+
+def test_learning_summary_counters(memory_manager):
+    """Test learning summaries use running counters"""
+    context = _context(InteractionType.CHAT)
+    memory_manager.learn_pattern("hello", ["assistant"], True, context)
+    memory_manager.learn_pattern("hello", ["assistant", "helper"], False, context)
+    memory_manager.record_feedback("hello:assistant", "great", context)
+    
+    summary = memory_manager.get_learning_summary()
+    assert summary["pattern_usage"] == {"hello": 2}
+    assert summary["success_rate"] == pytest.approx(2 / 3)
+    assert summary["feedback_count"] == 1
+    assert memory_manager.get_learning_summary(timedelta(minutes=5))["feedback_count"] == 1
+    assert memory_manager.get_learning_summary(timedelta(seconds=-1))["success_rate"] == 0.0
+
+def test_shared_segments_are_canonical(memory_manager):
+    """Test shared segments are stored once and viewed read-only per model"""
+    memory_manager.share("model1", "model2", "fact", "sky is blue", duration=timedelta(hours=1))
+    
+    segment = memory_manager.shared["model1"]["fact"]
+    assert memory_manager.shared["model2"]["from_model1_fact"] is segment
+    assert len(memory_manager.shared.segments) == 1
+    assert len(memory_manager._expiry_heap) == 1
+    with pytest.raises(TypeError):
+        memory_manager.shared["model1"]["other"] = segment
+    
+    contents = memory_manager.shared["model2"].contents()
+    assert dict(contents) == {"from_model1_fact": "sky is blue"}
+    
+    # Resharing replaces the segment in every view
+    memory_manager.share("model1", "model2", "fact", "sky is grey")
+    assert contents["from_model1_fact"] == "sky is grey"
+    assert len(memory_manager.shared.segments) == 1
+    
+    memory_manager.clear()
+    assert memory_manager.shared.segments == {}
+
+def test_share_key_with_several_recipients(memory_manager):
+    """Test sharing a key with a second recipient keeps the first one's copy"""
+    memory_manager.share("A", "B", "k", "v1")
+    memory_manager.share("A", "C", "k", "v2")
+    
+    assert memory_manager.shared["B"].contents() == {"from_A_k": "v1"}
+    assert memory_manager.shared["C"].contents() == {"from_A_k": "v2"}
+    assert memory_manager.shared["A"]["k"].content == "v2"
+    assert len(memory_manager.shared.segments) == 2
+    
+    memory_manager.share("A", "B", "k", "v3")
+    assert memory_manager.shared["B"]["from_A_k"].content == "v3"
+    assert memory_manager.shared["C"]["from_A_k"].content == "v2"
+    assert len(memory_manager.shared.segments) == 2
+
+def _check_indexes(manager):
+    """Assert the secondary indexes match the stores exactly"""
+    refs = {
+        (memory_type, key)
+        for memory_type in ("short_term", "long_term", "working")
+        for key in manager._get_memory_store(memory_type)
+    }
+    assert set(manager._time_entries) == refs
+    assert len(manager._time_index) == len(refs)
+    assert manager._time_index == sorted(manager._time_index)
+    for tag, tagged in manager._tag_index.items():
+        for memory_type, key in tagged:
+            assert tag in manager._get_memory_store(memory_type)[key].tags
+    for share_id, subscribers in manager.shared.subscribers.items():
+        assert share_id in manager.shared.segments
+        for model, view_key in subscribers:
+            assert manager.shared.refs(model)[view_key] == share_id
+
+def test_concurrent_writers_stress():
+    """Test many threads and coroutines mutating one manager keep it consistent"""
+    manager = MemoryManager(limits={"working": {"max_entries": 50}})
+    context = _context(InteractionType.TASK)
+    workers, operations = 8, 400
+    
+    def worker(worker_id):
+        rng = random.Random(worker_id)
+        for i in range(operations):
+            key = f"k{rng.randrange(100)}"
+            action = rng.randrange(8)
+            if action < 3:
+                memory_type = rng.choice(["short_term", "working"])
+                duration = timedelta(seconds=-1) if i % 17 == 0 else None
+                manager.store(key, {"role": "user", "content": key}, memory_type,
+                              duration=duration, tags={f"t{rng.randrange(5)}"})
+            elif action == 3:
+                manager.forget(key, rng.choice(["short_term", "working"]))
+            elif action == 4:
+                manager.recall(key, rng.choice(["short_term", "working"]))
+            elif action == 5:
+                manager.share(f"m{worker_id}", "hub", key, i, duration=timedelta(seconds=-1))
+            elif action == 6:
+                manager.learn_pattern(key, ["a", "b"], bool(i % 2), context)
+                manager.query(tags=["t1"], limit=5)
+            else:
+                manager.cleanup_expired()
+                manager.get_recent_messages(limit=5)
+        return True
+    
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Force frequent thread switches
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            assert all(pool.map(worker, range(workers)))
+        
+        async def run_coroutines():
+            await asyncio.gather(*(asyncio.to_thread(worker, workers + n) for n in range(4)))
+        asyncio.run(run_coroutines())
+    finally:
+        sys.setswitchinterval(interval)
+    
+    _check_indexes(manager)
+    assert len(manager.working) <= 50
+    learned = sum(usage for usage in manager.get_learning_summary()["pattern_usage"].values())
+    assert learned == manager.outcomes.total
+    manager.cleanup_expired()
+    assert manager.shared.segments == {}
@@ -0,0 +1,218 @@
+# tests/core/test_memory_backend.py
+
+# ==================== Imports ====================
+import json
+import threading
+import time
+import pytest
+from src.glue.core.memory import MemoryManager, _UNLOADED
+from src.glue.core.memory_backend import (
+    SQLiteBackend, JsonDirectoryBackend, WriteBehindBackend, migrate_directory
+)
+from src.glue.core.context import ContextState, InteractionType, ComplexityLevel
+
+# ==================== Fixtures ====================
+@pytest.fixture
+def context():
+    return ContextState(
+        interaction_type=InteractionType.RESEARCH,
+        complexity=ComplexityLevel.MODERATE,
+        tools_required={"web_search"},
+        requires_research=True,
+        requires_memory=False,
+        requires_persistence=False,
+        confidence=0.8
+    )
+
+# ==================== SQLite Backend Tests ====================
+def test_sqlite_round_trip(tmp_path, context):
+    """Test segments survive a restart with lazily loaded content"""
+    path = str(tmp_path / "memory.db")
+    manager = MemoryManager(persistence_backend=SQLiteBackend(path))
+    manager.store("notes/2024-01-01T10:00", {"text": "hello"}, "long_term", context=context, tags={"a"})
+    manager.store("other", "world", "long_term")
+    manager.close()
+
+    backend = SQLiteBackend(path)
+    manager = MemoryManager(persistence_backend=backend)
+    segment = manager.long_term["notes/2024-01-01T10:00"]
+    assert segment.context == context
+    assert segment.tags == {"a"}
+    assert segment.content is _UNLOADED
+
+    assert manager.recall("notes/2024-01-01T10:00", "long_term") == {"text": "hello"}
+    assert [k for k, _ in manager.query(tags=["a"])] == ["notes/2024-01-01T10:00"]
+    assert manager.query(memory_types=["long_term"])[0][1].content == "world"
+    manager.close()
+
+def test_sqlite_batched_save_and_delete(tmp_path):
+    """Test batches are written in one call and forget deletes records"""
+    backend = SQLiteBackend(str(tmp_path / "memory.db"))
+    record = {
+        "content": 1, "created_at": "2024-01-01T00:00:00", "expires_at": None,
+        "metadata": {}, "access_count": 0, "last_accessed": None, "context": None, "tags": []
+    }
+    backend.save([(f"k{i}", dict(record, content=i)) for i in range(100)])
+    assert backend.load_content("k42") == 42
+
+    manager = MemoryManager(persistence_backend=backend)
+    assert len(manager.long_term) == 100
+    manager.forget("k42", "long_term")
+    assert backend.get("k42") is None
+    with pytest.raises(KeyError):
+        backend.load_content("k42")
+    backend.close()
+
+def test_sqlite_lazy_content_counts_toward_byte_limit(tmp_path):
+    """Test content not yet loaded is counted at its stored size"""
+    path = str(tmp_path / "memory.db")
+    manager = MemoryManager(persistence_backend=SQLiteBackend(path))
+    manager.store("big", "x" * 10000, "long_term")
+    manager.close()
+    
+    manager = MemoryManager(
+        persistence_backend=SQLiteBackend(path),
+        limits={"long_term": {"max_bytes": 1000000}}
+    )
+    assert manager.long_term["big"].content is _UNLOADED
+    assert manager.get_memory_stats()["long_term"]["bytes"] >= 10000
+    
+    manager.recall("big", "long_term")
+    assert manager.get_memory_stats()["long_term"]["bytes"] >= 10000
+    manager.close()
+
+# ==================== Migration Tests ====================
+def test_migrate_directory(tmp_path):
+    """Test JSON directory layouts migrate into SQLite"""
+    source = tmp_path / "memory"
+    manager = MemoryManager(persistence_dir=str(source))
+    for i in range(5):
+        manager.store(f"key{i}", {"value": i}, "long_term", tags={"old"})
+    assert json.loads((source / "key3.json").read_text())["content"] == {"value": 3}
+
+    backend = SQLiteBackend(str(tmp_path / "memory.db"))
+    assert migrate_directory(str(source), backend, batch_size=2) == 5
+
+    manager = MemoryManager(persistence_backend=backend)
+    assert manager.recall("key3", "long_term") == {"value": 3}
+    assert manager.long_term["key0"].tags == {"old"}
+    backend.close()
+
+def test_json_directory_backend_loads_eagerly(tmp_path):
+    """Test the default directory backend keeps its file layout"""
+    manager = MemoryManager(persistence_dir=str(tmp_path))
+    manager.store("key", "content", "long_term")
+
+    reloaded = MemoryManager(persistence_dir=str(tmp_path))
+    assert isinstance(reloaded.backend, JsonDirectoryBackend)
+    assert reloaded.long_term["key"].content == "content"
+
+# ==================== Write-Behind Tests ====================
+class CountingBackend(JsonDirectoryBackend):
+    """Directory backend recording the batches it is given"""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.batches = []
+
+    def save(self, records):
+        records = list(records)
+        self.batches.append([key for key, _ in records])
+        super().save(records)
+
+def test_write_behind_coalesces_and_flushes(tmp_path):
+    """Test repeated writes to a key are applied once, and reads see queued writes"""
+    backend = CountingBackend(str(tmp_path))
+    manager = MemoryManager(persistence_backend=backend, write_behind=True)
+    manager.backend.delay = 10.0  # Keep writes queued until flushed
+
+    for i in range(20):
+        manager.store("key", {"version": i}, "long_term")
+    manager.store("gone", "content", "long_term")
+    manager.forget("gone", "long_term")
+
+    assert manager.backend.get("key")["content"] == {"version": 19}
+    assert manager.backend.get("gone") is None
+    manager.flush()
+    assert backend.batches == [["key"]]
+    assert backend.get("key")["content"] == {"version": 19}
+    assert not (tmp_path / "gone.json").exists()
+    manager.close()
+
+@pytest.mark.asyncio
+async def test_write_behind_aclose_is_durable(tmp_path, context):
+    """Test aclose applies queued writes before closing"""
+    path = str(tmp_path / "memory.db")
+    manager = MemoryManager(persistence_backend=SQLiteBackend(path), write_behind=True)
+    assert isinstance(manager.backend, WriteBehindBackend)
+    for i in range(50):
+        manager.store(f"k{i}", i, "long_term", context=context)
+    await manager.aclose()
+
+    reloaded = MemoryManager(persistence_backend=SQLiteBackend(path))
+    assert len(reloaded.long_term) == 50
+    assert reloaded.recall("k49", "long_term") == 49
+    reloaded.close()
+
+def test_write_behind_flush_waits_for_inflight_batch(tmp_path):
+    """Test flush returns only after a batch taken by the writer is applied"""
+    backend = CountingBackend(str(tmp_path))
+    entered, release = threading.Event(), threading.Event()
+    save = backend.save
+    
+    def blocking_save(records):
+        entered.set()
+        release.wait(5)
+        save(records)
+    
+    backend.save = blocking_save
+    queue = WriteBehindBackend(backend, delay=0)
+    queue.save([("key", {"content": 1, "created_at": None})])
+    assert entered.wait(5)
+    assert queue.pending == 0  # Already taken by the writer
+    
+    flusher = threading.Thread(target=queue.flush)
+    flusher.start()
+    flusher.join(0.1)
+    assert flusher.is_alive()
+    
+    release.set()
+    flusher.join(5)
+    assert not flusher.is_alive()
+    assert backend.get("key")["content"] == 1
+    queue.close()
+
+def test_write_behind_requeues_failed_batches(tmp_path):
+    """Test a failed batch stays queued and is written on the next flush"""
+    backend = CountingBackend(str(tmp_path))
+    queue = WriteBehindBackend(backend, delay=10.0)
+    save = backend.save
+    backend.save = lambda records: (_ for _ in ()).throw(OSError("disk full"))
+
+    queue.save([("key", {"content": 1, "created_at": None})])
+    with pytest.raises(OSError):
+        queue.flush()
+    assert queue.write_errors == 1 and queue.pending == 1
+
+    backend.save = save
+    queue.close()
+    assert backend.get("key")["content"] == 1
+
+def test_write_behind_logs_background_errors(tmp_path, caplog):
+    """Test failures on the writer thread are logged"""
+    backend = CountingBackend(str(tmp_path))
+    backend.save = lambda records: (_ for _ in ()).throw(OSError("disk full"))
+    queue = WriteBehindBackend(backend, delay=0)
+    
+    queue.save([("key", {"content": 1, "created_at": None})])
+    for _ in range(200):
+        if queue.write_errors:
+            break
+        time.sleep(0.01)
+    
+    assert queue.write_errors >= 1
+    assert "Error writing memory: disk full" in caplog.text
+    
+    del backend.save  # Restore the working save so close() can flush
+    queue.close()
+    assert backend.get("key")["content"] == 1
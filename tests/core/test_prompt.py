@@ -0,0 +1,49 @@
+# tests/core/test_prompt.py
+
+# ==================== Imports ====================
+from src.glue.core.prompt import (
+    PromptAssembler, estimate_tokens, fit_messages
+)
+
+# ==================== Estimator Tests ====================
+def test_estimate_tokens():
+    """Test token estimates are positive and memoized"""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hello world") >= 2
+    estimate_tokens.cache_clear()
+    estimate_tokens("repeated text")
+    estimate_tokens("repeated text")
+    assert estimate_tokens.cache_info().hits == 1
+
+# ==================== Message Fitting Tests ====================
+def test_fit_messages_keeps_system_and_newest():
+    """Test the oldest turns are dropped first"""
+    messages = [{"role": "system", "content": "system prompt"}] + [
+        {"role": "user", "content": f"message {i} " + "x" * 40} for i in range(10)
+    ]
+    fitted = fit_messages(messages, budget=60)
+    assert fitted[0]["role"] == "system"
+    assert fitted[-1]["content"].startswith("message 9")
+    assert len(fitted) < len(messages)
+
+def test_fit_messages_keeps_latest_message():
+    """Test the latest message survives an undersized budget"""
+    messages = [{"role": "user", "content": "x" * 400}]
+    assert fit_messages(messages, budget=10) == messages
+
+# ==================== Assembly Tests ====================
+def test_build_within_budget():
+    """Test recent turns fill the budget newest first"""
+    history = [{"role": "user", "content": f"turn {i} " + "y" * 40} for i in range(20)]
+    prompt = PromptAssembler().build("current input", history, budget=50)
+    assert "Current Input:\ncurrent input" in prompt
+    assert "turn 19" in prompt
+    assert "turn 0 " not in prompt
+
+def test_build_without_budget():
+    """Test everything is included without a budget"""
+    history = [{"role": "user", "content": "earlier"}]
+    prompt = PromptAssembler().build("now", history, {"note": "remembered"})
+    assert "user: earlier" in prompt
+    assert "Memory:\nnote: remembered" in prompt
+    assert prompt.endswith("Current Input:\nnow")
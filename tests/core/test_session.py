@@ -0,0 +1,94 @@
+# tests/core/test_session.py
+
+# ==================== Imports ====================
+import pytest
+from src.glue.core.session import SessionManager
+from src.glue.core.model import Model
+
+# ==================== Mock Model ====================
+class EchoModel(Model):
+    """Model that remembers prompts it has seen"""
+    def __init__(self, name: str):
+        super().__init__(name, "test")
+        self.role = "You are a helpful assistant"
+        self.seen = []
+
+    def fork(self):
+        forked = super().fork()
+        forked.seen = []
+        return forked
+
+    async def generate(self, prompt: str) -> str:
+        self.seen.append(prompt)
+        return f"echo {len(self.seen)}"
+
+# ==================== Fixtures ====================
+@pytest.fixture
+def session_manager(tmp_path):
+    return SessionManager(workspace_dir=str(tmp_path))
+
+@pytest.fixture
+def models():
+    return {"assistant": EchoModel("assistant")}
+
+@pytest.fixture
+def bindings():
+    return {"glue": [], "velcro": [], "tape": [], "magnet": []}
+
+# ==================== Isolation Tests ====================
+@pytest.mark.asyncio
+async def test_sessions_are_isolated(session_manager, models, bindings):
+    """Test sessions keep separate history and model state"""
+    assert await session_manager.process("alice", models, bindings, "hello") == "echo 1"
+    assert await session_manager.process("alice", models, bindings, "hello again") == "echo 2"
+    assert await session_manager.process("bob", models, bindings, "hello") == "echo 1"
+    
+    alice = session_manager.get_session("alice")
+    bob = session_manager.get_session("bob")
+    assert len(alice.conversation.history) == 4
+    assert len(bob.conversation.history) == 2
+    assert alice.models["assistant"] is not bob.models["assistant"]
+    assert models["assistant"].seen == []
+
+def test_shared_components(session_manager):
+    """Test sessions share read-only components"""
+    alice = session_manager.get_session("alice").conversation
+    bob = session_manager.get_session("bob").conversation
+    assert alice.context_analyzer is bob.context_analyzer
+    assert alice.tool_optimizer is bob.tool_optimizer
+    assert alice.memory_manager is not bob.memory_manager
+
+# ==================== Eviction Tests ====================
+def test_idle_eviction(session_manager):
+    """Test idle sessions are evicted"""
+    session = session_manager.get_session("alice")
+    evicted = session_manager.evict_idle(now=session.last_active + session_manager.idle_timeout + 1)
+    assert evicted == ["alice"]
+    assert len(session_manager) == 0
+
+def test_max_sessions(tmp_path):
+    """Test least recently used sessions are evicted beyond capacity"""
+    manager = SessionManager(workspace_dir=str(tmp_path), max_sessions=2)
+    manager.get_session("a")
+    manager.get_session("b")
+    manager.get_session("a")
+    manager.get_session("c")
+    assert list(manager.sessions) == ["a", "c"]
+    assert manager.evicted_count == 1
+
+@pytest.mark.asyncio
+async def test_max_sessions_all_busy(tmp_path):
+    """Test a new session is served when every other session is busy"""
+    manager = SessionManager(workspace_dir=str(tmp_path), max_sessions=1)
+    busy = manager.get_session("a")
+    async with busy.lock:
+        session = manager.get_session("b")
+    assert session.session_id == "b"
+    assert list(manager.sessions) == ["a", "b"]
+    
+    # Capacity is restored once the busy session is idle again
+    manager.get_session("c")
+    assert list(manager.sessions) == ["c"]
+    
+    with pytest.raises(ValueError):
+        SessionManager(workspace_dir=str(tmp_path), max_sessions=0)
@@ -0,0 +1,102 @@
+# tests/core/test_similarity.py
+
+# ==================== Imports ====================
+import pytest
+from src.glue.core import similarity
+from src.glue.core.similarity import MinHashIndex, shingles
+from src.glue.core.memory import MemoryManager
+from src.glue.core.context import ContextState, InteractionType, ComplexityLevel
+
+# ==================== Fixtures ====================
+@pytest.fixture
+def research_context():
+    return ContextState(
+        interaction_type=InteractionType.RESEARCH,
+        complexity=ComplexityLevel.SIMPLE,
+        tools_required={"web_search"},
+        requires_research=True,
+        requires_memory=False,
+        requires_persistence=False,
+        confidence=0.9
+    )
+
+# ==================== Index Tests ====================
+def test_shingles_skip_stopwords():
+    """Test words and trigrams are extracted without stopwords"""
+    features = shingles("Find the news")
+    assert "find" in features and "news" in features
+    assert "the" not in features
+    assert "#ne" in features
+
+def test_index_ranks_similar_texts():
+    """Test queries return the closest texts first"""
+    index = MinHashIndex()
+    index.add("news", "find the latest AI news")
+    index.add("code", "write a python function to sort a list")
+    index.add("weather", "what is the weather tomorrow")
+
+    results = index.query("search the latest AI news", k=2)
+    assert results[0][0] == "news"
+    assert index.query("write python code to sort lists")[0][0] == "code"
+    assert index.query("the a of") == []
+
+def test_index_incremental_updates():
+    """Test replaced and removed keys leave the buckets"""
+    index = MinHashIndex()
+    index.add("k", "latest AI news")
+    index.add("k", "python sorting")
+    assert [key for key, _ in index.query("latest AI news", min_similarity=0.5)] == []
+    index.remove("k")
+    assert len(index) == 0
+    assert all(not buckets for buckets in index._buckets)
+
+def test_pure_python_signatures_match(monkeypatch):
+    """Test the fallback computes the same signatures as NumPy"""
+    pytest.importorskip("numpy")
+    index = MinHashIndex()
+    expected = index.signature("find the latest AI news")
+    monkeypatch.setattr(similarity, "np", None)
+    assert index.signature("find the latest AI news") == expected
+
+# ==================== Memory Integration Tests ====================
+def test_paraphrased_pattern_recall(research_context):
+    """Test learned patterns are found for paraphrased triggers"""
+    memory = MemoryManager(similarity_index=True)
+    memory.learn_pattern("find the latest AI news", ["researcher", "web_search"], True, research_context)
+    memory.learn_pattern("write a sorting function", ["coder"], True, research_context)
+
+    pattern = memory.find_similar_pattern("search latest news on AI", research_context)
+    assert pattern.sequence == ["researcher", "web_search"]
+
+    # Without an index only exact triggers match
+    exact = MemoryManager()
+    exact.learn_pattern("find the latest AI news", ["researcher"], True, research_context)
+    assert exact.find_similar_pattern("search latest news on AI", research_context) is None
+    assert exact.find_similar_pattern("find the latest AI news", research_context) is not None
+
+def test_find_similar_content():
+    """Test stored text content can be recalled by similarity"""
+    memory = MemoryManager(similarity_index=True)
+    memory.store("m1", {"role": "user", "content": "Summarize recent AI research papers"})
+    memory.store("m2", "notes on python sorting algorithms", "working")
+    memory.store("m3", {"data": 1})
+
+    results = memory.find_similar("recent research papers about AI")
+    assert results[0][0] == "m1"
+    assert memory.find_similar("python sorting", memory_types=["short_term"]) == []
+
+    memory.forget("m2", "working")
+    assert memory.find_similar("python sorting algorithms") == []
+
+    with pytest.raises(RuntimeError):
+        MemoryManager().find_similar("anything")
+
+def test_pattern_index_without_content_index(research_context):
+    """Test pattern recall can be enabled without indexing stored content"""
+    memory = MemoryManager(similarity_index=True, content_index=False)
+    memory.store("m1", {"role": "user", "content": "Summarize recent AI research papers"})
+    memory.learn_pattern("find the latest AI news", ["researcher"], True, research_context)
+
+    assert memory.find_similar_pattern("search latest news on AI", research_context) is not None
+    with pytest.raises(RuntimeError):
+        memory.find_similar("recent research papers")
@@ -0,0 +1,105 @@
+# tests/core/test_tracing.py
+
+# ==================== Imports ====================
+import json
+import asyncio
+import pytest
+from src.glue.core import tracing
+from src.glue.core.tracing import Tracer, init_tracer, get_tracer
+
+# ==================== Fixtures ====================
+@pytest.fixture
+def global_tracer():
+    """Restore the global tracer after each test"""
+    previous = tracing._tracer
+    yield
+    if tracing._tracer is not previous and tracing._tracer is not None:
+        tracing._tracer.close()
+    tracing._tracer = previous
+
+# ==================== Span Tests ====================
+def test_disabled_tracer_is_noop():
+    """Test disabled tracer records nothing"""
+    tracer = Tracer(enabled=False)
+    with tracer.span("work") as span:
+        span.set(size=1)
+    assert tracer.summary() == {}
+
+def test_nested_spans(tmp_path):
+    """Test spans record their parent"""
+    trace_file = tmp_path / "trace.jsonl"
+    tracer = Tracer(enabled=True, trace_file=str(trace_file))
+    with tracer.span("outer") as outer:
+        with tracer.span("inner", step=1) as inner:
+            pass
+    tracer.close()
+
+    records = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["inner", "outer"]
+    assert records[0]["parent_id"] == outer.span_id
+    assert records[0]["attributes"] == {"step": 1}
+    assert records[1]["parent_id"] is None
+    assert inner.parent_id == outer.span_id
+
+def test_span_records_errors():
+    """Test exceptions are tagged and propagated"""
+    tracer = Tracer(enabled=True)
+    with pytest.raises(ValueError):
+        with tracer.span("failing") as span:
+            raise ValueError("boom")
+    assert span.attributes["error"] == "ValueError"
+    assert tracer.summary()["failing"]["count"] == 1
+
+@pytest.mark.asyncio
+async def test_spans_nest_per_task():
+    """Test concurrent tasks keep separate span stacks"""
+    tracer = Tracer(enabled=True)
+    parents = {}
+
+    async def work(name):
+        with tracer.span(name) as outer:
+            await asyncio.sleep(0)
+            with tracer.span(f"{name}.child") as child:
+                parents[name] = (child.parent_id, outer.span_id)
+
+    with tracer.span("root"):
+        await asyncio.gather(work("a"), work("b"))
+
+    for child_parent, outer_id in parents.values():
+        assert child_parent == outer_id
+
+# ==================== Summary Tests ====================
+def test_summary_percentiles():
+    """Test p50/p95 from recorded durations"""
+    tracer = Tracer(enabled=True)
+    for ms in range(1, 101):
+        span = tracer.span("op")
+        tracer._record(span, ms / 1000)
+
+    stats = tracer.summary()["op"]
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == pytest.approx(50)
+    assert stats["p95_ms"] == pytest.approx(95)
+    assert stats["max_ms"] == pytest.approx(100)
+
+def test_summary_window_is_bounded():
+    """Test only the most recent samples are kept"""
+    tracer = Tracer(enabled=True, max_samples=10)
+    for ms in range(100):
+        tracer._record(tracer.span("op"), ms / 1000)
+
+    stats = tracer.summary()["op"]
+    assert stats["count"] == 100
+    assert stats["p50_ms"] >= 90
+
+# ==================== Global Tracer Tests ====================
+def test_global_tracer(global_tracer):
+    """Test the global tracer is disabled until initialized"""
+    tracing._tracer = None
+    assert not get_tracer().enabled
+
+    tracer = init_tracer()
+    assert get_tracer() is tracer
+    with get_tracer().span("op"):
+        pass
+    assert "op" in tracer.summary()
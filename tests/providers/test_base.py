@@ -1,6 +1,7 @@
 # tests/providers/test_base.py
 
 # ==================== Imports ====================
+import asyncio
 import pytest
 from typing import Dict, Any
 from unittest.mock import AsyncMock, Mock
@@ -81,4 +82,39 @@ async def test_generate_error():
     
     with pytest.raises(RuntimeError) as exc_info:
         await error_provider.generate("test prompt")
-    assert "Generation failed" in str(exc_info.value)
\ No newline at end of file
+    assert "Generation failed" in str(exc_info.value)
+
+@pytest.mark.asyncio
+async def test_generate_timeout_propagates():
+    """Test request timeouts are not wrapped as generic failures"""
+    provider = MockBaseProvider(name="slow-provider", api_key="test-key")
+    
+    async def timeout_request(self, request_data):
+        raise asyncio.TimeoutError()
+    
+    provider._make_request = timeout_request.__get__(provider)
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await provider.generate("test prompt")
+
+@pytest.mark.asyncio
+async def test_generate_stream(base_provider):
+    """Test streaming falls back to a single full chunk"""
+    chunks = [chunk async for chunk in base_provider.generate_stream("test prompt")]
+    assert chunks == ["test response"]
+
+@pytest.mark.asyncio
+async def test_generate_uses_response_cache():
+    """Test identical requests are served from the response cache"""
+    from src.glue.providers.cache import ResponseCache
+    provider = MockBaseProvider(
+        name="cached-provider",
+        api_key="test-key",
+        response_cache=ResponseCache()
+    )
+    provider._make_request = AsyncMock(return_value={"text": "test response"})
+    
+    assert await provider.generate("same prompt") == "test response"
+    assert await provider.generate("same prompt") == "test response"
+    assert provider._make_request.await_count == 1
+    assert provider.response_cache.hits == 1
@@ -0,0 +1,52 @@
+# tests/providers/test_cache.py
+
+# ==================== Imports ====================
+import time
+import pytest
+from src.glue.providers.cache import ResponseCache
+
+# ==================== Key Tests ====================
+def test_make_key():
+    """Test keys depend on the whole payload except the stream flag"""
+    request = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+    assert ResponseCache.make_key(request) == ResponseCache.make_key({**request, "stream": True})
+    assert ResponseCache.make_key(request) != ResponseCache.make_key({**request, "temperature": 0.5})
+
+# ==================== Memory Tier Tests ====================
+def test_hit_and_miss():
+    """Test hits and misses are counted"""
+    cache = ResponseCache()
+    assert cache.get("key") is None
+    cache.set("key", {"text": "cached"})
+    assert cache.get("key") == {"text": "cached"}
+    
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_lru_eviction():
+    """Test the least recently used entry is evicted"""
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")
+    cache.set("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.evictions == 1
+
+def test_ttl_expiry():
+    """Test expired entries are misses"""
+    cache = ResponseCache(ttl=0.01)
+    cache.set("key", {"n": 1})
+    time.sleep(0.02)
+    assert cache.get("key") is None
+
+# ==================== Disk Tier Tests ====================
+def test_disk_tier(tmp_path):
+    """Test entries survive in the disk tier"""
+    ResponseCache(cache_dir=str(tmp_path)).set("key", {"n": 1})
+    
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    assert cache.get("key") == {"n": 1}
+    assert cache.disk_hits == 1
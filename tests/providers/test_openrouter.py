@@ -79,4 +79,14 @@ async def test_cleanup(openrouter_provider):
     
     await openrouter_provider.cleanup()
     assert mock_session.close.called
-    assert openrouter_provider._session is None
\ No newline at end of file
+    assert openrouter_provider._session is None
+
+# ==================== Streaming Tests ====================
+def test_parse_sse_line():
+    """Test server-sent event line parsing"""
+    parse = OpenRouterProvider._parse_sse_line
+    assert parse("") is None
+    assert parse(": OPENROUTER PROCESSING") is None
+    assert parse("data: [DONE]") == {"done": True}
+    event = parse('data: {"choices": [{"delta": {"content": "Hi"}}]}')
+    assert event["choices"][0]["delta"]["content"] == "Hi"